@@ -0,0 +1,317 @@
+"""
+Benchmarks de latence pour Game Translator
+
+Usage:
+    python benchmark.py ocr-passes [--image capture.png ...] [--runs 5]
+    python benchmark.py tesseract-backend [--image capture.png ...]
+    python benchmark.py preprocess [--image capture.png ...]
+    python benchmark.py parallel-lines [--image journal.png ...]
+    python benchmark.py scripts [--runs 5]
+    python benchmark.py langid [--runs 5]
+
+Sans --image, des captures synthétiques (texte anglais) sont générées.
+Pour mesurer le cas japonais, passez de vraies captures de jeu avec --image.
+"""
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import time
+from collections import Counter
+
+from PIL import Image, ImageDraw, ImageFont
+
+
+SAMPLE_LINES = [
+    "The ancient gate will only open for those who carry the moon crystal.",
+    "Return to the village elder once you have gathered five herbs.",
+    "Your party has gained 1200 experience points!",
+    "Do you want to save your progress before entering the dungeon?",
+]
+
+
+def sample_images(paths, line_counts=(1, 3), font_size=22):
+    """
+    Charge les captures fournies ou génère des images de dialogue synthétiques
+
+    Args:
+        paths: Chemins d'images (peut être vide)
+        line_counts: Nombres de lignes des images générées
+        font_size: Taille de police des images générées
+
+    Returns:
+        list: [(nom, PIL.Image)]
+    """
+    if paths:
+        return [(path, Image.open(path).convert('RGB')) for path in paths]
+
+    try:
+        font = ImageFont.load_default(size=font_size)
+    except TypeError:  # Pillow < 10.1
+        font = ImageFont.load_default()
+
+    line_height = round(font_size * 1.5)
+    images = []
+    for count in line_counts:
+        lines = [SAMPLE_LINES[i % len(SAMPLE_LINES)] for i in range(count)]
+        image = Image.new('RGB', (font_size * 41, 20 + line_height * count), color=(20, 20, 40))
+        draw = ImageDraw.Draw(image)
+        for i, line in enumerate(lines):
+            draw.text((15, 10 + line_height * i), line, fill=(235, 235, 235), font=font)
+        images.append((f"synthétique {count} ligne(s), police {font_size}px", image))
+    return images
+
+
+def measure(fn, runs):
+    """
+    Exécute fn `runs` fois (sortie console masquée) après un appel de chauffe
+
+    Returns:
+        list: Durées en millisecondes
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn()
+        durations = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            fn()
+            durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def report(label, durations, baseline=None):
+    """Affiche médiane / moyenne et le gain par rapport à une référence"""
+    median = statistics.median(durations)
+    line = f"   {label:<32} médiane {median:8.1f} ms   moyenne {statistics.mean(durations):8.1f} ms"
+    if baseline:
+        line += f"   ({(1 - median / statistics.median(baseline)) * 100:+.0f}% vs référence)"
+    print(line)
+
+
+def bench_ocr_passes(args):
+    """Double passe Tesseract historique vs passe unique avec confiance"""
+    import pytesseract
+    from language_detector import LanguageDetector
+    from ocr_handler import OCRHandler, tesseract_lang_string
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        handler = OCRHandler(engine='tesseract', languages=args.languages, auto_detect=True)
+    detector = LanguageDetector()
+
+    def legacy(image):
+        # Ancien extract_text: passe rapide langues par défaut, puis 2e passe complète
+        quick_text = pytesseract.image_to_string(image, config='--psm 6')
+        languages = args.languages
+        if quick_text and len(quick_text.strip()) > 3:
+            detected = detector.detect_language(quick_text)
+            if detected and set(detected) != set(args.languages):
+                languages = detected
+        config = f'--oem 3 --psm 6 -l {tesseract_lang_string(languages)}'
+        return pytesseract.image_to_string(image, config=config)
+
+    print(f"🔍 OCR auto-détection, langues {'+'.join(args.languages)}, {args.runs} runs")
+    for name, image in sample_images(args.image):
+        print(f"\n📷 {name} ({image.size[0]}x{image.size[1]})")
+        baseline = measure(lambda: legacy(image), args.runs)
+        report("double passe (ancien)", baseline)
+        report("passe unique", measure(lambda: handler.extract_text(image), args.runs), baseline)
+
+
+def bench_tesseract_backend(args):
+    """pytesseract (processus par appel) vs tesserocr (in-process, modèles chauds)"""
+    from ocr_handler import OCRHandler, tesseract_lang_string
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        subprocess_handler = OCRHandler(engine='tesseract', languages=args.languages, auto_detect=False)
+        inprocess_handler = OCRHandler(engine='tesseract', languages=args.languages, auto_detect=False,
+                                       tesseract_backend='tesserocr')
+    if inprocess_handler.tesserocr is None:
+        print("❌ tesserocr indisponible (pip install tesserocr)")
+        return
+
+    print(f"🔍 Backend Tesseract, langues {tesseract_lang_string(args.languages)}, {args.runs} runs")
+    for name, image in sample_images(args.image):
+        print(f"\n📷 {name} ({image.size[0]}x{image.size[1]})")
+        baseline = measure(lambda: subprocess_handler.extract_text(image), args.runs)
+        report("pytesseract", baseline)
+        report("tesserocr", measure(lambda: inprocess_handler.extract_text(image), args.runs), baseline)
+
+
+def bench_preprocess(args):
+    """Coût de chaque étape de prétraitement et effet sur l'OCR (temps + confiance)"""
+    from ocr_handler import ImagePreprocessor, OCRHandler
+
+    preprocessor = ImagePreprocessor()
+    images = sample_images(args.image)
+    if not args.image:
+        images += sample_images([], line_counts=(3,), font_size=11)
+
+    print(f"🧹 Prétraitement, {args.runs} runs")
+    for name, image in images:
+        print(f"\n📷 {name} ({image.size[0]}x{image.size[1]})")
+
+        step_timings = {step: [] for step in ImagePreprocessor.STEPS}
+        for _ in range(args.runs):
+            cleaned, details = preprocessor.process(image, details=True)
+            for step, ms in details['timings'].items():
+                step_timings[step].append(ms)
+        for step in ImagePreprocessor.STEPS:
+            if step_timings[step]:
+                report(f"étape {step}", step_timings[step])
+        print(f"   → {cleaned.size[0]}x{cleaned.size[1]} {cleaned.mode}")
+
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                handler = OCRHandler(engine='tesseract', languages=args.languages, auto_detect=False)
+            raw_confidence = handler._extract_with_tesseract(image, args.languages).confidence
+            clean_confidence = handler._extract_with_tesseract(cleaned, args.languages).confidence
+        except Exception as e:
+            print(f"   ⚠️ OCR non mesuré: {e}")
+            continue
+
+        baseline = measure(lambda: handler._extract_with_tesseract(image, args.languages), args.runs)
+        report(f"OCR brut (confiance {raw_confidence:.0f})", baseline)
+        report(f"OCR prétraité (confiance {clean_confidence:.0f})",
+               measure(lambda: handler._extract_with_tesseract(preprocessor.process(image), args.languages),
+                       args.runs),
+               baseline)
+
+
+def bench_parallel_lines(args):
+    """OCR d'un bloc en un appel vs découpage en lignes sur un pool de processus"""
+    from ocr_handler import OCRHandler
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        single = OCRHandler(engine='tesseract', languages=args.languages, auto_detect=False)
+        parallel = OCRHandler(engine='tesseract', languages=args.languages, auto_detect=False,
+                              parallel_lines=True, min_parallel_lines=2)
+
+    print(f"🧵 OCR par lignes sur {parallel.line_workers} processus, {args.runs} runs")
+    try:
+        for name, image in sample_images(args.image, line_counts=(4, 12, 24)):
+            print(f"\n📷 {name} ({image.size[0]}x{image.size[1]})")
+            baseline = measure(lambda: single.extract_text(image), args.runs)
+            report("bloc entier (--psm 6)", baseline)
+            report("lignes en parallèle (--psm 7)", measure(lambda: parallel.extract_text(image), args.runs),
+                   baseline)
+    finally:
+        parallel.close()
+
+
+SAMPLE_TEXTS = {
+    "dialogue anglais": "Hello world! This is a test of the automatic language detection system.",
+    "dialogue japonais": "こんにちは世界！これは自動言語検出システムのテストです。カタカナも含まれています。",
+    "mixte": "Hello こんにちは World 世界！ 안녕하세요 Привет",
+}
+
+
+def legacy_detect_scripts(detector, text):
+    """Ancien detect_scripts: chaque caractère comparé à chaque plage de chaque script"""
+    script_counts = Counter()
+    for char in text:
+        code_point = ord(char)
+        if char.isspace() or char in '.,;:!?-—()[]{}「」『』':
+            continue
+        for script, ranges in detector.script_ranges.items():
+            for start, end in ranges:
+                if start <= code_point <= end:
+                    script_counts[script] += 1
+                    break
+    return script_counts
+
+
+def bench_scripts(args):
+    """detect_scripts: boucle Python historique vs table triée + cache par caractère"""
+    from language_detector import LanguageDetector
+
+    detector = LanguageDetector()
+    print(f"🔤 detect_scripts, {args.runs} runs")
+    for name, text in SAMPLE_TEXTS.items():
+        for repeat in (1, 50):
+            sample = '\n'.join([text] * repeat)
+            assert detector.detect_scripts(sample) == legacy_detect_scripts(detector, sample)
+            print(f"\n📝 {name} ×{repeat} ({len(sample)} caractères)")
+            baseline = measure(lambda: legacy_detect_scripts(detector, sample), args.runs)
+            report("boucle par plage (ancien)", baseline)
+            report("table + cache", measure(lambda: detector.detect_scripts(sample), args.runs), baseline)
+
+
+def bench_langid(args):
+    """Trigrammes latins: précision sur le corpus d'évaluation embarqué, chargement et classification"""
+    from trigram_langid import PROFILES_PATH, TrigramProfiles, trigram_keys
+
+    start_time = time.perf_counter()
+    profiles = TrigramProfiles.load()
+    load_ms = (time.perf_counter() - start_time) * 1000
+    print(f"🔤 Profils {os.path.basename(PROFILES_PATH)}: {profiles.keys.size} trigrammes × "
+          f"{len(profiles.languages)} langues, chargés en {load_ms:.1f}ms")
+
+    eval_path = os.path.join(os.path.dirname(PROFILES_PATH), 'eval.tsv')
+    with open(eval_path, encoding='utf-8') as f:
+        samples = [line.rstrip('\n').split('\t', 1) for line in f if line.strip()]
+
+    # Tranches de longueur (en trigrammes): libellés d'interface, phrases courtes, phrases
+    buckets = [('libellés < 20 trigrammes', 20), ('phrases courtes < 30', 30), ('phrases ≥ 30', None)]
+
+    def bucket_of(text):
+        count = trigram_keys(text).size
+        return next(name for name, limit in buckets if limit is None or count < limit)
+
+    correct, undecided, totals = Counter(), Counter(), Counter()
+    bucket_correct, bucket_undecided, bucket_wrong, bucket_totals = Counter(), Counter(), Counter(), Counter()
+    for lang, text in samples:
+        bucket = bucket_of(text)
+        totals[lang] += 1
+        bucket_totals[bucket] += 1
+        predicted = profiles.identify(text)
+        if predicted == lang:
+            correct[lang] += 1
+            bucket_correct[bucket] += 1
+        elif predicted is None:
+            undecided[lang] += 1
+            bucket_undecided[bucket] += 1
+        else:
+            bucket_wrong[bucket] += 1
+            print(f"   ❌ {lang} → {predicted}: {text}")
+
+    print(f"\n📊 Évaluation ({len(samples)} textes, {eval_path})")
+    for lang in sorted(totals):
+        print(f"   {lang}: {correct[lang]}/{totals[lang]} correctes, {undecided[lang]} indéterminée(s)")
+    print(f"   Total: {sum(correct.values()) / len(samples):.1%} correctes, "
+          f"{sum(undecided.values())} indéterminée(s) (→ langue précédente ou configurée dans detect_language)")
+
+    print("\n📏 Par longueur")
+    for name, _ in buckets:
+        if bucket_totals[name]:
+            print(f"   {name}: {bucket_correct[name]}/{bucket_totals[name]} correctes, "
+                  f"{bucket_undecided[name]} indéterminée(s), {bucket_wrong[name]} erreur(s)")
+
+    texts = [text for _, text in samples]
+    durations = measure(lambda: [profiles.identify(text) for text in texts], args.runs)
+    print(f"\n⏱️ Classification: {statistics.median(durations) * 1000 / len(texts):.0f}µs par phrase")
+
+
+BENCHMARKS = {
+    'ocr-passes': bench_ocr_passes,
+    'tesseract-backend': bench_tesseract_backend,
+    'preprocess': bench_preprocess,
+    'parallel-lines': bench_parallel_lines,
+    'scripts': bench_scripts,
+    'langid': bench_langid,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de latence Game Translator")
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS))
+    parser.add_argument('--image', action='append', default=[], help="Capture à utiliser (répétable)")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--languages', nargs='+', default=['ja', 'en'])
+    args = parser.parse_args()
+
+    BENCHMARKS[args.benchmark](args)
+
+
+if __name__ == '__main__':
+    main()
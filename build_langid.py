@@ -0,0 +1,93 @@
+"""
+Génère les profils de trigrammes de trigram_langid.py depuis le corpus embarqué
+
+Usage:
+    python build_langid.py [--top 400] [--alpha 0.5]
+
+Corpus: data/langid/train/<langue>.txt (une phrase par ligne)
+Sortie: data/langid/trigrams.npz
+"""
+import argparse
+import glob
+import os
+from collections import Counter
+
+import numpy as np
+
+from trigram_langid import PROFILES_PATH, decode_key, trigram_keys
+
+
+TRAIN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'langid', 'train')
+
+
+def count_trigrams(path):
+    """
+    Compte les trigrammes d'un fichier du corpus
+
+    Returns:
+        Counter: {clé: occurrences}
+    """
+    counts = Counter()
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            counts.update(trigram_keys(line).tolist())
+    return counts
+
+
+def build(top, alpha):
+    """
+    Construit les profils
+
+    Args:
+        top: Nombre de trigrammes les plus fréquents retenus par langue
+        alpha: Lissage additif des log-probabilités
+
+    Returns:
+        dict: Tableaux à enregistrer (keys, scores, unseen, languages)
+    """
+    paths = sorted(glob.glob(os.path.join(TRAIN_DIR, '*.txt')))
+    languages = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+    counts = [count_trigrams(path) for path in paths]
+
+    # Union des trigrammes caractéristiques de chaque langue
+    vocabulary = set()
+    for lang, lang_counts in zip(languages, counts):
+        common = [key for key, _ in lang_counts.most_common(top)]
+        vocabulary.update(common)
+        print(f"   {lang}: {sum(lang_counts.values())} trigrammes, "
+              f"ex: {', '.join(repr(decode_key(key)) for key in common[:5])}")
+
+    keys = np.array(sorted(vocabulary), dtype=np.uint64)
+    scores = np.empty((keys.size, len(languages)), dtype=np.float32)
+    unseen = np.empty(len(languages), dtype=np.float32)
+
+    for column, lang_counts in enumerate(counts):
+        total = sum(lang_counts.values()) + alpha * (keys.size + 1)
+        scores[:, column] = np.log((np.array([lang_counts.get(int(key), 0) for key in keys]) + alpha) / total)
+        unseen[column] = np.log(alpha / total)
+
+    return {
+        'keys': keys,
+        'scores': scores.astype(np.float16),
+        'unseen': unseen,
+        'languages': np.array(languages),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Génère data/langid/trigrams.npz")
+    parser.add_argument('--top', type=int, default=400, help="Trigrammes retenus par langue")
+    parser.add_argument('--alpha', type=float, default=0.5, help="Lissage additif")
+    args = parser.parse_args()
+
+    print(f"🔨 Profils de trigrammes depuis {TRAIN_DIR}")
+    arrays = build(args.top, args.alpha)
+    np.savez_compressed(PROFILES_PATH, **arrays)
+
+    size_kb = os.path.getsize(PROFILES_PATH) / 1024
+    print(f"✅ {arrays['keys'].size} trigrammes × {len(arrays['languages'])} langues "
+          f"→ {PROFILES_PATH} ({size_kb:.1f} Ko)")
+
+
+if __name__ == '__main__':
+    main()
@@ -179,7 +179,7 @@ class ConfigGUI:
         ).grid(row=0, column=0, sticky='w', pady=5)
 
         self.mode_combo = ttk.Combobox(
-            trans_frame, values=['tesseract', 'easyocr', 'vision'],
+            trans_frame, values=['tesseract', 'easyocr', 'vision', 'auto', 'race'],
             state='readonly', width=23, font=('Segoe UI', 10)
         )
         self.mode_combo.set(self.config.get('translation_mode', 'tesseract'))
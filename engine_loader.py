@@ -0,0 +1,124 @@
+"""
+Module pour charger les moteurs lourds (EasyOCR, modèle vision) en arrière-plan
+Le thread des hotkeys n'attend jamais un chargement
+"""
+import threading
+import time
+
+
+class EngineLoader:
+    """Construit un moteur dans un thread dédié et expose son état de préparation"""
+
+    IDLE = 'idle'
+    LOADING = 'loading'
+    READY = 'ready'
+    FAILED = 'failed'
+
+    def __init__(self, name, factory, is_usable=None, retry_delay=None):
+        """
+        Initialise le chargeur
+
+        Args:
+            name: Nom affiché dans la console (ex: 'EasyOCR')
+            factory: Fonction sans argument qui construit et retourne le moteur
+            is_usable: Fonction (moteur) -> bool pour valider le moteur construit (optionnel)
+            retry_delay: Secondes après un échec avant que start() ne retente le chargement
+                         (None = jamais, seulement via retry())
+        """
+        self.name = name
+        self.factory = factory
+        self.is_usable = is_usable
+        self.retry_delay = retry_delay
+        self.state = self.IDLE
+        self.error = None
+        self._failed_at = None
+        self._engine = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+
+    @property
+    def is_ready(self):
+        return self.state == self.READY
+
+    @property
+    def engine(self):
+        """Moteur chargé, ou None tant qu'il n'est pas prêt"""
+        return self._engine if self.state == self.READY else None
+
+    def start(self):
+        """
+        Lance le chargement en arrière-plan (sans effet s'il est en cours ou terminé)
+
+        Un échec reste FAILED (le moteur n'est pas reconstruit à chaque hotkey)
+        jusqu'à retry() ou l'expiration de retry_delay.
+
+        Returns:
+            str: État après l'appel
+        """
+        with self._lock:
+            if self.state in (self.LOADING, self.READY):
+                return self.state
+            if self.state == self.FAILED and not self._retry_due():
+                return self.FAILED
+            return self._launch()
+
+    def retry(self):
+        """
+        Relance le chargement même après un échec récent
+
+        Returns:
+            str: État après l'appel
+        """
+        with self._lock:
+            if self.state in (self.LOADING, self.READY):
+                return self.state
+            return self._launch()
+
+    def _retry_due(self):
+        """Délai de nouvelle tentative écoulé depuis l'échec (appelé avec _lock tenu)"""
+        return self.retry_delay is not None and time.time() - self._failed_at >= self.retry_delay
+
+    def _launch(self):
+        """Passe en LOADING et démarre le thread de chargement (appelé avec _lock tenu)"""
+        self.state = self.LOADING
+        self.error = None
+        self._ready.clear()
+
+        thread = threading.Thread(target=self._load, daemon=True)
+        thread.start()
+        return self.LOADING
+
+    def wait(self, timeout=None):
+        """
+        Attend la fin du chargement
+
+        Returns:
+            bool: True si le moteur est prêt
+        """
+        self._ready.wait(timeout)
+        return self.is_ready
+
+    def _load(self):
+        """Construit le moteur (exécuté dans le thread de chargement)"""
+        print(f"📦 Chargement de {self.name} en arrière-plan...")
+        start_time = time.time()
+
+        try:
+            engine = self.factory()
+            if self.is_usable is not None and not self.is_usable(engine):
+                # Moteur refusé (ex: proxy OCR retombé sur Tesseract): processus et threads libérés
+                close = getattr(engine, 'close', None)
+                if close is not None:
+                    close()
+                raise RuntimeError(f"{self.name} indisponible")
+        except Exception as e:
+            self.error = e
+            self._failed_at = time.time()
+            self.state = self.FAILED
+            print(f"⚠️ Échec du chargement de {self.name}: {e}")
+        else:
+            self._engine = engine
+            self.state = self.READY
+            print(f"✅ {self.name} prêt ({time.time() - start_time:.1f}s)")
+        finally:
+            self._ready.set()
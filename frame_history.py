@@ -0,0 +1,155 @@
+"""
+Module pour garder en mémoire les dernières secondes de l'écran
+Permet de traduire un dialogue qui a déjà disparu ("il y a X secondes")
+"""
+import math
+import threading
+import time
+
+import numpy as np
+
+from screenshot import CapturedFrame
+
+
+class FrameHistory:
+    """
+    Tampon circulaire de frames capturées à basse fréquence
+
+    Toute la mémoire est allouée une seule fois au démarrage:
+    capacité × hauteur × largeur × 3 octets (BGR, sous-échantillonné par `scale`).
+    """
+
+    def __init__(self, engine, bbox=None, seconds=10, fps=2, scale=1):
+        """
+        Initialise l'historique
+
+        Args:
+            engine: CaptureEngine partagé
+            bbox: Tuple (x1, y1, x2, y2) de la zone à garder, None pour l'écran principal
+            seconds: Durée d'historique conservée
+            fps: Nombre de captures par seconde
+            scale: Sous-échantillonnage des pixels (1 = pleine résolution, 2 = moitié...)
+        """
+        self.engine = engine
+        self.bbox = tuple(bbox) if bbox else None
+        self.fps = fps
+        self.scale = max(1, int(scale))
+        self.capacity = max(1, math.ceil(seconds * fps))
+
+        self._buffer = None
+        self._timestamps = np.zeros(self.capacity, dtype=np.float64)
+        self._next = 0
+        self._count = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop_event = threading.Event()
+
+        # Statistiques de coût (capture + copie dans le tampon)
+        self.captures = 0
+        self.capture_time = 0.0
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def memory_bytes(self):
+        """Mémoire occupée par le tampon (fixe une fois démarré)"""
+        return self._buffer.nbytes if self._buffer is not None else 0
+
+    def start(self):
+        """Alloue le tampon et démarre la capture en arrière-plan"""
+        if self.is_running:
+            return
+
+        if self.bbox is None:
+            self.bbox = self.engine.grab_monitor().bbox
+
+        width = math.ceil((self.bbox[2] - self.bbox[0]) / self.scale)
+        height = math.ceil((self.bbox[3] - self.bbox[1]) / self.scale)
+        self._buffer = np.empty((self.capacity, height, width, 3), dtype=np.uint8)
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+        print(f"⏪ Historique: {self.capacity} frames {width}x{height} "
+              f"({self.memory_bytes / 1024 / 1024:.1f} Mo) à {self.fps} fps")
+
+    def stop(self):
+        """Arrête la capture et affiche les statistiques"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        self._thread = None
+
+        stats = self.stats()
+        if stats['captures']:
+            print(f"⏪ Historique arrêté: {stats['captures']} captures, "
+                  f"{stats['avg_capture_ms']:.2f}ms/capture, {stats['memory_mb']:.1f} Mo")
+
+    def stats(self):
+        """
+        Statistiques de l'historique
+
+        Returns:
+            dict: captures, coût moyen par capture (ms), frames disponibles, mémoire (Mo)
+        """
+        return {
+            'captures': self.captures,
+            'avg_capture_ms': self.capture_time / self.captures * 1000 if self.captures else 0.0,
+            'frames': self._count,
+            'memory_mb': self.memory_bytes / 1024 / 1024,
+        }
+
+    def frame_at(self, seconds_ago):
+        """
+        Retourne la frame la plus proche de l'instant demandé
+
+        Args:
+            seconds_ago: Ancienneté souhaitée (secondes)
+
+        Returns:
+            CapturedFrame (copie indépendante du tampon) ou None si historique vide
+        """
+        with self._lock:
+            if self._count == 0:
+                return None
+
+            if self._count < self.capacity:
+                stored = self._timestamps[:self._count]
+            else:
+                stored = self._timestamps
+
+            target = time.time() - seconds_ago
+            index = int(np.argmin(np.abs(stored - target)))
+            pixels = self._buffer[index].copy()
+            timestamp = float(self._timestamps[index])
+
+        pixels.flags.writeable = False
+        return CapturedFrame(pixels, self.bbox, timestamp, self.scale)
+
+    def _store(self, frame):
+        """Copie une frame dans l'emplacement suivant du tampon (aucune allocation)"""
+        step = self.scale
+        with self._lock:
+            np.copyto(self._buffer[self._next], frame.pixels[::step, ::step, :3])
+            self._timestamps[self._next] = frame.timestamp
+            self._next = (self._next + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+
+    def _run(self):
+        """Boucle de capture à basse fréquence"""
+        interval = 1.0 / self.fps
+        while not self._stop_event.is_set():
+            started = time.perf_counter()
+
+            try:
+                self._store(self.engine.grab(self.bbox))
+                self.captures += 1
+                self.capture_time += time.perf_counter() - started
+            except Exception as e:
+                print(f"❌ Erreur de capture de l'historique: {e}")
+
+            elapsed = time.perf_counter() - started
+            self._stop_event.wait(max(0.0, interval - elapsed))
@@ -0,0 +1,327 @@
+"""
+Index de similarité pour retrouver un texte déjà traduit malgré le bruit OCR
+MinHash/LSH sur les trigrammes de caractères, candidats vérifiés par distance d'édition
+"""
+import re
+
+import numpy as np
+
+
+# Premier de Mersenne des fonctions de hachage universelles de MinHash
+_MERSENNE = np.uint64((1 << 31) - 1)
+
+# Version de fold_text: les signatures stockées avec une autre version sont recalculées
+SIGNATURE_VERSION = 2
+
+# Confusions OCR ramenées au même caractère avant comparaison
+_OCR_FOLD = str.maketrans({'|': 'l', '¦': 'l', '’': "'", '‘': "'", '“': '"', '”': '"',
+                           '。': '.', '？': '?', '！': '!'})
+# Ponctuation de fin de phrase gardée: question, exclamation et affirmation ne se traduisent pas pareil
+_NOISE = re.compile(r"[^\w\s?!.…]+")
+_SENTENCE_MARKS = re.compile(r"[?!.…]+")
+_DIGITS = re.compile(r"\d+")
+
+
+def fold_text(text):
+    """
+    Forme de comparaison d'un texte OCR: confusions courantes fusionnées, ponctuation
+    parasite retirée (sauf ?!.…), espaces réduits; la casse est conservée
+
+    Args:
+        text: Texte (déjà passé par normalize_text de préférence)
+
+    Returns:
+        str: Texte replié
+    """
+    text = _NOISE.sub(' ', text.translate(_OCR_FOLD).replace('...', '…'))
+    return ' '.join(text.split())
+
+
+def edit_distance(a, b, max_distance):
+    """
+    Distance de Levenshtein limitée à une bande de largeur max_distance
+
+    Args:
+        a, b: Chaînes à comparer
+        max_distance: Au-delà, le calcul s'arrête
+
+    Returns:
+        int: Distance, ou max_distance + 1 si elle est dépassée
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if len(a) > len(b):
+        a, b = b, a
+
+    too_far = max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        low = max(1, i - max_distance)
+        high = min(len(b), i + max_distance)
+        current = [too_far] * (len(b) + 1)
+        current[0] = i if i <= max_distance else too_far
+        for j in range(low, high + 1):
+            cost = previous[j - 1] + (char_a != b[j - 1])
+            current[j] = min(cost, previous[j] + 1, current[j - 1] + 1)
+        if min(current[low - 1:high + 1]) > max_distance:
+            return too_far
+        previous = current
+    return min(previous[len(b)], too_far)
+
+
+class MinHashIndex:
+    """
+    Textes indexés par signature MinHash, regroupés en bandes LSH
+
+    Deux textes dont beaucoup de trigrammes coïncident partagent au moins une bande
+    avec une forte probabilité; seuls ces candidats sont comparés caractère par caractère.
+    """
+
+    def __init__(self, num_perm=32, bands=8, seed=1):
+        """
+        Args:
+            num_perm: Nombre de fonctions de hachage (taille de la signature)
+            bands: Nombre de bandes LSH (num_perm / bands valeurs par bande)
+            seed: Graine des fonctions de hachage (les signatures stockées en dépendent)
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm doit être un multiple de bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_MERSENNE), size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, int(_MERSENNE), size=(num_perm, 1), dtype=np.uint64)
+        # Multiplicateurs impairs pour réduire une bande de `rows` valeurs à un entier
+        self._band_weights = rng.integers(1, 1 << 62, size=self.rows, dtype=np.uint64) | np.uint64(1)
+
+        self._reset()
+
+    def _reset(self):
+        """Index vide"""
+        self._items = []
+        self._folded = []
+        self._signatures = np.empty((64, self.num_perm), dtype=np.uint32)
+        self._buckets = [{} for _ in range(self.bands)]
+        self._sorted_keys = None
+        self._sorted_indices = None
+        self._exact = {}
+        # Positions des textes retirés (ignorées jusqu'au prochain compactage)
+        self._removed = set()
+
+    def __len__(self):
+        return len(self._items) - len(self._removed)
+
+    def signature(self, folded):
+        """
+        Signature MinHash d'un texte replié
+
+        Args:
+            folded: Texte passé par fold_text
+
+        Returns:
+            numpy.ndarray uint32 (num_perm,)
+        """
+        codes = np.frombuffer(f" {folded} ".encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+        shingles = (codes[:-2] * np.uint64(1048573) + codes[1:-1] * np.uint64(1021) + codes[2:]) & np.uint64(0xFFFFFFFF)
+        return ((self._a * shingles + self._b) % _MERSENNE).min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signatures):
+        """
+        Clés LSH: chaque bande de chaque signature réduite à un entier
+
+        Args:
+            signatures: numpy.ndarray uint32 (n, num_perm)
+
+        Returns:
+            numpy.ndarray uint64 (n, bands)
+        """
+        bands = signatures.reshape(len(signatures), self.bands, self.rows).astype(np.uint64)
+        return (bands * self._band_weights).sum(axis=2)
+
+    def add(self, item, text, signature=None):
+        """
+        Indexe un texte
+
+        Args:
+            item: Valeur retournée par query (ex: clé du cache)
+            text: Texte source
+            signature: Signature déjà calculée (bytes relus sur disque, optionnel)
+
+        Returns:
+            numpy.ndarray: Signature du texte (à stocker avec lui)
+        """
+        return self.add_many([item], [text], [signature])[0]
+
+    def add_many(self, items, texts, signatures=None):
+        """
+        Indexe plusieurs textes (ex: chargement du cache au démarrage)
+
+        Au-delà de quelques dizaines de textes, les clés LSH vont dans des tableaux
+        triés par bande (recherche binaire) plutôt que dans les dictionnaires.
+
+        Args:
+            items: Valeurs retournées par query
+            texts: Textes sources
+            signatures: Signatures stockées (bytes) ou None pour celles à calculer (optionnel)
+
+        Returns:
+            numpy.ndarray uint32 (len(texts), num_perm): Signatures des textes
+        """
+        folded_texts = [fold_text(text) for text in texts]
+        size = self.num_perm * 4
+        if signatures is None:
+            signatures = [None] * len(texts)
+        valid = [signature is not None and len(signature) == size for signature in signatures]
+        matrix = np.frombuffer(
+            b''.join(signature if ok else bytes(size) for signature, ok in zip(signatures, valid)),
+            dtype=np.uint32
+        ).reshape(len(texts), self.num_perm).copy()
+        for position, ok in enumerate(valid):
+            if not ok:
+                matrix[position] = self.signature(folded_texts[position])
+
+        self._insert(items, folded_texts, matrix)
+        return matrix
+
+    def _insert(self, items, folded_texts, matrix):
+        """
+        Ajoute des textes repliés et leurs signatures aux bandes LSH
+
+        Args:
+            items: Valeurs retournées par query
+            folded_texts: Textes passés par fold_text
+            matrix: numpy.ndarray uint32 (len(items), num_perm) des signatures
+        """
+        kept = []
+        for position, folded in enumerate(folded_texts):
+            if folded in self._exact:
+                # Même texte replié: query retourne déjà le premier indexé
+                continue
+            self._exact[folded] = len(self._items)
+            self._items.append(items[position])
+            self._folded.append(folded)
+            kept.append(position)
+        if not kept:
+            return
+
+        first = len(self._items) - len(kept)
+        if len(self._items) > self._signatures.shape[0]:
+            grown = np.empty((max(len(self._items), 2 * self._signatures.shape[0]), self.num_perm), dtype=np.uint32)
+            grown[:first] = self._signatures[:first]
+            self._signatures = grown
+        self._signatures[first:len(self._items)] = matrix[kept]
+
+        keys = self._band_keys(matrix[kept])
+        if len(kept) < 64:
+            for row, index in zip(keys.tolist(), range(first, len(self._items))):
+                for bucket, band_key in zip(self._buckets, row):
+                    bucket.setdefault(band_key, []).append(index)
+        else:
+            indices = np.broadcast_to(np.arange(first, len(self._items)), (self.bands, len(kept)))
+            keys = keys.T
+            if self._sorted_keys is not None:
+                keys = np.concatenate((self._sorted_keys, keys), axis=1)
+                indices = np.concatenate((self._sorted_indices, indices), axis=1)
+            order = np.argsort(keys, axis=1, kind='stable')
+            self._sorted_keys = np.take_along_axis(keys, order, axis=1)
+            self._sorted_indices = np.take_along_axis(indices, order, axis=1)
+
+    def remove_many(self, items, texts):
+        """
+        Retire des textes de l'index (ex: entrées supprimées du cache)
+
+        Les positions retirées sont ignorées par query; l'index n'est reconstruit
+        (sans recalculer de signature) qu'une fois la moitié de ses textes retirés.
+
+        Args:
+            items: Valeurs passées à add / add_many
+            texts: Textes correspondants
+
+        Returns:
+            int: Nombre de textes retirés
+        """
+        removed = 0
+        for item, text in zip(items, texts):
+            folded = fold_text(text)
+            index = self._exact.get(folded)
+            if index is None or self._items[index] != item:
+                continue
+            del self._exact[folded]
+            self._removed.add(index)
+            removed += 1
+
+        if len(self._removed) * 2 > len(self._items):
+            self._compact()
+        return removed
+
+    def _compact(self):
+        """Reconstruit l'index avec les seuls textes conservés (signatures réutilisées)"""
+        kept = [index for index in range(len(self._items)) if index not in self._removed]
+        items = [self._items[index] for index in kept]
+        folded_texts = [self._folded[index] for index in kept]
+        matrix = self._signatures[kept]
+        self._reset()
+        self._insert(items, folded_texts, matrix)
+
+    def _candidates(self, signature):
+        """Index des textes partageant au moins une bande LSH avec la signature"""
+        band_keys = self._band_keys(signature[np.newaxis])[0]
+        candidates = set()
+        for bucket, band_key in zip(self._buckets, band_keys.tolist()):
+            candidates.update(bucket.get(band_key, ()))
+        if self._sorted_keys is not None:
+            for band, band_key in enumerate(band_keys):
+                keys = self._sorted_keys[band]
+                low = np.searchsorted(keys, band_key, side='left')
+                high = np.searchsorted(keys, band_key, side='right')
+                candidates.update(self._sorted_indices[band, low:high].tolist())
+        return candidates - self._removed
+
+    def query(self, text, min_similarity=0.9, min_length=8, max_candidates=5):
+        """
+        Texte indexé le plus proche
+
+        Args:
+            text: Texte recherché
+            min_similarity: Similarité minimale 1 - distance d'édition / longueur (0-1)
+            min_length: Longueur minimale du texte replié (les textes courts diffèrent trop d'un caractère)
+            max_candidates: Candidats vérifiés par distance d'édition (les plus proches en MinHash)
+
+        Returns:
+            tuple: (item, similarité) ou None
+        """
+        folded = fold_text(text)
+        if len(folded) < min_length or not len(self):
+            return None
+        index = self._exact.get(folded)
+        if index is not None:
+            return self._items[index], 1.0
+
+        signature = self.signature(folded)
+        candidates = self._candidates(signature)
+        if not candidates:
+            return None
+
+        # Un nombre ou une ponctuation de phrase différents changent le sens: jamais confondus
+        digits = _DIGITS.findall(folded)
+        marks = _SENTENCE_MARKS.findall(folded)
+        candidates = np.fromiter(candidates, dtype=np.int64)
+        estimated = (self._signatures[candidates] == signature).mean(axis=1)
+        order = np.argsort(-estimated)[:max_candidates]
+
+        best = None
+        for index in candidates[order]:
+            other = self._folded[index]
+            if _DIGITS.findall(other) != digits or _SENTENCE_MARKS.findall(other) != marks:
+                continue
+            length = max(len(folded), len(other))
+            max_distance = int(length * (1 - min_similarity))
+            distance = edit_distance(folded, other, max_distance)
+            if distance > max_distance:
+                continue
+            similarity = 1 - distance / length
+            if best is None or similarity > best[1]:
+                best = (self._items[index], similarity)
+        return best
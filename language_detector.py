@@ -2,13 +2,36 @@
 Module pour la détection automatique de langue dans les images
 """
 import re
+import time
+from bisect import bisect_right
 from collections import Counter
 
+import numpy as np
+
+from text_lines import ink_mask, segment_lines
+from trigram_langid import identify_latin_language
+
+
+# Caractères ignorés par detect_scripts (en plus des espaces)
+IGNORED_CHARS = '.,;:!?-—()[]{}「」『』'
+
+# Familles de langues par écriture (pour choisir les langues Tesseract depuis l'image)
+CJK_LANGUAGES = ('ja', 'zh_sim', 'zh_tra', 'ch_sim')
+NON_LATIN_LANGUAGES = CJK_LANGUAGES + ('ko', 'ru', 'ar', 'th')
+
 
 class LanguageDetector:
     """Détecte la langue d'un texte basé sur les caractères Unicode"""
     
-    def __init__(self):
+    def __init__(self, latin_fallback='en'):
+        """
+        Args:
+            latin_fallback: Langue latine retenue quand les trigrammes ne tranchent pas
+                            (texte court, libellé de menu) et que l'appelant n'en propose pas;
+                            'en' si la langue donnée n'est pas en écriture latine
+        """
+        self.latin_fallback = 'en' if latin_fallback in NON_LATIN_LANGUAGES else latin_fallback
+        
         # Plages Unicode pour différents scripts
         self.script_ranges = {
             'latin': [(0x0041, 0x007A), (0x00C0, 0x00FF)],  # A-Z, a-z, accents
@@ -20,6 +43,18 @@ class LanguageDetector:
             'hangul': [(0xAC00, 0xD7AF)],  # Hangul coréen
             'thai': [(0x0E00, 0x0E7F)],  # Thaï
         }
+        
+        # Table triée des plages (début, fin, script) pour une recherche par bisection
+        table = sorted(
+            (start, end, script)
+            for script, ranges in self.script_ranges.items()
+            for start, end in ranges
+        )
+        self._range_starts = [start for start, _, _ in table]
+        self._range_table = table
+        
+        # Script déjà calculé pour chaque caractère rencontré (None = ignoré)
+        self._script_cache = {}
     
     def detect_scripts(self, text):
         """
@@ -32,29 +67,51 @@ class LanguageDetector:
             dict: {script: count} des caractères par script
         """
         script_counts = Counter()
+        cache = self._script_cache
         
-        for char in text:
-            code_point = ord(char)
-            
-            # Ignorer espaces et ponctuation
-            if char.isspace() or char in '.,;:!?-—()[]{}「」『』':
-                continue
-            
-            # Vérifier chaque script
-            for script, ranges in self.script_ranges.items():
-                for start, end in ranges:
-                    if start <= code_point <= end:
-                        script_counts[script] += 1
-                        break
+        # Compter chaque caractère distinct une seule fois (Counter est en C),
+        # puis classer les caractères distincts via le cache
+        for char, count in Counter(text).items():
+            try:
+                script = cache[char]
+            except KeyError:
+                script = cache[char] = self._script_of(char)
+            if script is not None:
+                script_counts[script] += count
         
         return script_counts
     
-    def detect_language(self, text):
+    def _script_of(self, char):
+        """
+        Script d'un caractère (bisection sur les plages triées)
+        
+        Returns:
+            str ou None si le caractère est ignoré ou hors des plages connues
+        """
+        # Ignorer espaces et ponctuation
+        if char.isspace() or char in IGNORED_CHARS:
+            return None
+        
+        code_point = ord(char)
+        index = bisect_right(self._range_starts, code_point) - 1
+        if index >= 0:
+            _, end, script = self._range_table[index]
+            if code_point <= end:
+                return script
+        return None
+    
+    def detect_language(self, text, latin_fallback=None):
         """
         Détecte la ou les langues probables du texte
         
+        Aucun état n'est gardé entre deux appels: un même détecteur sert des
+        extractions simultanées (hotkey, zone surveillée) sans mélanger leurs langues.
+        
         Args:
             text: Texte à analyser
+            latin_fallback: Langue retenue pour un texte latin indéterminé, ex: celle de la
+                            capture précédente du même appelant (défaut: celle du constructeur;
+                            ignorée si elle n'est pas en écriture latine)
             
         Returns:
             list: Liste des langues détectées (codes pour OCR)
@@ -93,9 +150,11 @@ class LanguageDetector:
         if percentages.get('hangul', 0) > 10:
             detected_languages.append('ko')
         
-        # Latin (anglais, français, etc.)
+        # Latin: langue précisée par les trigrammes, sinon celle de l'appelant ou configurée
         if percentages.get('latin', 0) > 20:
-            detected_languages.append('en')
+            if not latin_fallback or latin_fallback in NON_LATIN_LANGUAGES:
+                latin_fallback = self.latin_fallback
+            detected_languages.append(identify_latin_language(text) or latin_fallback)
         
         # Cyrillique (russe)
         if percentages.get('cyrillic', 0) > 20:
@@ -148,6 +207,142 @@ class LanguageDetector:
             'scripts_detected': dict(scripts),
             'confidence': 'high' if total_chars > 10 else 'low'
         }
+    
+    def detect_script_from_image(self, image, min_line_height=8):
+        """
+        Devine l'écriture d'une capture directement depuis les pixels (sans OCR)
+        
+        Mesures par ligne de texte (profils de projection NumPy):
+        - remplissage vertical: le latin minuscule concentre l'encre dans la hauteur
+          d'x, les idéogrammes et le hangul occupent tout le carré du glyphe
+        - traits par colonne: un glyphe CJK/hangul croise bien plus de traits
+          horizontaux qu'une lettre latine (même en majuscules)
+        - espaces entre mots: présents en coréen, absents en japonais/chinois
+        - encre au-dessus de la hauteur d'x: rare en cyrillique minuscule
+        
+        Args:
+            image: PIL.Image
+            min_line_height: Hauteur de ligne minimale (pixels) pour une mesure fiable
+            
+        Returns:
+            dict: {'script': 'latin'|'cyrillic'|'cjk'|'hangul'|'uncertain', 'confidence': 0-1,
+                   'lines': nombre de lignes mesurées, 'elapsed_ms': durée}
+                  ou None si la capture ne contient pas assez de texte mesurable
+        """
+        start_time = time.perf_counter()
+        gray = np.asarray(image.convert('L'))
+        ink = ink_mask(gray)
+        
+        votes = Counter()
+        lines = 0
+        for y1, y2 in segment_lines(gray, padding=0):
+            if y2 - y1 < min_line_height:
+                continue
+            features = _line_script_features(ink[y1:y2])
+            if features is None:
+                continue
+            script, weight = features
+            votes[script] += weight
+            lines += 1
+        
+        if not votes:
+            return None
+        
+        script, weight = votes.most_common(1)[0]
+        return {
+            'script': script,
+            'confidence': weight / sum(votes.values()),
+            'lines': lines,
+            'elapsed_ms': (time.perf_counter() - start_time) * 1000,
+        }
+    
+    def languages_from_image(self, image, configured_languages, min_confidence=0.8):
+        """
+        Choisit les langues OCR d'après l'écriture visible, avant toute passe OCR
+        
+        Seul un verdict CJK / hangul franc restreint les langues configurées
+        (ex: écriture CJK + config ['ja', 'fr', 'en'] → ['ja', 'en']). Un verdict latin,
+        cyrillique ou incertain garde toutes les langues configurées: une langue CJK
+        n'est jamais retirée sur la foi des seuils latins.
+        
+        Args:
+            image: PIL.Image
+            configured_languages: Langues configurées (ocr_languages)
+            min_confidence: Part minimale (0-1) des lignes votant pour l'écriture retenue
+            
+        Returns:
+            list: Langues pour l'OCR (les langues configurées si l'écriture est indéterminée)
+        """
+        detected = self.detect_script_from_image(image)
+        if detected is None:
+            return list(configured_languages)
+        
+        script = detected['script']
+        keep_english = ['en'] if 'en' in configured_languages else []
+        
+        if detected['confidence'] < min_confidence:
+            languages = list(configured_languages)
+        elif script == 'cjk':
+            languages = [lang for lang in configured_languages if lang in CJK_LANGUAGES] or ['ja']
+            languages += keep_english
+        elif script == 'hangul':
+            languages = ['ko'] + keep_english
+        else:
+            languages = list(configured_languages)
+        
+        print(f"🔤 Écriture détectée: {script} ({detected['confidence']:.0%}, "
+              f"{detected['lines']} ligne(s), {detected['elapsed_ms']:.1f}ms) → {', '.join(languages)}")
+        return languages
+
+
+def _line_script_features(band):
+    """
+    Classe une ligne de texte binarisée
+    
+    Args:
+        band: numpy.ndarray booléen (hauteur de ligne, largeur), True = encre
+        
+    Returns:
+        tuple: (écriture, poids = largeur encrée) ou None si ligne vide
+    """
+    height = band.shape[0]
+    ink_columns = band.any(axis=0)
+    if ink_columns.sum() < height:
+        return None
+    
+    # Remplissage vertical: part des rangées proches du maximum d'encre
+    row_ink = band.sum(axis=1)
+    core_rows = np.flatnonzero(row_ink >= 0.35 * row_ink.max())
+    fill = core_rows.size / height
+    
+    # Traits croisés par colonne encrée (nombre de segments d'encre verticaux)
+    columns = band[:, ink_columns].astype(np.int8)
+    strokes = float((np.diff(columns, axis=0, prepend=0) == 1).sum(axis=0).mean())
+    
+    # Espaces entre mots: trous de plus de 0.3 hauteur de ligne entre deux blocs d'encre
+    edges = np.diff(np.concatenate(([0], ink_columns.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    gaps = (starts[1:] - ends[:-1]) / height
+    word_gaps = float((gaps > 0.3).mean()) if gaps.size else 0.0
+    
+    weight = int(ink_columns.sum())
+    
+    if fill >= 0.75 and strokes >= 2.2:
+        # Glyphes carrés et complexes
+        return ('hangul' if word_gaps >= 0.1 else 'cjk'), weight
+    
+    if fill >= 0.75:
+        # Glyphes carrés et simples: majuscules latines ou kana / kanji peu tracés
+        return 'uncertain', weight
+    
+    if fill < 0.75:
+        # Structure hauteur d'x: encre au-dessus rare → cyrillique minuscule
+        ascender_ink = row_ink[:core_rows[0]].sum() / row_ink.sum()
+        if ascender_ink < 0.03:
+            return 'cyrillic', weight
+    
+    return 'latin', weight
 
 
 def auto_detect_languages(image, sample_text=None):
@@ -155,7 +350,7 @@ def auto_detect_languages(image, sample_text=None):
     Helper function pour détecter automatiquement les langues
     
     Args:
-        image: PIL Image (non utilisé pour l'instant, future analyse visuelle)
+        image: PIL Image (analysée si aucun texte n'est fourni)
         sample_text: Texte échantillon déjà extrait (optionnel)
         
     Returns:
@@ -166,6 +361,8 @@ def auto_detect_languages(image, sample_text=None):
     if sample_text:
         return detector.detect_language(sample_text)
     
-    # Si pas de texte fourni, on ne peut pas détecter
-    # Dans le futur, on pourrait faire une pré-analyse rapide de l'image
+    # Sans texte: classification de l'écriture depuis les pixels
+    if image is not None:
+        return detector.languages_from_image(image, ['en'])
+    
     return ['en']
@@ -10,16 +10,35 @@ from pathlib import Path
 
 import keyboard
 
-from screenshot import capture_with_selection
-from ocr_handler import OCRHandler
-from translator import OllamaTranslator
+from screenshot import (CaptureEngine, ScreenshotSelector, capture_screen_area,
+                        capture_with_selection, select_from_frame)
+from ocr_handler import ImagePreprocessor, OCRHandler
+from ollama_client import OllamaClient
+from ollama_async import AsyncOllamaClient, CancelledError
+from translator import OllamaTranslator, split_list_segments
 from vision_translator import VisionTranslator
-from overlay import show_overlay_threaded, show_error_overlay
+from overlay import StreamBuffer, show_overlay_threaded, show_error_overlay, show_live_overlay
+from region_watcher import RegionWatcher
+from text_stabilizer import TextStabilizer
+from frame_history import FrameHistory
+from engine_loader import EngineLoader
+from ocr_cascade import OCRCascade
+from ocr_race import OCRRace
+from ocr_worker import OCRWorkerProxy
 
 
 class GameTranslator:
     """Application principale"""
     
+    # Moteurs lourds que chaque mode peut utiliser
+    MODE_ENGINES = {
+        'tesseract': (),
+        'easyocr': ('easyocr',),
+        'vision': ('vision',),
+        'auto': ('easyocr', 'vision'),
+        'race': ('easyocr',)
+    }
+    
     def __init__(self, config_path='config.json'):
         """
         Initialise l'application
@@ -36,38 +55,105 @@ class GameTranslator:
         # Initialiser les composants
         self.translation_mode = self.config.get('translation_mode', 'tesseract')
         
-        # Initialiser le traducteur vision (lazy loading)
-        self.vision_translator = None
-        if self.translation_mode == 'vision':
-            self.vision_translator = VisionTranslator(
-                model_name=self.config.get('vision_model', 'gemma3:4b'),
-                ollama_url=self.config.get('ollama_url', 'http://localhost:11434')
-            )
+        # Pool de connexions Ollama partagé par les traducteurs texte et vision
+        self.ollama_client = OllamaClient.from_config(self.config)
         
-        # Initialiser OCR handlers (lazy loading pour EasyOCR)
-        ocr_languages = self.config.get('ocr_languages', ['en'])
-        auto_detect = self.config.get('auto_detect_language', True)
+        # Générations asynchrones: une nouvelle traduction annule celle qu'elle remplace
+        self.async_ollama = AsyncOllamaClient.from_config(self.config)
         
+        # Traducteur vision (client léger, le modèle est préchargé en arrière-plan)
+        self.vision_translator = VisionTranslator(
+            model_name=self.config.get('vision_model', 'gemma3:4b'),
+            client=self.ollama_client,
+            async_client=self.async_ollama
+        )
+        
+        # Initialiser OCR handlers
         # Tesseract toujours disponible
-        self.ocr_tesseract = OCRHandler(engine='tesseract', languages=ocr_languages, auto_detect=auto_detect)
+        self.ocr_tesseract = self.create_ocr_handler('tesseract')
         
-        # EasyOCR lazy loading
-        self.ocr_easyocr = None
-        if self.translation_mode == 'easyocr':
-            self.ocr_easyocr = OCRHandler(engine='easyocr', languages=ocr_languages, auto_detect=auto_detect)
+        # EasyOCR et modèle vision: chargés en arrière-plan, Tesseract sert
+        # les requêtes tant qu'ils ne sont pas prêts
+        # Un moteur en échec n'est retenté qu'après engine_retry_delay secondes
+        retry_delay = self.config.get('engine_retry_delay', 300)
+        self.easyocr_loader = EngineLoader(
+            'EasyOCR',
+            lambda: self.create_ocr_handler('easyocr'),
+            is_usable=lambda handler: handler.engine == 'easyocr',
+            retry_delay=retry_delay
+        )
+        self.vision_loader = EngineLoader('modèle vision', self._warm_up_vision, retry_delay=retry_delay)
         
-        # OCR actif selon le mode
-        if self.translation_mode == 'easyocr':
-            self.ocr = self.ocr_easyocr if self.ocr_easyocr else self.ocr_tesseract
-        else:
-            self.ocr = self.ocr_tesseract
+        # Mode auto: Tesseract d'abord, escalade vers EasyOCR puis vision si douteux
+        auto_config = self.config.get('auto_mode', {})
+        self.ocr_cascade = OCRCascade(
+            self.ocr_tesseract,
+            lambda: self.ocr_easyocr,
+            min_confidence=auto_config.get('min_confidence', 70),
+            min_plausibility=auto_config.get('min_plausibility', 0.75),
+            use_vision=auto_config.get('use_vision', True)
+        )
+        
+        # Mode race: Tesseract et EasyOCR en parallèle, le premier résultat fiable gagne
+        race_config = self.config.get('race_mode', {})
+        self.ocr_race = OCRRace(
+            self.ocr_tesseract,
+            lambda: self.ocr_easyocr,
+            min_confidence=race_config.get('min_confidence', 70),
+            min_plausibility=race_config.get('min_plausibility', 0.75)
+        )
+        
+        # Préchargement limité aux moteurs que le mode configuré peut utiliser
+        # (pas de torch chargé pour rien en mode Tesseract)
+        usable = self.MODE_ENGINES.get(self.translation_mode, ())
+        preload = [engine for engine in self.config.get('preload_engines', []) if engine in usable]
+        if self.translation_mode in ('easyocr', 'auto', 'race') or 'easyocr' in preload:
+            self.easyocr_loader.start()
+        if self.translation_mode == 'vision' or 'vision' in preload:
+            self.vision_loader.start()
         
         # Translator pour les modes OCR
-        self.translator = OllamaTranslator(self.config)
+        self.translator = OllamaTranslator(self.config, client=self.ollama_client, async_client=self.async_ollama)
+        threading.Thread(target=self.translator.preload_cache, daemon=True).start()
+        
+        # Moteur de capture persistant (un seul handle mss pour toute la session)
+        self.capture_engine = CaptureEngine()
+        
+        # Requêtes de traduction: la plus récente gagne, les précédentes sont abandonnées
+        self.is_capturing = False
+        self.active_requests = 0
+        self.latest_request = 0
+        self._request_lock = threading.Lock()
         
-        self.is_processing = False
+        # Dernière langue détectée par canal ('translate', 'watch'): repli des libellés
+        # trop courts pour être identifiés, sans mélanger hotkey et zone surveillée
+        self.last_langs = {}
         self.hotkey = self.config.get('hotkey', 'ctrl+shift+t')
         self.toggle_hotkey = self.config.get('toggle_mode_hotkey', 'ctrl+shift+m')
+        self.region_presets = self.load_region_presets()
+        
+        # Mode surveillance continue d'une zone (watch_region)
+        self.watch_config = self.config.get('watch_region', {})
+        self.watch_hotkey = self.watch_config.get('hotkey', 'ctrl+shift+w')
+        self.watcher = None
+        self.watch_overlay = None
+        self.watch_stabilizer = TextStabilizer(
+            self.on_watch_stable,
+            stable_window=self.watch_config.get('stable_window', 0.6)
+        )
+        
+        # Historique des dernières secondes pour la traduction rétroactive (frame_history)
+        self.history_config = self.config.get('frame_history', {})
+        self.history_hotkey = self.history_config.get('hotkey', 'ctrl+shift+r')
+        self.frame_history = None
+        if self.history_config.get('enabled', False):
+            self.frame_history = FrameHistory(
+                self.capture_engine,
+                bbox=self.history_config.get('bbox'),
+                seconds=self.history_config.get('seconds', 10),
+                fps=self.history_config.get('fps', 2),
+                scale=self.history_config.get('scale', 1)
+            )
         
         print("=" * 50)
     
@@ -121,6 +207,103 @@ class GameTranslator:
             print(f"❌ Erreur de parsing JSON: {e}")
             sys.exit(1)
     
+    @property
+    def ocr_easyocr(self):
+        """Handler EasyOCR, ou None tant qu'il n'est pas chargé"""
+        return self.easyocr_loader.engine
+    
+    @property
+    def ocr(self):
+        """OCR actif: EasyOCR une fois prêt en mode easyocr, Tesseract sinon"""
+        if self.translation_mode == 'easyocr' and self.easyocr_loader.is_ready:
+            return self.easyocr_loader.engine
+        return self.ocr_tesseract
+    
+    def _warm_up_vision(self):
+        """Précharge le modèle vision dans Ollama (exécuté par vision_loader)"""
+        if not self.vision_translator.warm_up():
+            raise RuntimeError(f"modèle '{self.vision_translator.model_name}' non chargé")
+        return self.vision_translator
+    
+    def create_ocr_handler(self, engine):
+        """
+        Crée un OCRHandler configuré depuis config.json
+        
+        Si "ocr_worker" est activé pour ce moteur, l'OCR tourne dans un processus
+        dédié (OCRWorkerProxy, même interface) pour ne pas bloquer les hotkeys.
+        
+        Args:
+            engine: 'tesseract' ou 'easyocr'
+            
+        Returns:
+            OCRHandler ou OCRWorkerProxy
+        """
+        handler_kwargs = dict(
+            engine=engine,
+            languages=self.config.get('ocr_languages', ['en']),
+            auto_detect=self.config.get('auto_detect_language', True),
+            confidence_threshold=self.config.get('ocr_confidence_threshold', 60),
+            min_confidence=self.config.get('ocr_min_confidence', 0),
+            image_script_detection=self.config.get('image_script_detection', False),
+            fallback_lang=self.config.get('source_lang', 'en'),
+            tesseract_backend=self.config.get('tesseract_backend', 'pytesseract'),
+            preprocessor=ImagePreprocessor.from_config(self.config.get('preprocessing')),
+            psm=self.config.get('tesseract_psm', 6),
+            parallel_lines=self.config.get('parallel_lines', {}).get('enabled', False),
+            min_parallel_lines=self.config.get('parallel_lines', {}).get('min_lines', 4),
+            line_workers=self.config.get('parallel_lines', {}).get('workers', 0)
+        )
+        
+        worker_config = self.config.get('ocr_worker', {})
+        if worker_config.get('enabled', False) and engine in worker_config.get('engines', ['easyocr']):
+            print(f"🧱 OCR {engine} dans un processus dédié...")
+            return OCRWorkerProxy(
+                handler_kwargs,
+                timeout=worker_config.get('timeout', 60),
+                health_interval=worker_config.get('health_interval', 5)
+            )
+        
+        return OCRHandler(**handler_kwargs)
+    
+    def load_region_presets(self):
+        """
+        Charge les zones prédéfinies (region_presets) depuis la configuration
+        
+        Chaque preset a la forme {"name": ..., "bbox": [x1, y1, x2, y2], "hotkey": ...}
+        
+        Returns:
+            list: Presets valides, avec bbox normalisée en tuple
+        """
+        presets = []
+        for preset in self.config.get('region_presets') or []:
+            if not isinstance(preset, dict):
+                print(f"⚠️ Preset ignoré: objet {{\"name\", \"bbox\", \"hotkey\"}} attendu, reçu {preset!r}")
+                continue
+            
+            name = preset.get('name', 'Zone')
+            bbox = preset.get('bbox')
+            hotkey = preset.get('hotkey')
+            
+            if not isinstance(hotkey, str) or not hotkey.strip() or not isinstance(bbox, (list, tuple)) or len(bbox) != 4:
+                print(f"⚠️ Preset '{name}' ignoré: 'bbox' [x1, y1, x2, y2] et 'hotkey' requis")
+                continue
+            
+            try:
+                x1, y1, x2, y2 = (int(v) for v in bbox)
+            except (TypeError, ValueError):
+                print(f"⚠️ Preset '{name}' ignoré: coordonnées non numériques {bbox}")
+                continue
+            if x2 - x1 <= 10 or y2 - y1 <= 10:
+                print(f"⚠️ Preset '{name}' ignoré: zone trop petite {bbox}")
+                continue
+            
+            presets.append({'name': name, 'bbox': (x1, y1, x2, y2), 'hotkey': hotkey})
+        
+        if presets:
+            print(f"📐 {len(presets)} zone(s) prédéfinie(s): {', '.join(p['name'] for p in presets)}")
+        
+        return presets
+    
     def test_setup(self):
         """
         Teste que tout est correctement configuré
@@ -137,14 +320,30 @@ class GameTranslator:
             if not self.vision_translator.test_connection():
                 print("\n⚠️ Modèle vision non disponible, fallback sur Tesseract")
                 self.translation_mode = 'tesseract'
-                self.ocr = self.ocr_tesseract
                 return self.translator.test_connection()
+            if not self.vision_loader.is_ready:
+                print("   ⏳ Modèle vision en cours de chargement, Tesseract en attendant")
         elif self.translation_mode == 'easyocr':
             print("🎯 Mode EASYOCR activé")
-            if self.ocr_easyocr is None or self.ocr_easyocr.engine != 'easyocr':
+            if self.easyocr_loader.state == EngineLoader.FAILED:
                 print("\n⚠️ EasyOCR non disponible, fallback sur Tesseract")
                 self.translation_mode = 'tesseract'
-                self.ocr = self.ocr_tesseract
+            elif not self.easyocr_loader.is_ready:
+                print("   ⏳ EasyOCR en cours de chargement, Tesseract en attendant")
+            if not self.translator.test_connection():
+                print("\n❌ Ollama n'est pas accessible!")
+                print("   Assurez-vous qu'Ollama est lancé: ollama serve")
+                return False
+        elif self.translation_mode == 'auto':
+            print("🪜 Mode AUTO activé (Tesseract → EasyOCR → vision si nécessaire)")
+            if not self.translator.test_connection():
+                print("\n❌ Ollama n'est pas accessible!")
+                print("   Assurez-vous qu'Ollama est lancé: ollama serve")
+                return False
+        elif self.translation_mode == 'race':
+            print("🏁 Mode RACE activé (Tesseract et EasyOCR en parallèle)")
+            if not self.easyocr_loader.is_ready:
+                print("   ⏳ EasyOCR en cours de chargement, Tesseract seul en attendant")
             if not self.translator.test_connection():
                 print("\n❌ Ollama n'est pas accessible!")
                 print("   Assurez-vous qu'Ollama est lancé: ollama serve")
@@ -159,35 +358,97 @@ class GameTranslator:
         print("-" * 50)
         return True
     
-    def process_translation(self):
+    @property
+    def is_processing(self):
+        """True tant qu'au moins une requête de traduction est en cours"""
+        return self.active_requests > 0
+    
+    def _is_superseded(self, request_id):
+        """True si une requête plus récente a été lancée depuis request_id"""
+        return request_id != self.latest_request
+    
+    def process_translation(self, bbox=None, frame=None):
         """
         Workflow complet: capture → OCR → traduction → affichage
+        
+        Args:
+            bbox: Zone (x1, y1, x2, y2) à capturer directement, sans sélection
+                  (zones prédéfinies). None pour la sélection à la souris.
+            frame: CapturedFrame déjà capturée (historique) à utiliser au lieu
+                   d'une nouvelle capture. Avec bbox, la zone y est découpée.
         """
-        if self.is_processing:
-            print("⚠️ Traitement déjà en cours, veuillez patienter...")
-            return
+        # Une nouvelle requête remplace la précédente (dont la génération est annulée),
+        # seule une sélection de zone déjà ouverte est bloquante
+        with self._request_lock:
+            if self.is_capturing:
+                print("⚠️ Sélection déjà en cours, veuillez patienter...")
+                return
+            self.is_capturing = True
+            self.active_requests += 1
+            self.latest_request += 1
+            request_id = self.latest_request
         
-        self.is_processing = True
+        live_overlay = None
         
         try:
             print("\n" + "=" * 50)
             print("🚀 NOUVEAU PROCESSUS DE TRADUCTION")
             print("=" * 50)
             
-            # Étape 1: Capture de la zone sélectionnée
-            image, bbox = capture_with_selection()
+            # Étape 1: Capture de la zone (historique, prédéfinie ou sélectionnée)
+            try:
+                if frame is not None:
+                    print(f"⏪ Image de l'historique (il y a {time.time() - frame.timestamp:.1f}s)")
+                    if bbox is not None:
+                        image = frame.crop(bbox).to_pil()
+                    else:
+                        image, bbox = select_from_frame(frame)
+                elif bbox is not None:
+                    print(f"📐 Zone prédéfinie: {bbox}")
+                    image = capture_screen_area(bbox, self.capture_engine)
+                else:
+                    image, bbox = capture_with_selection(
+                        self.capture_engine,
+                        freeze=self.config.get('freeze_frame', False)
+                    )
+            finally:
+                self.is_capturing = False
             
             if image is None:
                 print("⚠️ Aucune capture effectuée")
-                self.is_processing = False
                 return
             
             # Variables pour le texte original et traduit
             text = None
             translated = None
+            overlay_shown = False
+            
+            # ====== MODE AUTO (cascade Tesseract → EasyOCR → vision) ======
+            detected_lang = None
+            use_vision = self.translation_mode == 'vision'
+            if self.translation_mode == 'auto':
+                print("\n🪜 Mode AUTO: moteur le plus rapide d'abord...")
+                result, use_vision = self.ocr_cascade.run(image)
+                if result is not None:
+                    text, detected_lang = result.text.strip(), result.detected_lang
+                if use_vision:
+                    # Chargé à la première frame qui en a besoin
+                    self.vision_loader.start()
+            elif self.translation_mode == 'race':
+                print("\n🏁 Mode RACE: Tesseract et EasyOCR en parallèle...")
+                result = self.ocr_race.run(image)
+                text, detected_lang = result.text.strip(), result.detected_lang
+            
+            if self._is_superseded(request_id):
+                print("⏭️ Requête remplacée par une plus récente, abandon")
+                return
             
             # ====== MODE VISION ======
-            if self.translation_mode == 'vision':
+            if use_vision and self.vision_loader.state == EngineLoader.FAILED:
+                print("\n⚠️ Modèle vision indisponible, traduction via OCR")
+            elif use_vision and not self.vision_loader.is_ready:
+                print("\n⏳ Modèle vision pas encore prêt, traduction via OCR")
+            elif use_vision:
                 print("\n🤖 Mode VISION: Extraction et traduction directe...")
                 
                 try:
@@ -206,75 +467,114 @@ class GameTranslator:
                     
                     translated = self.vision_translator.translate_image(
                         image, 
-                        target_lang=target_lang_full
+                        target_lang=target_lang_full,
+                        channel='translate'
                     )
                     
                     # Vérifier si la traduction a échoué
                     if translated.startswith('[ERREUR:') or not translated.strip():
-                        print("⚠️ Échec du mode vision, fallback sur Tesseract...")
-                        self.translation_mode = 'tesseract'  # Temporary fallback
+                        print("⚠️ Échec du mode vision, fallback sur OCR...")
+                        translated = None
                     else:
-                        text = "[Texte extrait par vision]"  # Placeholder
+                        text = text or "[Texte extrait par vision]"  # Placeholder
                         print(f"✅ Vision OK: {len(translated)} caractères")
                 
+                except CancelledError:
+                    raise
                 except Exception as e:
-                    print(f"⚠️ Erreur vision: {e}, fallback sur Tesseract...")
-                    self.translation_mode = 'tesseract'  # Temporary fallback
+                    print(f"⚠️ Erreur vision: {e}, fallback sur OCR...")
+                    translated = None
             
             # ====== MODE OCR (Tesseract ou EasyOCR) ======
-            if self.translation_mode in ['tesseract', 'easyocr'] or translated is None:
-                mode_name = "Tesseract" if self.translation_mode == 'tesseract' else "EasyOCR"
-                print(f"\n🔍 Mode {mode_name}: Extraction puis traduction...")
-                
-                # Étape 2: OCR avec détection de langue
-                text, detected_lang = self.ocr.extract_text(image)
+            if translated is None:
+                # En mode auto / race, le texte est déjà disponible
+                if self.translation_mode not in ('auto', 'race'):
+                    if self.translation_mode == 'easyocr' and self.easyocr_loader.state == EngineLoader.FAILED:
+                        print("\n⚠️ EasyOCR indisponible, Tesseract à la place")
+                    elif self.translation_mode == 'easyocr' and not self.easyocr_loader.is_ready:
+                        print("\n⏳ EasyOCR pas encore prêt, Tesseract en attendant")
+                    mode_name = "EasyOCR" if self.ocr.engine == 'easyocr' else "Tesseract"
+                    print(f"\n🔍 Mode {mode_name}: Extraction puis traduction...")
+                    
+                    # Étape 2: OCR avec détection de langue
+                    text, detected_lang = self.ocr.extract_text(
+                        image, fallback_lang=self.last_langs.get('translate')
+                    )
+                    if detected_lang:
+                        self.last_langs['translate'] = detected_lang
                 
                 if not text or len(text.strip()) < 2:
                     print("❌ Aucun texte détecté dans la zone sélectionnée")
                     show_error_overlay("Aucun texte détecté dans la zone")
-                    self.is_processing = False
+                    return
+                
+                if self._is_superseded(request_id):
+                    print("⏭️ Requête remplacée par une plus récente, abandon")
                     return
                 
                 # Étape 3: Traduction avec langue source détectée
                 print("\n🌐 Traduction du texte...")
                 if detected_lang:
                     print(f"   📝 Langue source auto-détectée: {detected_lang}")
-                    translated = self.translator.translate(text, source_lang=detected_lang)
+                
+                segments = self._list_segments(text)
+                if segments:
+                    # Inventaire, menu: tous les éléments en un seul appel au LLM
+                    translated = '\n'.join(
+                        self.translator.translate_batch(segments, source_lang=detected_lang, channel='translate')
+                    )
+                elif self.config.get('streaming', True):
+                    # Overlay ouvert dès la fin de l'OCR, rempli au fil des tokens
+                    print("\n📺 Affichage de l'overlay (streaming)...")
+                    overlay_x, overlay_y = self._overlay_position(bbox)
+                    live_overlay = show_live_overlay(
+                        overlay_x, overlay_y, text, "⏳ Traduction en cours...", 400, 250,
+                        auto_close=True, timeout=self.config.get('overlay_timeout', 60)
+                    )
+                    stream = StreamBuffer(live_overlay)
+                    translated = self.translator.translate_streaming(
+                        text, stream.append, source_lang=detected_lang, channel='translate'
+                    )
+                    stream.finish(translated)
+                    overlay_shown = True
+                elif detected_lang:
+                    translated = self.translator.translate(text, source_lang=detected_lang, channel='translate')
                 else:
-                    translated = self.translator.translate(text)
+                    translated = self.translator.translate(text, channel='translate')
             
-            # Restaurer le mode original si fallback temporaire
-            original_mode = self.config.get('translation_mode', 'tesseract')
-            if original_mode == 'vision' and self.translation_mode == 'tesseract':
-                self.translation_mode = 'vision'
+            # Résultat d'une requête remplacée entre-temps (traduction en cache): pas d'overlay
+            if self._is_superseded(request_id) and not overlay_shown:
+                print("⏭️ Requête remplacée par une plus récente, résultat ignoré")
+                return
             
             # Étape 5: Affichage de l'overlay
-            print("\n📺 Affichage de l'overlay...")
-            
-            # Calculer la position de l'overlay (à côté de la zone sélectionnée)
-            overlay_x = bbox[2] + 10  # À droite de la zone
-            overlay_y = bbox[1]
-            
-            # S'assurer que l'overlay reste dans l'écran
-            # (simplification, on peut améliorer avec pywin32 pour obtenir la résolution exacte)
-            if overlay_x > 1920 - 420:  # Supposons 1920 de largeur
-                overlay_x = bbox[0] - 410  # À gauche si pas de place à droite
-            
-            # Récupérer le timeout depuis la config
-            overlay_timeout = self.config.get('overlay_timeout', 60)
-            
-            # Lancer l'overlay dans un thread séparé
-            overlay_thread = threading.Thread(
-                target=show_overlay_threaded,
-                args=(overlay_x, overlay_y, text, translated, 400, 250, overlay_timeout),
-                daemon=True
-            )
-            overlay_thread.start()
+            if not overlay_shown:
+                print("\n📺 Affichage de l'overlay...")
+                
+                # Calculer la position de l'overlay (à côté de la zone sélectionnée)
+                overlay_x, overlay_y = self._overlay_position(bbox)
+                
+                # Récupérer le timeout depuis la config
+                overlay_timeout = self.config.get('overlay_timeout', 60)
+                
+                # Lancer l'overlay dans un thread séparé
+                overlay_thread = threading.Thread(
+                    target=show_overlay_threaded,
+                    args=(overlay_x, overlay_y, text, translated, 400, 250, overlay_timeout),
+                    daemon=True
+                )
+                overlay_thread.start()
             
             print("\n" + "=" * 50)
             print("✅ PROCESSUS TERMINÉ AVEC SUCCÈS")
             print("=" * 50)
             
+        except CancelledError:
+            # Génération annulée par une requête plus récente: son overlay la remplace
+            print("⏭️ Traduction annulée, requête plus récente en cours")
+            if live_overlay is not None:
+                live_overlay.post_close()
+        
         except Exception as e:
             print(f"\n❌ ERREUR CRITIQUE: {e}")
             import traceback
@@ -282,7 +582,51 @@ class GameTranslator:
             show_error_overlay(f"Erreur: {str(e)}")
         
         finally:
-            self.is_processing = False
+            with self._request_lock:
+                self.active_requests -= 1
+    
+    def _list_segments(self, text):
+        """
+        Éléments d'un texte OCR en forme de liste, traduits ensemble (batch_translation)
+        
+        Args:
+            text: Texte OCR
+            
+        Returns:
+            list: Éléments de la liste, ou None pour une traduction d'un seul bloc
+        """
+        batch_config = self.config.get('batch_translation', {})
+        if not batch_config.get('enabled', False):
+            return None
+        segments = split_list_segments(
+            text,
+            min_segments=batch_config.get('min_segments', 3),
+            max_words=batch_config.get('max_words', 6),
+            max_chars=batch_config.get('max_chars', 12)
+        )
+        if segments:
+            print(f"📋 Texte en liste ({len(segments)} éléments): traduction groupée")
+        return segments
+    
+    def _overlay_position(self, bbox):
+        """
+        Calcule la position de l'overlay à côté d'une zone
+        
+        Args:
+            bbox: Tuple (x1, y1, x2, y2) de la zone traduite
+            
+        Returns:
+            tuple: (x, y) de l'overlay
+        """
+        overlay_x = bbox[2] + 10  # À droite de la zone
+        overlay_y = bbox[1]
+        
+        # S'assurer que l'overlay reste dans l'écran
+        # (simplification, on peut améliorer avec pywin32 pour obtenir la résolution exacte)
+        if overlay_x > 1920 - 420:  # Supposons 1920 de largeur
+            overlay_x = bbox[0] - 410  # À gauche si pas de place à droite
+        
+        return overlay_x, overlay_y
     
     def on_hotkey_pressed(self):
         """Callback appelé quand la hotkey est pressée"""
@@ -292,8 +636,126 @@ class GameTranslator:
         thread = threading.Thread(target=self.process_translation, daemon=True)
         thread.start()
     
+    def on_preset_pressed(self, preset):
+        """Callback d'une hotkey de zone prédéfinie: capture directe, sans sélection"""
+        print(f"\n⌨️ Hotkey '{preset['hotkey']}' détectée! (zone '{preset['name']}')")
+        
+        thread = threading.Thread(target=self.process_translation, args=(preset['bbox'],), daemon=True)
+        thread.start()
+    
+    def on_rewind_pressed(self):
+        """Callback de la hotkey de traduction rétroactive (frame_history)"""
+        seconds_ago = self.history_config.get('rewind_seconds', 3)
+        print(f"\n⌨️ Rewind hotkey '{self.history_hotkey}' détectée! (il y a {seconds_ago}s)")
+        
+        frame = self.frame_history.frame_at(seconds_ago)
+        if frame is None:
+            print("⚠️ Historique encore vide")
+            return
+        
+        # Historique d'une zone fixe: la traduire entière, sinon sélectionner dessus
+        bbox = frame.bbox if self.history_config.get('bbox') else None
+        thread = threading.Thread(target=self.process_translation, args=(bbox, frame), daemon=True)
+        thread.start()
+    
+    def toggle_watch_mode(self):
+        """Démarre ou arrête la surveillance continue d'une zone"""
+        if self.watcher is not None and self.watcher.is_running:
+            self.watcher.stop()
+            self.watcher = None
+            self.watch_stabilizer.reset()
+            if self.watch_overlay is not None:
+                self.watch_overlay.post_close()
+                self.watch_overlay = None
+            print("\n👁️ SURVEILLANCE ARRÊTÉE")
+            return
+        
+        # Zone fixe dans la config, sinon sélection à la souris
+        bbox = self.watch_config.get('bbox')
+        if bbox:
+            bbox = tuple(int(v) for v in bbox)
+        else:
+            print("📸 Sélectionnez la zone à surveiller...")
+            bbox = ScreenshotSelector().select_area()
+            if bbox is None:
+                print("⚠️ Sélection annulée")
+                return
+        
+        self.watch_stabilizer.reset()
+        self.watcher = RegionWatcher(
+            self.capture_engine,
+            bbox,
+            self.on_watch_change,
+            interval=self.watch_config.get('interval', 0.5),
+            sample_step=self.watch_config.get('sample_step', 2),
+            pixel_tolerance=self.watch_config.get('pixel_tolerance', 24),
+            change_ratio=self.watch_config.get('change_ratio', 0.0005)
+        )
+        print("\n👁️ SURVEILLANCE ACTIVÉE")
+        self.watcher.start()
+    
+    def on_watch_change(self, frame):
+        """
+        Callback du watcher: OCR puis attente de stabilisation du texte
+        
+        Args:
+            frame: CapturedFrame de la zone surveillée (contenu changé)
+        """
+        text, detected_lang = self.ocr.extract_text(frame.to_pil(), fallback_lang=self.last_langs.get('watch'))
+        if detected_lang:
+            self.last_langs['watch'] = detected_lang
+        
+        if not text or len(text.strip()) < 2:
+            return
+        
+        # Dialogue affiché lettre par lettre: ne traduire qu'une fois le texte stable
+        self.watch_stabilizer.feed(text, (frame.bbox, detected_lang))
+    
+    def on_watch_stable(self, text, context, generation):
+        """
+        Callback du stabilisateur: traduction → mise à jour de l'overlay
+        
+        Args:
+            text: Texte OCR stabilisé
+            context: Tuple (bbox, detected_lang) de la capture
+            generation: Génération du stabilisateur pour détecter les résultats obsolètes
+        """
+        bbox, detected_lang = context
+        
+        # Un texte plus récent annule la traduction en cours du précédent
+        try:
+            segments = self._list_segments(text)
+            if segments:
+                translated = '\n'.join(
+                    self.translator.translate_batch(segments, source_lang=detected_lang, channel='watch')
+                )
+            elif detected_lang:
+                translated = self.translator.translate(text, source_lang=detected_lang, channel='watch')
+            else:
+                translated = self.translator.translate(text, channel='watch')
+        except CancelledError:
+            return
+        
+        # Un texte plus récent est apparu pendant la traduction: résultat obsolète
+        if not self.watch_stabilizer.is_current(generation):
+            print("⏭️ Traduction obsolète ignorée (le texte a changé entre-temps)")
+            return
+        
+        # Mettre à jour l'overlay en place (ou le rouvrir s'il a été fermé)
+        if self.watch_overlay is None or self.watch_overlay.closed.is_set():
+            overlay_x, overlay_y = self._overlay_position(bbox)
+            self.watch_overlay = show_live_overlay(overlay_x, overlay_y, text, translated, 400, 250)
+        else:
+            self.watch_overlay.post_update(translated, text)
+    
+    def on_watch_pressed(self):
+        """Callback pour la hotkey de surveillance"""
+        print(f"\n⌨️ Watch hotkey '{self.watch_hotkey}' détectée!")
+        thread = threading.Thread(target=self.toggle_watch_mode, daemon=True)
+        thread.start()
+    
     def toggle_translation_mode(self):
-        """Cycle entre les 3 modes: tesseract → easyocr → vision → tesseract"""
+        """Cycle entre les 5 modes: tesseract → easyocr → vision → auto → race → tesseract"""
         if self.is_processing:
             print("⚠️ Traitement en cours, impossible de changer de mode")
             return
@@ -303,23 +765,21 @@ class GameTranslator:
             # Tesseract → EasyOCR
             self.translation_mode = 'easyocr'
             
-            # Initialiser EasyOCR si pas déjà fait
-            if self.ocr_easyocr is None:
-                print("\n📦 Chargement d'EasyOCR...")
-                ocr_languages = self.config.get('ocr_languages', ['en'])
-                auto_detect = self.config.get('auto_detect_language', True)
-                self.ocr_easyocr = OCRHandler(engine='easyocr', languages=ocr_languages, auto_detect=auto_detect)
-            
-            # Vérifier si EasyOCR est vraiment disponible
-            # On vérifie que le reader EasyOCR a été chargé (pas juste un fallback Tesseract)
-            if self.ocr_easyocr and self.ocr_easyocr.reader is not None:
-                self.ocr = self.ocr_easyocr
+            # Charger EasyOCR en arrière-plan si pas déjà fait (ne bloque pas la hotkey)
+            # On vérifie que le reader EasyOCR a pu être chargé (pas juste un fallback Tesseract)
+            if self.easyocr_loader.start() != EngineLoader.FAILED:
                 print("\n" + "🔄" * 25)
                 print("🎯 PASSAGE EN MODE EASYOCR (PRÉCIS)")
                 print("   ✅ Meilleur pour polices exotiques")
                 print("   ✅ Excellent pour langues asiatiques (ja/zh/ko)")
                 print("   ⚠️ Plus lent que Tesseract (5-10s)")
+                if not self.easyocr_loader.is_ready:
+                    print("   ⏳ Chargement en arrière-plan, Tesseract en attendant")
                 print("🔄" * 25)
+                
+                # Prédiction: le prochain toggle mène au mode vision
+                if self.config.get('predictive_preload', True):
+                    self.vision_loader.start()
             else:
                 # Fallback direct sur vision si EasyOCR indisponible
                 print("\n⚠️ EasyOCR non disponible, passage direct en mode Vision")
@@ -331,10 +791,34 @@ class GameTranslator:
             self.translation_mode = 'vision'
             self._activate_vision_mode()
         
-        else:  # vision
-            # Vision → Tesseract
+        elif self.translation_mode == 'vision':
+            # Vision → Auto
+            self.translation_mode = 'auto'
+            self.easyocr_loader.start()
+            print("\n" + "🔄" * 25)
+            print("🪜 PASSAGE EN MODE AUTO (CASCADE)")
+            print("   ✅ Vitesse de Tesseract sur les textes faciles")
+            print("   ✅ EasyOCR puis vision seulement si le texte est douteux")
+            print(f"   ℹ️ Seuils: confiance {self.ocr_cascade.min_confidence}, "
+                  f"plausibilité {self.ocr_cascade.min_plausibility}")
+            print("🔄" * 25)
+        
+        elif self.translation_mode == 'auto':
+            # Auto → Race
+            self.translation_mode = 'race'
+            self.easyocr_loader.start()
+            print("\n" + "🔄" * 25)
+            print("🏁 PASSAGE EN MODE RACE (LATENCE)")
+            print("   ✅ Tesseract et EasyOCR lancés en parallèle")
+            print("   ✅ Le premier résultat fiable l'emporte")
+            print("   ⚠️ Les deux moteurs tournent à chaque capture (CPU + GPU)")
+            if not self.easyocr_loader.is_ready:
+                print("   ⏳ EasyOCR en cours de chargement, Tesseract seul en attendant")
+            print("🔄" * 25)
+        
+        else:  # race
+            # Race → Tesseract
             self.translation_mode = 'tesseract'
-            self.ocr = self.ocr_tesseract
             print("\n" + "🔄" * 25)
             print("⚡ PASSAGE EN MODE TESSERACT (RAPIDE)")
             print("   ✅ Le plus rapide (2-5s)")
@@ -344,13 +828,8 @@ class GameTranslator:
     
     def _activate_vision_mode(self):
         """Active le mode vision"""
-        # Initialiser le vision_translator si pas déjà fait
-        if self.vision_translator is None:
-            print("\n📦 Chargement du modèle vision...")
-            self.vision_translator = VisionTranslator(
-                model_name=self.config.get('vision_model', 'gemma3:4b'),
-                ollama_url=self.config.get('ollama_url', 'http://localhost:11434')
-            )
+        # Précharger le modèle vision si pas déjà fait (ne bloque pas la hotkey)
+        state = self.vision_loader.start()
         
         print("\n" + "🔄" * 25)
         print("🤖 PASSAGE EN MODE VISION (ULTRA PRÉCIS)")
@@ -358,6 +837,10 @@ class GameTranslator:
         print("   ✅ Comprend contexte visuel")
         print("   ⚠️ TRÈS lent (10-30s)")
         print("   ⚠️ GPU intensif (pas pour gaming)")
+        if state == EngineLoader.FAILED:
+            print(f"   ⚠️ Modèle vision indisponible ({self.vision_loader.error}), Tesseract à la place")
+        elif not self.vision_loader.is_ready:
+            print("   ⏳ Chargement en arrière-plan, Tesseract en attendant")
         print("🔄" * 25)
     
     def on_toggle_pressed(self):
@@ -378,6 +861,11 @@ class GameTranslator:
         print("=" * 50)
         print(f"📌 {self.hotkey}: Commencer une traduction")
         print(f"🔄 {self.toggle_hotkey}: Cycle modes (tesseract → easyocr → vision)")
+        for preset in self.region_presets:
+            print(f"📐 {preset['hotkey']}: Traduire la zone '{preset['name']}'")
+        print(f"👁️ {self.watch_hotkey}: Surveillance continue d'une zone (on/off)")
+        if self.frame_history is not None:
+            print(f"⏪ {self.history_hotkey}: Traduire l'écran d'il y a {self.history_config.get('rewind_seconds', 3)}s")
         print(f"📌 Ctrl+C: Quitter")
         print(f"   Mode actuel: {self.translation_mode.upper()}")
         print("=" * 50)
@@ -385,6 +873,15 @@ class GameTranslator:
         # Enregistrer les hotkeys
         keyboard.add_hotkey(self.hotkey, self.on_hotkey_pressed)
         keyboard.add_hotkey(self.toggle_hotkey, self.on_toggle_pressed)
+        for preset in self.region_presets:
+            try:
+                keyboard.add_hotkey(preset['hotkey'], self.on_preset_pressed, args=(preset,))
+            except ValueError as e:
+                print(f"⚠️ Preset '{preset['name']}' ignoré: hotkey '{preset['hotkey']}' invalide ({e})")
+        keyboard.add_hotkey(self.watch_hotkey, self.on_watch_pressed)
+        if self.frame_history is not None:
+            self.frame_history.start()
+            keyboard.add_hotkey(self.history_hotkey, self.on_rewind_pressed)
         
         try:
             # Boucle principale (bloquante)
@@ -392,6 +889,19 @@ class GameTranslator:
         except KeyboardInterrupt:
             print("\n\n👋 Arrêt de Game Translator...")
             print("=" * 50)
+            if self.watcher is not None:
+                self.watcher.stop()
+            if self.frame_history is not None:
+                self.frame_history.stop()
+            self.capture_engine.close()
+            self.ocr_race.close()
+            self.ocr_tesseract.close()
+            if self.ocr_easyocr is not None:
+                self.ocr_easyocr.close()
+            self.translator.close()
+            self.vision_translator.close()
+            self.async_ollama.close()
+            self.ollama_client.close()
             sys.exit(0)
 
 
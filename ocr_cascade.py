@@ -0,0 +1,92 @@
+"""
+Mode 'auto': cascade de moteurs OCR du plus rapide au plus précis
+Tesseract d'abord, EasyOCR puis le modèle vision seulement si le résultat est douteux
+"""
+from language_detector import LanguageDetector
+from ocr_result import text_plausibility
+
+
+class OCRCascade:
+    """Choisit le moteur OCR frame par frame selon la confiance et la plausibilité du texte"""
+
+    def __init__(self, tesseract, get_easyocr, min_confidence=70, min_plausibility=0.75, use_vision=True):
+        """
+        Initialise la cascade
+
+        Args:
+            tesseract: OCRHandler Tesseract (toujours disponible)
+            get_easyocr: Fonction sans argument retournant l'OCRHandler EasyOCR, ou None s'il n'est pas prêt
+            min_confidence: Confiance OCR moyenne (0-100) en dessous de laquelle on escalade
+            min_plausibility: Score text_plausibility (0-1) en dessous duquel on escalade
+            use_vision: Autoriser l'escalade finale vers le modèle vision
+        """
+        self.tesseract = tesseract
+        self.get_easyocr = get_easyocr
+        self.min_confidence = min_confidence
+        self.min_plausibility = min_plausibility
+        self.use_vision = use_vision
+        self.language_detector = LanguageDetector()
+
+        # Moteur de départ, recalé sur la recommandation de get_ocr_config
+        # pour le texte de la frame précédente (ex: dialogue japonais → EasyOCR)
+        self.seed_mode = 'tesseract'
+
+        # Statistiques: moteur retenu par frame
+        self.stats = {'tesseract': 0, 'easyocr': 0, 'vision': 0}
+
+    def is_acceptable(self, result):
+        """True si le résultat est assez fiable pour être traduit tel quel"""
+        return (bool(result) and result.confidence >= self.min_confidence
+                and text_plausibility(result.text) >= self.min_plausibility)
+
+    def run(self, image):
+        """
+        Exécute la cascade OCR sur une capture
+
+        Args:
+            image: PIL.Image
+
+        Returns:
+            tuple: (OCRResult ou None, use_vision) où use_vision indique qu'aucun
+                   moteur OCR n'a donné de résultat acceptable
+        """
+        easyocr = self.get_easyocr()
+        if self.seed_mode == 'easyocr' and easyocr is not None:
+            stages = [('easyocr', easyocr)]
+        else:
+            stages = [('tesseract', self.tesseract), ('easyocr', easyocr)]
+
+        best = None
+        for name, handler in stages:
+            if handler is None:
+                print(f"⏭️ Auto: {name} pas encore prêt, étape ignorée")
+                continue
+
+            result = handler.extract_text(image, structured=True)
+            plausibility = text_plausibility(result.text)
+            print(f"🪜 Auto: {name} confiance {result.confidence:.0f}/{self.min_confidence}, "
+                  f"plausibilité {plausibility:.2f}/{self.min_plausibility}")
+
+            if best is None or result.confidence > best.confidence:
+                best = result
+
+            if self.is_acceptable(result):
+                self.stats[name] += 1
+                self._update_seed(result)
+                return result, False
+
+        if best is not None:
+            self._update_seed(best)
+
+        if self.use_vision:
+            self.stats['vision'] += 1
+            return best, True
+
+        self.stats[best.engine if best else 'tesseract'] += 1
+        return best, False
+
+    def _update_seed(self, result):
+        """Recale le moteur de départ de la prochaine frame sur le texte reconnu"""
+        text = result.text
+        if len(text.strip()) > 3:
+            self.seed_mode = self.language_detector.get_ocr_config(text)['recommended_mode']
@@ -4,14 +4,275 @@ Module pour l'extraction de texte via OCR
 import time
 import os
 import platform
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 from PIL import Image
 from language_detector import LanguageDetector
+from ocr_result import OCRResult
+from text_lines import otsu_threshold, segment_lines
+
+
+# Mapper les codes de langue pour Tesseract
+TESSERACT_LANG_MAP = {
+    'en': 'eng',
+    'fr': 'fra',
+    'ja': 'jpn',
+    'ko': 'kor',
+    'zh_sim': 'chi_sim',
+    'zh_tra': 'chi_tra',
+    'es': 'spa',
+    'de': 'deu',
+    'it': 'ita',
+    'pt': 'por',
+    'ru': 'rus',
+    'ar': 'ara',
+}
+
+
+class ImagePreprocessor:
+    """
+    Nettoie une capture avant l'OCR (opérations vectorisées NumPy)
+    
+    Étapes (chacune activable et chronométrée), dans l'ordre:
+    grayscale → invert_dark → trim_borders → upscale → binarize
+    """
+    
+    STEPS = ('grayscale', 'invert_dark', 'trim_borders', 'upscale', 'binarize')
+    
+    def __init__(self, grayscale=True, invert_dark=True, trim_borders=True, upscale=True,
+                 binarize=True, min_glyph_height=20, max_upscale=3.0, block_size=31,
+                 binarize_offset=10, border_padding=8):
+        """
+        Initialise le préprocesseur
+        
+        Args:
+            grayscale: Convertir en niveaux de gris (requis par les étapes suivantes)
+            invert_dark: Inverser les textes clairs sur fond sombre (Tesseract préfère noir sur blanc)
+            trim_borders: Rogner les marges sans texte
+            upscale: Agrandir si la hauteur de texte estimée est sous min_glyph_height
+            binarize: Binarisation adaptative (moyenne locale, méthode de Bradley)
+            min_glyph_height: Hauteur de ligne de texte minimale visée (pixels)
+            max_upscale: Facteur d'agrandissement maximal
+            block_size: Taille de la fenêtre de moyenne locale (pixels)
+            binarize_offset: Écart sous la moyenne locale pour qu'un pixel soit de l'encre
+            border_padding: Marge blanche gardée autour du texte après rognage
+        """
+        self.enabled = {
+            'grayscale': grayscale,
+            'invert_dark': grayscale and invert_dark,
+            'trim_borders': grayscale and trim_borders,
+            'upscale': upscale,
+            'binarize': grayscale and binarize,
+        }
+        self.min_glyph_height = min_glyph_height
+        self.max_upscale = max_upscale
+        self.block_size = block_size
+        self.binarize_offset = binarize_offset
+        self.border_padding = border_padding
+    
+    @classmethod
+    def from_config(cls, config):
+        """
+        Crée un préprocesseur depuis la section "preprocessing" de config.json
+        
+        Returns:
+            ImagePreprocessor ou None si désactivé
+        """
+        if not config or not config.get('enabled', False):
+            return None
+        options = {key: value for key, value in config.items() if key != 'enabled'}
+        return cls(**options)
+    
+    def process(self, image, details=False):
+        """
+        Applique les étapes activées (sans état partagé: utilisable depuis plusieurs threads)
+        
+        Args:
+            image: PIL.Image
+            details: Si True, retourne aussi les timings et la transformation appliquée
+            
+        Returns:
+            PIL.Image: Image nettoyée, ou tuple (image, details) si details, avec
+                       details = {'timings': {étape: ms}, 'offset': (dx, dy), 'scale': facteur}
+                       pour ramener les boîtes OCR dans le repère de l'image d'origine
+        """
+        info = {'timings': {}, 'offset': (0, 0), 'scale': 1.0}
+        
+        def timed(step, fn, value):
+            if not self.enabled[step]:
+                return value
+            started = time.perf_counter()
+            result = fn(value)
+            info['timings'][step] = (time.perf_counter() - started) * 1000
+            return result
+        
+        if self.enabled['grayscale']:
+            pixels = timed('grayscale', self._grayscale, np.asarray(image.convert('RGB')))
+            pixels = timed('invert_dark', self._invert_dark, pixels)
+            pixels = timed('trim_borders', lambda gray: self._trim_borders(gray, info), pixels)
+            pixels = timed('upscale', lambda gray: self._upscale(gray, info), pixels)
+            pixels = timed('binarize', self._binarize, pixels)
+            result = Image.fromarray(pixels, mode='L')
+        else:
+            result = timed('upscale', lambda pil_image: self._upscale(pil_image, info), image)
+        
+        return (result, info) if details else result
+    
+    @staticmethod
+    def _grayscale(rgb):
+        """Luminance ITU-R 601 en arithmétique entière"""
+        weighted = rgb[..., 0] * np.uint32(299) + rgb[..., 1] * np.uint32(587) + rgb[..., 2] * np.uint32(114)
+        return (weighted // 1000).astype(np.uint8)
+    
+    # Seuil global d'Otsu partagé avec la détection d'écriture (text_lines)
+    _otsu_threshold = staticmethod(otsu_threshold)
+    
+    @staticmethod
+    def _invert_dark(gray):
+        """Texte clair sur fond sombre → texte sombre sur fond clair"""
+        if np.median(gray) < 128:
+            return 255 - gray
+        return gray
+    
+    def _ink_mask(self, gray):
+        """Pixels d'encre (plus sombres que le seuil d'Otsu, fond supposé clair)"""
+        return gray < self._otsu_threshold(gray)
+    
+    def _trim_borders(self, gray, info=None):
+        """Rogne aux lignes/colonnes contenant de l'encre, avec une marge blanche (origine dans info)"""
+        ink = self._ink_mask(gray)
+        rows = np.flatnonzero(ink.any(axis=1))
+        cols = np.flatnonzero(ink.any(axis=0))
+        if rows.size == 0 or cols.size == 0:
+            return gray
+        
+        cropped = gray[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1]
+        if info is not None:
+            info['offset'] = (int(cols[0]) - self.border_padding, int(rows[0]) - self.border_padding)
+        background = int(np.median(gray))
+        return np.pad(cropped, self.border_padding, mode='constant', constant_values=background)
+    
+    def estimate_glyph_height(self, gray):
+        """
+        Estime la hauteur des lignes de texte via le profil de projection horizontal
+        
+        Returns:
+            float: Hauteur médiane des bandes de lignes contenant de l'encre (0 si aucune)
+        """
+        ink_rows = self._ink_mask(gray).any(axis=1).astype(np.int8)
+        edges = np.diff(np.concatenate(([0], ink_rows, [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        if starts.size == 0:
+            return 0.0
+        return float(np.median(ends - starts))
+    
+    def _upscale(self, pixels, info=None):
+        """Agrandit seulement si le texte est plus petit que min_glyph_height (facteur dans info)"""
+        if isinstance(pixels, Image.Image):
+            gray = np.asarray(pixels.convert('L'))
+        else:
+            gray = pixels
+        
+        glyph_height = self.estimate_glyph_height(gray)
+        if glyph_height <= 0 or glyph_height >= self.min_glyph_height:
+            return pixels
+        
+        factor = min(self.max_upscale, self.min_glyph_height / glyph_height)
+        if info is not None:
+            info['scale'] = factor
+        if isinstance(pixels, Image.Image):
+            size = (round(pixels.width * factor), round(pixels.height * factor))
+            return pixels.resize(size, Image.LANCZOS)
+        
+        size = (round(gray.shape[1] * factor), round(gray.shape[0] * factor))
+        return np.asarray(Image.fromarray(gray, mode='L').resize(size, Image.LANCZOS))
+    
+    def _binarize(self, gray):
+        """Binarisation adaptative: encre si plus sombre que la moyenne locale - offset"""
+        height, width = gray.shape
+        radius = self.block_size // 2
+        
+        # Image intégrale: somme de n'importe quelle fenêtre en O(1)
+        integral = np.zeros((height + 1, width + 1), dtype=np.int64)
+        integral[1:, 1:] = gray.cumsum(axis=0, dtype=np.int64).cumsum(axis=1)
+        
+        y1 = np.clip(np.arange(height) - radius, 0, height)
+        y2 = np.clip(np.arange(height) + radius + 1, 0, height)
+        x1 = np.clip(np.arange(width) - radius, 0, width)
+        x2 = np.clip(np.arange(width) + radius + 1, 0, width)
+        
+        window_sum = (integral[y2][:, x2] - integral[y1][:, x2]
+                      - integral[y2][:, x1] + integral[y1][:, x1])
+        area = (y2 - y1)[:, None] * (x2 - x1)[None, :]
+        local_mean = window_sum / area
+        
+        return np.where(gray < local_mean - self.binarize_offset, 0, 255).astype(np.uint8)
+
+
+def tesseract_lang_string(languages):
+    """
+    Construit la chaîne de langues Tesseract (ex: ['ja', 'en'] -> 'jpn+eng')
+    
+    Args:
+        languages: Liste de codes de langue
+        
+    Returns:
+        str: Langues Tesseract séparées par '+', sans doublon
+    """
+    tesseract_langs = [TESSERACT_LANG_MAP.get(lang, 'eng') for lang in languages]
+    return '+'.join(dict.fromkeys(tesseract_langs))
+
+
+_line_worker_engine = None
+
+
+def _init_line_worker(tesseract_cmd, tesseract_backend):
+    """Initialise un processus du pool OCR par ligne (chemin Tesseract, backend chaud)"""
+    global _line_worker_engine
+    
+    import pytesseract
+    if tesseract_cmd:
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    
+    if tesseract_backend == 'tesserocr':
+        try:
+            from tesseract_engine import TesserocrEngine
+            _line_worker_engine = TesserocrEngine(tessdata_path=TesserocrEngine.tessdata_from_cmd(tesseract_cmd))
+        except Exception:
+            _line_worker_engine = None
+
+
+def _ocr_line(image, lang_string):
+    """
+    OCR d'une seule ligne (--psm 7), exécuté dans un processus du pool
+    
+    Returns:
+        OCRResult: Boîtes dans le repère de la ligne découpée
+    """
+    if _line_worker_engine is not None:
+        data = _line_worker_engine.image_to_data(image, lang_string, psm=7)
+    else:
+        import pytesseract
+        data = pytesseract.image_to_data(
+            image, config=f'--oem 3 --psm 7 -l {lang_string}', output_type=pytesseract.Output.DICT
+        )
+    return OCRResult.from_tesseract_data(data)
 
 
 class OCRHandler:
-    """Gère l'extraction de texte depuis des images"""
+    """
+    Gère l'extraction de texte depuis des images
+    
+    Réentrant: aucune donnée propre à une requête n'est gardée sur l'instance,
+    un même handler peut servir plusieurs extractions simultanées (threads).
+    """
     
-    def __init__(self, engine='tesseract', languages=['en'], auto_detect=True):
+    def __init__(self, engine='tesseract', languages=['en'], auto_detect=True, confidence_threshold=60,
+                 tesseract_backend='pytesseract', preprocessor=None, psm=6,
+                 parallel_lines=False, min_parallel_lines=4, line_workers=0, min_confidence=0,
+                 image_script_detection=False, fallback_lang='en'):
         """
         Initialise le handler OCR
         
@@ -19,13 +280,40 @@ class OCRHandler:
             engine: 'tesseract' ou 'easyocr'
             languages: Liste des langues pour EasyOCR (ex: ['en', 'ja', 'zh_sim'])
             auto_detect: Si True, détecte automatiquement les langues dans le texte
+            confidence_threshold: Confiance Tesseract moyenne (0-100) en dessous de laquelle
+                                  l'auto-détection relance une passe avec les langues détectées
+            tesseract_backend: 'pytesseract' (processus par appel) ou 'tesserocr' (in-process,
+                               modèles gardés en mémoire), fallback sur pytesseract
+            preprocessor: ImagePreprocessor appliqué avant l'OCR (optionnel)
+            psm: Mode de segmentation Tesseract (6 = bloc de texte uniforme)
+            parallel_lines: Découper les grandes zones en lignes, OCR en parallèle (pool de processus)
+            min_parallel_lines: Nombre de lignes à partir duquel le découpage est utilisé
+            line_workers: Nombre de processus du pool (0 = nombre de cœurs)
+            min_confidence: Confiance (0-100) sous laquelle un mot est retiré du texte
+                            (bruit envoyé sinon au LLM), 0 = tout garder
+            image_script_detection: Avec auto_detect, choisir les langues Tesseract d'après
+                                    l'écriture visible dans l'image, avant l'unique passe OCR
+            fallback_lang: Langue source configurée, retenue pour un texte latin trop court
+                           pour être identifié (libellés de menu) si extract_text n'en reçoit pas
         """
         self.engine = engine
         self.reader = None
+        self.tesserocr = None
+        self.preprocessor = preprocessor
+        self.psm = psm
+        self.tesseract_backend = tesseract_backend
+        self.parallel_lines = parallel_lines
+        self.min_parallel_lines = min_parallel_lines
+        self.line_workers = line_workers or os.cpu_count() or 1
+        self._line_pool = None
+        self._line_pool_lock = threading.Lock()
+        self._easyocr_lock = threading.Lock()
         self.languages = languages
         self.auto_detect = auto_detect
-        self.language_detector = LanguageDetector() if auto_detect else None
-        self.last_detected_languages = None
+        self.confidence_threshold = confidence_threshold
+        self.min_confidence = min_confidence
+        self.image_script_detection = image_script_detection
+        self.language_detector = LanguageDetector(fallback_lang) if auto_detect else None
         
         if engine == 'easyocr':
             try:
@@ -72,6 +360,29 @@ class OCRHandler:
             except ImportError:
                 print("❌ Tesseract non installé!")
                 raise
+            
+            if tesseract_backend == 'tesserocr':
+                self._init_tesserocr(pytesseract.pytesseract.tesseract_cmd)
+    
+    def _init_tesserocr(self, tesseract_cmd):
+        """
+        Initialise le backend Tesseract in-process et précharge les langues configurées
+        
+        Args:
+            tesseract_cmd: Chemin de l'exécutable tesseract (pour trouver tessdata)
+        """
+        try:
+            from tesseract_engine import TesserocrEngine
+            
+            engine = TesserocrEngine(tessdata_path=TesserocrEngine.tessdata_from_cmd(tesseract_cmd))
+            engine.warm_up(tesseract_lang_string(self.languages))
+            self.tesserocr = engine
+            print("✅ Tesseract in-process (tesserocr) prêt")
+        except ImportError:
+            print("⚠️ tesserocr n'est pas installé, fallback sur pytesseract")
+        except Exception as e:
+            print(f"⚠️ Erreur lors de l'initialisation de tesserocr: {e}")
+            print("   Fallback sur pytesseract")
     
     def _fix_easyocr_language_compatibility(self, languages):
         """
@@ -105,94 +416,100 @@ class OCRHandler:
         
         return fixed
     
-    def extract_text(self, image):
+    def extract_text(self, image, structured=False, languages=None, fallback_lang=None):
         """
         Extrait le texte d'une image avec auto-détection optionnelle des langues
         
+        Avec Tesseract, une seule passe est faite avec les langues configurées.
+        Une 2e passe avec les langues détectées n'a lieu que si la confiance
+        de la première est faible (confidence_threshold).
+        
         Args:
             image: PIL.Image
+            structured: Si True, retourne un OCRResult (mots, boîtes, confiances, temps)
+            languages: Langues de cette extraction (défaut: langues configurées).
+                       Ignoré par EasyOCR, dont le reader est chargé pour des langues fixes.
+            fallback_lang: Langue d'un texte latin trop court pour être identifié, ex: celle
+                           de la capture précédente du même appelant (défaut: fallback_lang du handler)
             
         Returns:
-            tuple: (text, detected_lang) où detected_lang est le code de langue principale détectée
+            tuple: (text, detected_lang) où detected_lang est le code de langue principale détectée,
+                   ou OCRResult si structured (boîtes dans le repère de l'image reçue)
         """
         if not image:
-            return "", None
+            return OCRResult(engine=self.engine) if structured else ("", None)
         
         start_time = time.time()
+        timings = {}
         detected_lang = None
+        requested = languages
+        languages = languages or self.languages
         
         try:
-            # Si auto-détection activée avec Tesseract, faire une passe rapide
-            if self.auto_detect and self.engine == 'tesseract':
-                # Extraction rapide pour détecter la langue
-                import pytesseract
-                quick_text = pytesseract.image_to_string(image, config='--psm 6')
+            if self.preprocessor is not None:
+                step_start = time.perf_counter()
+                image, transform = self.preprocessor.process(image, details=True)
+                timings['preprocess'] = (time.perf_counter() - step_start) * 1000
+                steps = ', '.join(f"{step} {ms:.1f}ms" for step, ms in transform['timings'].items())
+                print(f"🧹 Prétraitement: {steps}")
+            
+            # Langues choisies d'après l'écriture visible (quelques ms, sans pré-passe OCR)
+            if requested is None and self.auto_detect and self.image_script_detection and self.engine != 'easyocr':
+                step_start = time.perf_counter()
+                languages = self.language_detector.languages_from_image(image, self.languages)
+                timings['script_detection'] = (time.perf_counter() - step_start) * 1000
+            
+            step_start = time.perf_counter()
+            if self.engine == 'easyocr':
+                result = self._extract_with_easyocr(image)
+            else:
+                result = self._extract_with_tesseract(image, languages)
+                text = result.text
                 
-                if quick_text and len(quick_text.strip()) > 3:
-                    # Détecter les langues
-                    detected_langs = self.language_detector.detect_language(quick_text)
+                # Auto-détection: réutiliser la passe unique si elle est assez fiable
+                if self.auto_detect and text and len(text.strip()) > 3:
+                    detected_langs = self.language_detector.detect_language(text, fallback_lang)
                     detected_lang = detected_langs[0] if detected_langs else None
                     
-                    # Si différent de la config, ré-extraire avec langues détectées
-                    if detected_langs and set(detected_langs) != set(self.languages):
-                        print(f"🔍 Auto-détection: {', '.join(detected_langs)} (config: {', '.join(self.languages)})")
-                        self.last_detected_languages = detected_langs
-                        
-                        # Sauvegarder config originale et extraire avec langues détectées
-                        original_langs = self.languages
-                        self.languages = detected_langs
-                        text = self._extract_with_tesseract(image)
-                        self.languages = original_langs
-                        
-                        elapsed = time.time() - start_time
-                        print(f"⏱️ OCR terminé en {elapsed:.2f}s")
-                        text = text.strip()
-                        
-                        if text:
-                            print(f"✅ Texte détecté ({len(text)} caractères):")
-                            print(f"   '{text[:100]}{'...' if len(text) > 100 else ''}'")
-                            print(f"   📝 Langue principale: {detected_lang}")
-                        else:
-                            print("⚠️ Aucun texte détecté")
-                        
-                        return text, detected_lang
-                        
-                        # Sauvegarder config originale
-                        original_langs = self.languages
-                        self.languages = detected_langs
-                        text = self._extract_with_tesseract(image)
-                        self.languages = original_langs
-                        
-                        elapsed = time.time() - start_time
-                        print(f"⏱️ OCR terminé en {elapsed:.2f}s")
-                        text = text.strip()
+                    if (detected_langs and set(detected_langs) != set(languages)
+                            and result.confidence < self.confidence_threshold):
+                        print(f"🔍 Auto-détection: {', '.join(detected_langs)} (demandé: {', '.join(languages)}), "
+                              f"confiance {result.confidence:.0f} < {self.confidence_threshold}: 2e passe")
                         
-                        if text:
-                            print(f"✅ Texte détecté ({len(text)} caractères):")
-                            print(f"   '{text[:100]}{'...' if len(text) > 100 else ''}'")
-                            print(f"   📝 Langue principale: {detected_lang}")
+                        try:
+                            retry = self._extract_with_tesseract(image, detected_langs)
+                        except Exception as e:
+                            # Ex: fra.traineddata absent alors que le texte est français
+                            print(f"⚠️ 2e passe impossible ({e}), 1re passe conservée")
                         else:
-                            print("⚠️ Aucun texte détecté")
-                        
-                        return text, detected_lang
+                            if retry.confidence >= result.confidence:
+                                result = retry
+            timings['ocr'] = (time.perf_counter() - step_start) * 1000
             
-            # Extraction normale
-            if self.engine == 'easyocr':
-                text = self._extract_with_easyocr(image)
-            else:
-                text = self._extract_with_tesseract(image)
+            # Boîtes dans le repère de l'image d'origine (avant rognage / agrandissement)
+            if self.preprocessor is not None:
+                dx, dy = transform['offset']
+                result = result.translated(dx, dy, transform['scale'])
+            
+            # Retirer le bruit peu fiable avant qu'il n'atteigne le LLM
+            if self.min_confidence > 0:
+                kept = result.filtered(self.min_confidence)
+                dropped = len(result.words) - len(kept.words)
+                if dropped:
+                    print(f"🧽 {dropped} mot(s) sous la confiance {self.min_confidence} ignoré(s)")
+                result = kept
+            
+            # Nettoyer le texte
+            text = result.text.strip()
             
             # Si auto-détection et pas encore fait, détecter maintenant
-            if self.auto_detect and detected_lang is None and text and len(text.strip()) > 3:
-                detected_langs = self.language_detector.detect_language(text)
+            if self.auto_detect and detected_lang is None and text and len(text) > 3:
+                detected_langs = self.language_detector.detect_language(text, fallback_lang)
                 detected_lang = detected_langs[0] if detected_langs else None
             
             elapsed = time.time() - start_time
             print(f"⏱️ OCR terminé en {elapsed:.2f}s")
             
-            # Nettoyer le texte
-            text = text.strip()
-            
             if text:
                 print(f"✅ Texte détecté ({len(text)} caractères):")
                 print(f"   '{text[:100]}{'...' if len(text) > 100 else ''}'")
@@ -201,58 +518,109 @@ class OCRHandler:
             else:
                 print("⚠️ Aucun texte détecté")
             
+            if structured:
+                result.detected_lang = detected_lang
+                result.elapsed = elapsed
+                result.timings = timings
+                return result
             return text, detected_lang
             
         except Exception as e:
             print(f"❌ Erreur OCR: {e}")
-            return "", None
+            return OCRResult(engine=self.engine) if structured else ("", None)
     
-    def _extract_with_tesseract(self, image):
-        """Extraction avec Tesseract"""
-        import pytesseract
+    def _extract_with_tesseract(self, image, languages):
+        """
+        Extraction avec Tesseract (un seul appel, texte + confiance)
         
-        # Mapper les codes de langue pour Tesseract
-        lang_map = {
-            'en': 'eng',
-            'fr': 'fra',
-            'ja': 'jpn',
-            'ko': 'kor',
-            'zh_sim': 'chi_sim',
-            'zh_tra': 'chi_tra',
-            'es': 'spa',
-            'de': 'deu',
-            'it': 'ita',
-            'pt': 'por',
-            'ru': 'rus',
-            'ar': 'ara',
-        }
+        Args:
+            image: PIL.Image
+            languages: Liste des langues à utiliser pour cette passe
+            
+        Returns:
+            OCRResult: Mots avec boîtes et confiances (0-100)
+        """
+        lang_string = tesseract_lang_string(languages)
+        
+        # Grande zone (journal de quête...): OCR ligne par ligne en parallèle
+        if self.parallel_lines:
+            lines = segment_lines(np.asarray(image.convert('L')))
+            if len(lines) >= self.min_parallel_lines:
+                result = self._extract_lines_parallel(image, lines, lang_string)
+                result.languages = languages
+                return result
+        
+        if self.tesserocr is not None:
+            # In-process: TessBaseAPI déjà initialisée, image passée en mémoire
+            data = self.tesserocr.image_to_data(image, lang_string, psm=self.psm if self.psm != 6 else None)
+        else:
+            import pytesseract
+            
+            # Configuration pour améliorer la détection
+            custom_config = f'--oem 3 --psm {self.psm} -l {lang_string}'
+            
+            # image_to_data donne le texte ET la confiance en un seul appel
+            data = pytesseract.image_to_data(image, config=custom_config, output_type=pytesseract.Output.DICT)
+        
+        return OCRResult.from_tesseract_data(data, languages)
+    
+    def _extract_lines_parallel(self, image, lines, lang_string):
+        """
+        OCR de chaque ligne sur le pool de processus, réassemblé dans l'ordre de lecture
         
-        # Construire la liste des langues pour Tesseract
-        tesseract_langs = [lang_map.get(lang, 'eng') for lang in self.languages]
-        lang_string = '+'.join(tesseract_langs)
+        Args:
+            image: PIL.Image
+            lines: Bandes (y1, y2) renvoyées par segment_lines
+            lang_string: Langues Tesseract
+            
+        Returns:
+            OCRResult: Lignes assemblées, boîtes dans le repère de l'image entière
+        """
+        with self._line_pool_lock:
+            if self._line_pool is None:
+                import pytesseract
+                self._line_pool = ProcessPoolExecutor(
+                    max_workers=self.line_workers,
+                    initializer=_init_line_worker,
+                    initargs=(pytesseract.pytesseract.tesseract_cmd, self.tesseract_backend)
+                )
         
-        # Configuration pour améliorer la détection
-        custom_config = f'--oem 3 --psm 6 -l {lang_string}'
+        print(f"🧵 OCR parallèle: {len(lines)} lignes sur {self.line_workers} processus")
+        crops = [image.crop((0, y1, image.width, y2)) for y1, y2 in lines]
+        results = self._line_pool.map(_ocr_line, crops, [lang_string] * len(crops))
         
-        text = pytesseract.image_to_string(image, config=custom_config)
-        return text
+        words = []
+        for (y1, _), line_result in zip(lines, results):
+            line_offset = words[-1].line + 1 if words else 0
+            words.extend(line_result.translated(dy=y1, line_offset=line_offset).words)
+        return OCRResult(words, engine='tesseract')
+    
+    def close(self):
+        """Libère le pool de processus et les instances Tesseract in-process"""
+        if self._line_pool is not None:
+            self._line_pool.shutdown(wait=False, cancel_futures=True)
+            self._line_pool = None
+        if self.tesserocr is not None:
+            self.tesserocr.close()
     
     def _extract_with_easyocr(self, image):
-        """Extraction avec EasyOCR"""
+        """
+        Extraction avec EasyOCR
+        
+        Returns:
+            OCRResult: Un fragment par ligne détectée, avec sa boîte et sa confiance (0-100)
+        """
         if self.reader is None:
             print("⚠️ EasyOCR reader non initialisé")
-            return ""
-        
-        import numpy as np
+            return OCRResult(engine='easyocr')
         
         # Convertir PIL Image en numpy array pour EasyOCR
         img_array = np.array(image)
         
         # EasyOCR retourne une liste de (bbox, texte, confiance)
-        results = self.reader.readtext(img_array)
-        
-        # Extraire juste le texte
-        texts = [result[1] for result in results]
+        # Le reader (modèle torch) n'est pas garanti thread-safe: un appel à la fois
+        with self._easyocr_lock:
+            results = self.reader.readtext(img_array)
         
-        # Joindre tous les textes détectés
-        return '\n'.join(texts)
+        return OCRResult.from_easyocr(results, self.languages)
+
@@ -0,0 +1,109 @@
+"""
+Mode 'race': la même capture est envoyée à Tesseract et EasyOCR en parallèle
+Le premier résultat assez fiable l'emporte, l'autre est ignoré
+"""
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from ocr_result import text_plausibility
+
+
+class OCRRace:
+    """Course entre moteurs OCR pour réduire la latence de queue"""
+
+    def __init__(self, tesseract, get_easyocr, min_confidence=70, min_plausibility=0.75):
+        """
+        Initialise la course
+
+        Args:
+            tesseract: OCRHandler Tesseract (toujours disponible)
+            get_easyocr: Fonction sans argument retournant l'OCRHandler EasyOCR, ou None s'il n'est pas prêt
+            min_confidence: Confiance OCR moyenne (0-100) pour qu'un résultat gagne immédiatement
+            min_plausibility: Score text_plausibility (0-1) pour qu'un résultat gagne immédiatement
+        """
+        self.tesseract = tesseract
+        self.get_easyocr = get_easyocr
+        self.min_confidence = min_confidence
+        self.min_plausibility = min_plausibility
+
+        # Un thread par moteur: un moteur encore occupé par une course précédente
+        # (perdant ignoré) est simplement sauté au lieu de mettre la capture en file
+        self._executors = {
+            'tesseract': ThreadPoolExecutor(max_workers=1, thread_name_prefix='race-tesseract'),
+            'easyocr': ThreadPoolExecutor(max_workers=1, thread_name_prefix='race-easyocr'),
+        }
+        self._running = {}
+
+        # Statistiques: moteur gagnant par capture
+        self.wins = {'tesseract': 0, 'easyocr': 0}
+
+    def is_acceptable(self, result):
+        """True si le résultat peut gagner la course sans attendre l'autre moteur"""
+        return (bool(result) and result.confidence >= self.min_confidence
+                and text_plausibility(result.text) >= self.min_plausibility)
+
+    def run(self, image):
+        """
+        Lance la course sur une capture
+
+        Args:
+            image: PIL.Image
+
+        Returns:
+            OCRResult: Premier résultat acceptable, sinon le plus confiant une fois tous terminés
+        """
+        start_time = time.time()
+        futures = {}
+        for name, handler in (('tesseract', self.tesseract), ('easyocr', self.get_easyocr())):
+            if handler is None:
+                continue
+            previous = self._running.get(name)
+            if previous is not None and not previous.done():
+                print(f"⏭️ Race: {name} encore occupé par la capture précédente")
+                continue
+            future = self._executors[name].submit(handler.extract_text, image, True)
+            self._running[name] = future
+            futures[future] = name
+
+        if not futures:
+            # Les deux moteurs sont occupés: attendre Tesseract plutôt que rien
+            return self.tesseract.extract_text(image, structured=True)
+
+        best = None
+        best_name = None
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"⚠️ Race: erreur {name}: {e}")
+                    continue
+
+                if self.is_acceptable(result):
+                    self.wins[name] += 1
+                    self._report(name, result, start_time, pending)
+                    return result
+
+                if best is None or result.confidence > best.confidence:
+                    best, best_name = result, name
+
+        if best is None:
+            return self.tesseract.extract_text(image, structured=True)
+
+        self.wins[best_name] += 1
+        self._report(best_name, best, start_time, pending)
+        return best
+
+    def _report(self, name, result, start_time, pending):
+        """Affiche le gagnant de la course"""
+        ignored = f", {len(pending)} moteur(s) ignoré(s)" if pending else ""
+        print(f"🏁 Race: {name} l'emporte en {time.time() - start_time:.2f}s "
+              f"(confiance {result.confidence:.0f}{ignored})")
+
+    def close(self):
+        """Arrête les threads sans attendre les moteurs encore en cours"""
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
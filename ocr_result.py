@@ -0,0 +1,273 @@
+"""
+Résultats OCR structurés: mots avec boîtes, confiances et temps d'exécution
+Permet aux étapes suivantes d'ignorer le bruit peu fiable sans relancer l'OCR
+"""
+
+
+def _is_cjk(char):
+    """True si le caractère est japonais/chinois/coréen (pas d'espace entre ces mots)"""
+    code_point = ord(char)
+    return (0x3040 <= code_point <= 0x30FF or 0x4E00 <= code_point <= 0x9FFF
+            or 0xAC00 <= code_point <= 0xD7AF or 0xFF00 <= code_point <= 0xFFEF
+            or 0x3000 <= code_point <= 0x303F)
+
+
+def join_words(words):
+    """
+    Assemble les mots d'une ligne (pas d'espace parasite entre deux mots CJK)
+
+    Args:
+        words: Liste de chaînes non vides
+
+    Returns:
+        str: Ligne reconstruite
+    """
+    if not words:
+        return ""
+    line = words[0]
+    for word in words[1:]:
+        if _is_cjk(line[-1]) and _is_cjk(word[0]):
+            line += word
+        else:
+            line += ' ' + word
+    return line
+
+
+# Ponctuation courante des dialogues (latine et japonaise)
+COMMON_PUNCTUATION = set(".,;:!?'\"-()…「」『』、。！？ー・～")
+
+
+def text_plausibility(text):
+    """
+    Estime si un texte OCR ressemble à du texte réel plutôt qu'à du bruit
+
+    Le bruit typique (décor, icônes) donne des symboles isolés et des
+    caractères d'un seul signe séparés par des espaces.
+
+    Args:
+        text: Texte OCR
+
+    Returns:
+        float: Score entre 0 (bruit) et 1 (texte plausible)
+    """
+    chars = [char for char in text if not char.isspace()]
+    if not chars:
+        return 0.0
+
+    plausible = sum(1 for char in chars if char.isalnum() or char in COMMON_PUNCTUATION)
+    score = plausible / len(chars)
+
+    # Mots d'un seul caractère non CJK ("l | i ~"): fréquents dans le bruit
+    tokens = text.split()
+    isolated = sum(1 for token in tokens if len(token) == 1 and not _is_cjk(token))
+    return score * (1 - 0.5 * isolated / len(tokens))
+
+
+class OCRWord:
+    """Un mot (Tesseract) ou un fragment de ligne (EasyOCR) reconnu"""
+
+    __slots__ = ('text', 'box', 'confidence', 'line')
+
+    def __init__(self, text, box, confidence, line=0):
+        """
+        Args:
+            text: Texte reconnu
+            box: Tuple (x1, y1, x2, y2) en pixels de l'image analysée
+            confidence: Confiance 0-100 (-1 si inconnue)
+            line: Index de la ligne de texte dans le résultat
+        """
+        self.text = text
+        self.box = box
+        self.confidence = confidence
+        self.line = line
+
+    def __getstate__(self):
+        return (self.text, self.box, self.confidence, self.line)
+
+    def __setstate__(self, state):
+        self.text, self.box, self.confidence, self.line = state
+
+    def __repr__(self):
+        return f"OCRWord({self.text!r}, {self.box}, {self.confidence:.0f}, line={self.line})"
+
+
+class OCRResult:
+    """
+    Résultat d'une extraction OCR
+
+    Les mots sont gardés dans l'ordre de lecture; le texte brut est reconstruit
+    ligne par ligne à la demande.
+    """
+
+    __slots__ = ('words', 'engine', 'languages', 'detected_lang', 'elapsed', 'timings')
+
+    def __init__(self, words=None, engine=None, languages=None):
+        """
+        Args:
+            words: Liste d'OCRWord dans l'ordre de lecture
+            engine: 'tesseract' ou 'easyocr'
+            languages: Langues utilisées pour la passe retenue
+        """
+        self.words = words if words is not None else []
+        self.engine = engine
+        self.languages = languages
+        self.detected_lang = None
+        self.elapsed = 0.0
+        self.timings = {}
+
+    def __getstate__(self):
+        return (self.words, self.engine, self.languages, self.detected_lang, self.elapsed, self.timings)
+
+    def __setstate__(self, state):
+        self.words, self.engine, self.languages, self.detected_lang, self.elapsed, self.timings = state
+
+    @classmethod
+    def from_tesseract_data(cls, data, languages=None):
+        """
+        Construit un résultat depuis pytesseract.image_to_data (Output.DICT)
+
+        Args:
+            data: Dict {colonne: [valeurs]} (même format pour tesserocr, voir parse_tsv)
+            languages: Langues de la passe
+
+        Returns:
+            OCRResult
+        """
+        words = []
+        current_key = None
+        line_index = -1
+
+        for i, text in enumerate(data['text']):
+            text = text.strip()
+            if not text:
+                continue
+
+            key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+            if key != current_key:
+                current_key = key
+                line_index += 1
+
+            left, top = data['left'][i], data['top'][i]
+            box = (left, top, left + data['width'][i], top + data['height'][i])
+            words.append(OCRWord(text, box, float(data['conf'][i]), line_index))
+
+        return cls(words, engine='tesseract', languages=languages)
+
+    @classmethod
+    def from_easyocr(cls, results, languages=None):
+        """
+        Construit un résultat depuis reader.readtext
+
+        Args:
+            results: Liste de (quadrilatère [[x, y] × 4], texte, confiance 0-1)
+            languages: Langues du reader
+
+        Returns:
+            OCRResult (un fragment par ligne, confiance ramenée à 0-100)
+        """
+        words = []
+        for line_index, (points, text, confidence) in enumerate(results):
+            xs = [point[0] for point in points]
+            ys = [point[1] for point in points]
+            box = (int(min(xs)), int(min(ys)), int(max(xs)), int(max(ys)))
+            words.append(OCRWord(text, box, float(confidence) * 100, line_index))
+        return cls(words, engine='easyocr', languages=languages)
+
+    def lines(self):
+        """
+        Regroupe les mots par ligne
+
+        Returns:
+            list: [(texte, boîte englobante, confiance moyenne)] dans l'ordre de lecture
+        """
+        grouped = []
+        for word in self.words:
+            if not grouped or grouped[-1][0] != word.line:
+                grouped.append((word.line, []))
+            grouped[-1][1].append(word)
+
+        return [
+            (join_words([word.text for word in words]), _union([word.box for word in words]),
+             _mean_confidence(words))
+            for _, words in grouped
+        ]
+
+    @property
+    def text(self):
+        """Texte brut, une ligne par ligne détectée"""
+        return '\n'.join(line for line, _, _ in self.lines())
+
+    @property
+    def confidence(self):
+        """Confiance moyenne des mots (0-100, 0 si vide)"""
+        return _mean_confidence(self.words)
+
+    @property
+    def bbox(self):
+        """Boîte englobant tout le texte, None si vide"""
+        return _union([word.box for word in self.words])
+
+    def filtered(self, min_confidence):
+        """
+        Copie sans les mots sous le seuil (les confiances inconnues sont gardées)
+
+        Args:
+            min_confidence: Confiance minimale (0-100)
+
+        Returns:
+            OCRResult
+        """
+        return self._copy([
+            word for word in self.words
+            if word.confidence < 0 or word.confidence >= min_confidence
+        ])
+
+    def translated(self, dx=0, dy=0, scale=1.0, line_offset=0):
+        """
+        Copie avec des boîtes ramenées dans un autre repère: (x / scale + dx, y / scale + dy)
+
+        Args:
+            dx, dy: Décalage à ajouter (ex: origine d'un découpage)
+            scale: Facteur d'agrandissement appliqué à l'image analysée
+            line_offset: Décalage des index de ligne (assemblage de plusieurs résultats)
+
+        Returns:
+            OCRResult
+        """
+        words = []
+        for word in self.words:
+            x1, y1, x2, y2 = word.box
+            box = (round(x1 / scale + dx), round(y1 / scale + dy),
+                   round(x2 / scale + dx), round(y2 / scale + dy))
+            words.append(OCRWord(word.text, box, word.confidence, word.line + line_offset))
+        return self._copy(words)
+
+    @property
+    def line_count(self):
+        return len({word.line for word in self.words})
+
+    def _copy(self, words):
+        result = OCRResult(words, self.engine, self.languages)
+        result.detected_lang = self.detected_lang
+        result.elapsed = self.elapsed
+        result.timings = dict(self.timings)
+        return result
+
+    def __bool__(self):
+        return bool(self.words)
+
+    def __repr__(self):
+        return (f"OCRResult({len(self.words)} mots, {self.line_count} lignes, "
+                f"confiance {self.confidence:.0f}, {self.engine})")
+
+
+def _mean_confidence(words):
+    confidences = [word.confidence for word in words if word.confidence >= 0]
+    return sum(confidences) / len(confidences) if confidences else 0.0
+
+
+def _union(boxes):
+    if not boxes:
+        return None
+    return (min(box[0] for box in boxes), min(box[1] for box in boxes),
+            max(box[2] for box in boxes), max(box[3] for box in boxes))
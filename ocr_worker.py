@@ -0,0 +1,371 @@
+"""
+Processus OCR isolé: EasyOCR / Tesseract restent chargés hors du processus principal
+Les captures passent par multiprocessing.shared_memory, les résultats par une file
+Les hotkeys et les overlays Tk ne subissent plus le GIL tenu pendant l'inférence
+"""
+import multiprocessing
+import queue
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+from PIL import Image
+
+from ocr_result import OCRResult
+
+
+def _attach_segment(name):
+    """
+    Ouvre le segment de mémoire partagée créé par le processus principal, sans
+    l'enregistrer auprès du resource_tracker
+
+    Seul le créateur suit et libère le segment. Un enregistrement par le processus
+    OCR le compterait deux fois (avertissements de fuite, suppression prématurée),
+    et le désenregistrer ensuite retirerait aussi celui du créateur (le tracker
+    est partagé et ne compte pas les enregistrements).
+
+    Args:
+        name: Nom du segment
+
+    Returns:
+        SharedMemory
+    """
+    try:
+        # Python 3.13+
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+
+    # Versions antérieures: enregistrement neutralisé le temps de l'ouverture
+    # (processus OCR, un seul thread)
+    register = resource_tracker.register
+
+    def register_except_shared_memory(resource, rtype):
+        if rtype != 'shared_memory':
+            register(resource, rtype)
+
+    resource_tracker.register = register_except_shared_memory
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def _worker_main(handler_kwargs, requests, responses):
+    """
+    Boucle du processus OCR
+
+    Messages reçus:
+        ('ocr', request_id, shm_name, shape, structured, languages, fallback_lang)
+        ('ping', request_id)
+        ('stop',)
+    """
+    from ocr_handler import OCRHandler
+
+    handler = OCRHandler(**handler_kwargs)
+    responses.put(('ready', handler.engine))
+
+    segment = None
+    try:
+        while True:
+            message = requests.get()
+            kind = message[0]
+
+            if kind == 'stop':
+                break
+
+            if kind == 'ping':
+                responses.put(('pong', message[1]))
+                continue
+
+            _, request_id, shm_name, shape, structured, languages, fallback_lang = message
+            if segment is None or segment.name != shm_name:
+                if segment is not None:
+                    segment.close()
+                segment = _attach_segment(shm_name)
+
+            # Copie locale: le processus principal peut réutiliser le segment dès la réponse
+            pixels = np.ndarray(shape, dtype=np.uint8, buffer=segment.buf).copy()
+            result = handler.extract_text(Image.fromarray(pixels), structured=structured, languages=languages,
+                                          fallback_lang=fallback_lang)
+            responses.put(('result', request_id, result))
+    finally:
+        if segment is not None:
+            segment.close()
+        handler.close()
+
+
+class OCRWorkerProxy:
+    """
+    Même interface qu'OCRHandler (extract_text, engine, close) mais l'OCR
+    s'exécute dans un processus dédié, redémarré automatiquement s'il plante
+
+    Le redémarrage se fait en arrière-plan: en attendant, les extractions passent
+    par un OCRHandler Tesseract dans le processus principal au lieu d'attendre.
+    """
+
+    def __init__(self, handler_kwargs, timeout=60, start_timeout=300, health_interval=5):
+        """
+        Démarre le processus OCR (bloque jusqu'au chargement du moteur)
+
+        Args:
+            handler_kwargs: Arguments de OCRHandler (construit dans le processus OCR)
+            timeout: Délai maximal d'une extraction avant redémarrage du processus (secondes)
+            start_timeout: Délai maximal de chargement du moteur (secondes, EasyOCR est long)
+            health_interval: Intervalle des vérifications de santé (secondes, 0 = désactivées)
+
+        Raises:
+            RuntimeError: Si le processus OCR ne démarre pas
+        """
+        # Le processus OCR est daemon: il ne peut pas lancer le pool OCR par ligne
+        self.handler_kwargs = dict(handler_kwargs, parallel_lines=False)
+        self.engine = self.handler_kwargs.get('engine', 'tesseract')
+        self.languages = self.handler_kwargs.get('languages', ['en'])
+        self.timeout = timeout
+        self.start_timeout = start_timeout
+        self.health_interval = health_interval
+
+        self._context = multiprocessing.get_context('spawn')
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._process = None
+        self._requests = None
+        self._responses = None
+        self._segment = None
+        self._request_id = 0
+        self._restarting = False
+        self._fallback = None
+        self._fallback_lock = threading.Lock()
+
+        # Statistiques
+        self.restarts = 0
+        self.extractions = 0
+
+        self._start()
+
+        if health_interval:
+            threading.Thread(target=self._health_loop, daemon=True).start()
+
+    @property
+    def is_alive(self):
+        return self._process is not None and self._process.is_alive()
+
+    def _start(self):
+        """Lance le processus OCR et attend que son moteur soit chargé"""
+        self._process, self._requests, self._responses, self.engine = self._spawn()
+
+    def _spawn(self):
+        """
+        Lance un processus OCR et attend que son moteur soit chargé (sans toucher à l'état courant)
+
+        Returns:
+            tuple: (processus, file des requêtes, file des réponses, moteur)
+
+        Raises:
+            RuntimeError: Si le processus OCR ne démarre pas
+        """
+        requests = self._context.Queue()
+        responses = self._context.Queue()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(self.handler_kwargs, requests, responses),
+            name=f"ocr-{self.engine}",
+            daemon=True
+        )
+        process.start()
+
+        deadline = time.monotonic() + self.start_timeout
+        while time.monotonic() < deadline:
+            try:
+                message = responses.get(timeout=0.5)
+            except queue.Empty:
+                if not process.is_alive():
+                    break
+                continue
+            if message[0] == 'ready':
+                # Le moteur a pu se rabattre sur Tesseract (EasyOCR absent)
+                print(f"✅ Processus OCR {message[1]} prêt (pid {process.pid})")
+                return process, requests, responses, message[1]
+
+        self._kill(process)
+        raise RuntimeError(f"le processus OCR {self.engine} n'a pas démarré")
+
+    @staticmethod
+    def _kill(process):
+        """Arrête un processus OCR sans attendre de réponse"""
+        if process is None:
+            return
+        if process.is_alive():
+            process.terminate()
+        process.join(timeout=2)
+
+    def _restart(self, reason):
+        """
+        Remplace un processus OCR planté ou bloqué, en arrière-plan (appelé avec _lock tenu)
+
+        Le chargement du moteur peut durer jusqu'à start_timeout: il ne doit pas
+        bloquer les autres appelants, servis par l'OCR local en attendant.
+        """
+        if self._restarting or self._stop_event.is_set():
+            return
+        print(f"🔁 Redémarrage du processus OCR {self.engine}: {reason}")
+        self._restarting = True
+        self.restarts += 1
+        process, self._process = self._process, None
+        threading.Thread(target=self._restart_worker, args=(process,), daemon=True).start()
+
+    def _restart_worker(self, process):
+        """Arrête l'ancien processus et installe le nouveau (thread de redémarrage)"""
+        self._kill(process)
+        try:
+            spawned = self._spawn()
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            spawned = None
+
+        with self._lock:
+            self._restarting = False
+            if spawned is None:
+                return
+            if self._stop_event.is_set():
+                self._kill(spawned[0])
+                return
+            self._process, self._requests, self._responses, self.engine = spawned
+
+    def _local_handler(self):
+        """OCRHandler Tesseract du processus principal, créé au premier besoin"""
+        with self._fallback_lock:
+            if self._fallback is None:
+                from ocr_handler import OCRHandler
+
+                print("⚠️ Processus OCR indisponible, Tesseract dans le processus principal en attendant")
+                self._fallback = OCRHandler(**dict(self.handler_kwargs, engine='tesseract'))
+            return self._fallback
+
+    def _ensure_segment(self, size):
+        """Segment de mémoire partagée d'au moins `size` octets (réalloué seulement s'il grandit)"""
+        if self._segment is not None and self._segment.size >= size:
+            return
+        if self._segment is not None:
+            self._segment.close()
+            self._segment.unlink()
+        self._segment = shared_memory.SharedMemory(create=True, size=size)
+
+    def _wait_for(self, kind, request_id, timeout):
+        """
+        Attend la réponse d'une requête en surveillant le processus
+
+        Returns:
+            La réponse, ou None si délai dépassé / processus mort
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                message = self._responses.get(timeout=0.2)
+            except queue.Empty:
+                if not self._process.is_alive():
+                    return None
+                continue
+            # Ignorer les réponses en retard d'une requête abandonnée
+            if message[0] == kind and message[1] == request_id:
+                return message
+        return None
+
+    def extract_text(self, image, structured=False, languages=None, fallback_lang=None):
+        """
+        Extrait le texte dans le processus OCR (voir OCRHandler.extract_text)
+
+        Args:
+            image: PIL.Image
+            structured: Si True, retourne un OCRResult
+            languages: Langues de cette extraction (défaut: langues configurées)
+            fallback_lang: Langue d'un texte latin trop court pour être identifié (optionnel)
+
+        Returns:
+            tuple: (text, detected_lang), ou OCRResult si structured
+        """
+        empty = OCRResult(engine=self.engine) if structured else ("", None)
+        if not image:
+            return empty
+
+        pixels = np.asarray(image if image.mode == 'RGB' else image.convert('RGB'))
+
+        with self._lock:
+            if not self.is_alive:
+                self._restart("processus arrêté")
+
+            if self.is_alive:
+                self._ensure_segment(pixels.nbytes)
+                np.copyto(np.ndarray(pixels.shape, dtype=np.uint8, buffer=self._segment.buf), pixels)
+
+                self._request_id += 1
+                self._requests.put(('ocr', self._request_id, self._segment.name, pixels.shape, structured, languages,
+                                    fallback_lang))
+                message = self._wait_for('result', self._request_id, self.timeout)
+
+                if message is not None:
+                    self.extractions += 1
+                    return message[2]
+
+                reason = "plantage" if not self.is_alive else f"pas de réponse en {self.timeout}s"
+                print(f"❌ Erreur OCR (processus {self.engine}): {reason}")
+                self._restart(reason)
+
+        # Processus en cours de redémarrage: OCR local plutôt qu'une attente
+        try:
+            return self._local_handler().extract_text(image, structured=structured, languages=languages,
+                                                      fallback_lang=fallback_lang)
+        except Exception as e:
+            print(f"❌ Erreur OCR locale: {e}")
+            return empty
+
+    def ping(self, timeout=5):
+        """
+        Vérifie que le processus OCR répond
+
+        Returns:
+            bool: True si une réponse est arrivée à temps
+        """
+        with self._lock:
+            return self._ping(timeout)
+
+    def _ping(self, timeout):
+        if not self.is_alive:
+            return False
+        self._request_id += 1
+        self._requests.put(('ping', self._request_id))
+        return self._wait_for('pong', self._request_id, timeout) is not None
+
+    def _health_loop(self):
+        """Vérification périodique: redémarre le processus s'il est mort ou ne répond plus"""
+        while not self._stop_event.wait(self.health_interval):
+            # Une extraction en cours prouve déjà que le processus est surveillé
+            if not self._lock.acquire(blocking=False):
+                continue
+            try:
+                if self._stop_event.is_set():
+                    break
+                if not self._ping(timeout=5):
+                    self._restart("ne répond plus aux vérifications de santé")
+            finally:
+                self._lock.release()
+
+    def close(self):
+        """Arrête le processus OCR et libère la mémoire partagée"""
+        self._stop_event.set()
+        with self._lock:
+            if self.is_alive:
+                self._requests.put(('stop',))
+                self._process.join(timeout=2)
+            self._kill(self._process)
+            if self._segment is not None:
+                self._segment.close()
+                self._segment.unlink()
+                self._segment = None
+        with self._fallback_lock:
+            if self._fallback is not None:
+                self._fallback.close()
+                self._fallback = None
+        if self.restarts:
+            print(f"🔁 Processus OCR {self.engine}: {self.restarts} redémarrage(s)")
@@ -0,0 +1,199 @@
+"""
+Client asyncio pour les générations Ollama (traduction texte et vision)
+Une seule boucle d'événements dans un thread dédié; une nouvelle requête sur un canal
+annule la précédente et ferme son flux, ce qui arrête la génération côté Ollama
+"""
+import asyncio
+import json
+import threading
+from concurrent.futures import CancelledError
+
+import aiohttp
+
+
+class OllamaHTTPError(Exception):
+    """Réponse en erreur d'Ollama (code HTTP ou message 'error' dans le flux)"""
+
+    def __init__(self, status, detail=""):
+        super().__init__(f"Erreur Ollama (code {status})")
+        self.status = status
+        self.detail = detail
+
+
+class AsyncOllamaClient:
+    """Générations Ollama concurrentes, bornées par un sémaphore et annulables par canal"""
+
+    def __init__(self, url="http://localhost:11434", pool_size=4, keep_alive="10m",
+                 connect_timeout=3.0, read_timeout=60, max_concurrent=2):
+        """
+        Démarre la boucle d'événements et la session aiohttp
+
+        Args:
+            url: URL de l'API Ollama
+            pool_size: Connexions HTTP gardées ouvertes
+            keep_alive: Durée pendant laquelle Ollama garde le modèle en mémoire (None = défaut d'Ollama)
+            connect_timeout: Délai maximal d'établissement de la connexion (secondes)
+            read_timeout: Délai maximal sans recevoir de données (secondes, défaut des générations)
+            max_concurrent: Générations envoyées simultanément à Ollama (les autres attendent)
+        """
+        self.url = url.rstrip('/')
+        self.keep_alive = keep_alive
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+
+        # Génération en cours par canal (ex: 'translate', 'watch'): la plus récente gagne
+        self._channels = {}
+        self._channels_lock = threading.Lock()
+
+        # Statistiques
+        self.cancelled = 0
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='ollama-async', daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._open(pool_size, max_concurrent), self._loop).result()
+
+    async def _open(self, pool_size, max_concurrent):
+        """Objets aiohttp / asyncio créés dans la boucle qui les utilise"""
+        self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=pool_size))
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Construit le client depuis config.json (section ollama_client)
+
+        Args:
+            config: Dict de configuration complet
+
+        Returns:
+            AsyncOllamaClient
+        """
+        client_config = config.get('ollama_client', {})
+        return cls(
+            url=config.get('ollama_url', 'http://localhost:11434'),
+            pool_size=client_config.get('pool_size', 4),
+            keep_alive=client_config.get('keep_alive', '10m'),
+            connect_timeout=client_config.get('connect_timeout', 3.0),
+            read_timeout=client_config.get('read_timeout', 60),
+            max_concurrent=client_config.get('max_concurrent', 2)
+        )
+
+    def generate(self, payload, channel=None, on_chunk=None, timeout=None):
+        """
+        Lance une génération /api/generate sur la boucle asyncio
+
+        Args:
+            payload: Corps JSON (keep_alive ajouté s'il n'est pas fourni)
+            channel: Canal de la requête: la génération précédente du même canal est annulée
+            on_chunk: Fonction appelée avec chaque morceau de texte (flux seulement, thread de la boucle)
+            timeout: Délai maximal sans recevoir de données (secondes, défaut: read_timeout)
+
+        Returns:
+            concurrent.futures.Future: Texte complet généré (CancelledError si remplacée)
+        """
+        if self.keep_alive is not None and 'keep_alive' not in payload:
+            payload = dict(payload, keep_alive=self.keep_alive)
+
+        future = asyncio.run_coroutine_threadsafe(self._generate(payload, on_chunk, timeout), self._loop)
+        if channel is None:
+            return future
+
+        with self._channels_lock:
+            previous = self._channels.get(channel)
+            self._channels[channel] = future
+        future.add_done_callback(lambda done: self._release(channel, done))
+
+        if previous is not None and previous.cancel():
+            self.cancelled += 1
+            print(f"⏹️ Génération précédente annulée (canal '{channel}')")
+        return future
+
+    def run(self, payload, channel=None, on_chunk=None, timeout=None):
+        """
+        Génération bloquante (voir generate)
+
+        Returns:
+            str: Texte complet généré
+
+        Raises:
+            concurrent.futures.CancelledError: Remplacée par une requête plus récente du même canal
+            asyncio.TimeoutError: Ollama ne répond plus
+            aiohttp.ClientError: Ollama inaccessible
+            OllamaHTTPError: Ollama a répondu en erreur
+        """
+        return self.generate(payload, channel, on_chunk, timeout).result()
+
+    def cancel(self, channel):
+        """
+        Annule la génération en cours d'un canal
+
+        Returns:
+            bool: True si une génération a été annulée
+        """
+        with self._channels_lock:
+            future = self._channels.get(channel)
+        if future is not None and future.cancel():
+            self.cancelled += 1
+            return True
+        return False
+
+    def _release(self, channel, future):
+        with self._channels_lock:
+            if self._channels.get(channel) is future:
+                del self._channels[channel]
+
+    async def _generate(self, payload, on_chunk, timeout):
+        """Requête Ollama (exécutée dans la boucle); l'annulation ferme la connexion"""
+        client_timeout = aiohttp.ClientTimeout(
+            total=None,
+            sock_connect=self.connect_timeout,
+            sock_read=timeout if timeout is not None else self.read_timeout
+        )
+        async with self._semaphore:
+            async with self._session.post(f"{self.url}/api/generate", json=payload, timeout=client_timeout) as response:
+                if response.status != 200:
+                    raise OllamaHTTPError(response.status, await response.text())
+
+                if not payload.get('stream', True):
+                    data = await response.json(content_type=None)
+                    return data.get('response', '')
+
+                # Lignes JSON découpées à la main: la dernière (contexte complet) peut être très longue
+                parts = []
+                buffer = b''
+                async for data in response.content.iter_any():
+                    buffer += data
+                    *lines, buffer = buffer.split(b'\n')
+                    for line in lines:
+                        if not line.strip():
+                            continue
+                        chunk = json.loads(line)
+                        if 'error' in chunk:
+                            raise OllamaHTTPError(response.status, chunk['error'])
+                        text = chunk.get('response', '')
+                        if text:
+                            parts.append(text)
+                            if on_chunk:
+                                on_chunk(text)
+                        if chunk.get('done'):
+                            return ''.join(parts)
+                return ''.join(parts)
+
+    def close(self):
+        """Annule les générations en cours, ferme la session et arrête la boucle"""
+        with self._channels_lock:
+            futures = list(self._channels.values())
+        for future in futures:
+            future.cancel()
+        try:
+            asyncio.run_coroutine_threadsafe(self._session.close(), self._loop).result(timeout=5)
+        except Exception as e:
+            print(f"⚠️ Fermeture du client Ollama: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        if self.cancelled:
+            print(f"⏹️ Client Ollama: {self.cancelled} génération(s) annulée(s)")
+
+
+__all__ = ['AsyncOllamaClient', 'OllamaHTTPError', 'CancelledError']
@@ -0,0 +1,97 @@
+"""
+Client HTTP partagé pour l'API Ollama
+Une seule session requests (pool de connexions keep-alive) pour la traduction texte et vision
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class OllamaClient:
+    """Pool de connexions réutilisées vers Ollama, timeouts et relances configurables"""
+
+    def __init__(self, url="http://localhost:11434", pool_size=4, keep_alive="10m",
+                 connect_timeout=3.0, read_timeout=60, retries=1):
+        """
+        Initialise le client
+
+        Args:
+            url: URL de l'API Ollama
+            pool_size: Connexions HTTP gardées ouvertes (requêtes simultanées sans nouvelle connexion)
+            keep_alive: Durée pendant laquelle Ollama garde le modèle en mémoire après une requête
+                        (ajoutée aux requêtes /api/generate, None = défaut d'Ollama)
+            connect_timeout: Délai maximal d'établissement de la connexion (secondes)
+            read_timeout: Délai maximal de réponse par défaut (secondes)
+            retries: Nouvelles tentatives si la connexion échoue (Ollama en cours de démarrage);
+                     une requête déjà envoyée n'est jamais rejouée
+        """
+        self.url = url.rstrip('/')
+        self.keep_alive = keep_alive
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+
+        retry = Retry(total=retries, connect=retries, read=0, status=0, other=0,
+                      backoff_factor=0.3, raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Construit le client depuis config.json (section ollama_client)
+
+        Args:
+            config: Dict de configuration complet
+
+        Returns:
+            OllamaClient
+        """
+        client_config = config.get('ollama_client', {})
+        return cls(
+            url=config.get('ollama_url', 'http://localhost:11434'),
+            pool_size=client_config.get('pool_size', 4),
+            keep_alive=client_config.get('keep_alive', '10m'),
+            connect_timeout=client_config.get('connect_timeout', 3.0),
+            read_timeout=client_config.get('read_timeout', 60),
+            retries=client_config.get('retries', 1)
+        )
+
+    def _timeout(self, read_timeout):
+        return (self.connect_timeout, read_timeout if read_timeout is not None else self.read_timeout)
+
+    def get(self, path, timeout=None):
+        """
+        Requête GET sur l'API (ex: '/api/tags')
+
+        Args:
+            path: Chemin de l'API
+            timeout: Délai de réponse (secondes, défaut: read_timeout)
+
+        Returns:
+            requests.Response
+        """
+        return self.session.get(f"{self.url}{path}", timeout=self._timeout(timeout))
+
+    def post(self, path, payload, timeout=None, stream=False):
+        """
+        Requête POST JSON sur l'API (ex: '/api/generate')
+
+        Args:
+            path: Chemin de l'API
+            payload: Corps JSON (keep_alive ajouté s'il n'est pas fourni)
+            timeout: Délai de réponse (secondes, défaut: read_timeout)
+            stream: Réponse lue au fil de l'eau (iter_lines)
+
+        Returns:
+            requests.Response
+        """
+        if self.keep_alive is not None and 'keep_alive' not in payload:
+            payload = dict(payload, keep_alive=self.keep_alive)
+        return self.session.post(f"{self.url}{path}", json=payload, timeout=self._timeout(timeout), stream=stream)
+
+    def close(self):
+        """Ferme les connexions du pool"""
+        self.session.close()
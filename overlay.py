@@ -1,6 +1,8 @@
 """
 Module pour l'affichage de l'overlay de traduction
 """
+import queue
+import time
 import tkinter as tk
 from tkinter import scrolledtext
 import threading
@@ -23,7 +25,14 @@ class TranslationOverlay:
         self.height = height
         self.root = None
         self.text_widget = None
+        self.original_label = None
         self.close_timer = None
+        
+        # Mises à jour envoyées depuis d'autres threads (Tk n'est pas thread-safe)
+        self._pending = queue.Queue()
+        self.poll_interval_ms = 100
+        self.ready = threading.Event()
+        self.closed = threading.Event()
     
     def show(self, original_text, translated_text, auto_close=True, timeout=60):
         """
@@ -67,7 +76,7 @@ class TranslationOverlay:
         
         # Texte original (optionnel, commenté par défaut pour gagner de l'espace)
         if len(original_text) < 100:  # Afficher seulement si court
-            original_label = tk.Label(
+            self.original_label = tk.Label(
                 main_frame,
                 text=f"Original: {original_text}",
                 font=('Segoe UI', 9),
@@ -76,7 +85,7 @@ class TranslationOverlay:
                 wraplength=self.width - 40,
                 justify=tk.LEFT
             )
-            original_label.pack(pady=(0, 5))
+            self.original_label.pack(pady=(0, 5))
         
         # Zone de texte traduit avec scrollbar
         text_frame = tk.Frame(main_frame, bg='#1e1e1e')
@@ -124,7 +133,7 @@ class TranslationOverlay:
         self.root.bind('<Escape>', lambda e: self.close())
         
         # Copier dans le presse-papiers sur Ctrl+C
-        self.root.bind('<Control-c>', lambda e: self._copy_to_clipboard(translated_text))
+        self.root.bind('<Control-c>', lambda e: self._copy_to_clipboard(self.text_widget.get('1.0', 'end-1c')))
         
         # Timer de fermeture automatique
         if auto_close:
@@ -151,8 +160,13 @@ class TranslationOverlay:
             y = (screen_height - self.height) // 2
             self.root.geometry(f"{self.width}x{self.height}+{x}+{y}")
         
+        # Traiter les mises à jour envoyées par les autres threads
+        self.root.after(self.poll_interval_ms, self._drain_pending)
+        self.ready.set()
+        
         print("✅ Overlay affiché")
         self.root.mainloop()
+        self.closed.set()
     
     def _update_countdown(self, label, remaining):
         """Met à jour le compte à rebours"""
@@ -178,17 +192,56 @@ class TranslationOverlay:
     
     def update_text(self, text):
         """
-        Met à jour le texte affiché (utile pour le streaming)
+        Met à jour le texte affiché (utile pour le streaming), depuis n'importe quel thread
         
         Args:
             text: Nouveau texte à afficher
         """
-        if self.text_widget and self.root:
-            self.text_widget.configure(state='normal')
-            self.text_widget.delete('1.0', tk.END)
-            self.text_widget.insert('1.0', text)
-            self.text_widget.configure(state='disabled')
-            self.root.update()
+        self.post_update(text)
+    
+    def post_update(self, translated_text, original_text=None):
+        """
+        Demande une mise à jour du texte depuis n'importe quel thread
+        
+        Args:
+            translated_text: Nouveau texte traduit
+            original_text: Nouveau texte original (optionnel)
+        """
+        self._pending.put((translated_text, original_text))
+    
+    def post_close(self):
+        """Demande la fermeture de l'overlay depuis n'importe quel thread"""
+        self._pending.put(None)
+    
+    def _drain_pending(self):
+        """Applique la dernière mise à jour en attente (exécuté sur le thread Tk)"""
+        if not self.root:
+            return
+        
+        latest = False
+        try:
+            while True:
+                latest = self._pending.get_nowait()
+                if latest is None:
+                    self.close()
+                    return
+        except queue.Empty:
+            pass
+        
+        if latest:
+            translated_text, original_text = latest
+            self._set_text(translated_text)
+            if original_text is not None and self.original_label is not None:
+                self.original_label.config(text=f"Original: {original_text}")
+        
+        self.root.after(self.poll_interval_ms, self._drain_pending)
+    
+    def _set_text(self, text):
+        """Remplace le texte traduit affiché"""
+        self.text_widget.configure(state='normal')
+        self.text_widget.delete('1.0', tk.END)
+        self.text_widget.insert('1.0', text)
+        self.text_widget.configure(state='disabled')
 
 
 def show_overlay_threaded(x, y, original_text, translated_text, width=400, height=200, timeout=60):
@@ -206,6 +259,67 @@ def show_overlay_threaded(x, y, original_text, translated_text, width=400, heigh
     overlay.show(original_text, translated_text, timeout=timeout)
 
 
+def show_live_overlay(x, y, original_text, translated_text, width=400, height=250, auto_close=False, timeout=60):
+    """
+    Ouvre un overlay persistant, mis à jour via post_update()
+    
+    Args:
+        x, y: Position de l'overlay
+        original_text: Texte original initial
+        translated_text: Texte traduit initial
+        width, height: Dimensions de l'overlay
+        auto_close: Si True, ferme automatiquement après timeout secondes
+        timeout: Délai avant fermeture automatique (secondes)
+        
+    Returns:
+        TranslationOverlay: Overlay affiché (fermé par clic, Échap ou post_close)
+    """
+    overlay = TranslationOverlay(x, y, width, height)
+    thread = threading.Thread(
+        target=overlay.show,
+        args=(original_text, translated_text),
+        kwargs={'auto_close': auto_close, 'timeout': timeout},
+        daemon=True
+    )
+    thread.start()
+    overlay.ready.wait(timeout=5)
+    return overlay
+
+
+class StreamBuffer:
+    """
+    Accumule les tokens d'une traduction en streaming pour un overlay
+    
+    L'overlay n'est rafraîchi qu'au rythme de son polling Tk: inutile d'envoyer
+    chaque token (plusieurs dizaines par seconde).
+    """
+    
+    CURSOR = ' ▌'
+    
+    def __init__(self, overlay, interval_ms=None):
+        """
+        Args:
+            overlay: TranslationOverlay à alimenter
+            interval_ms: Intervalle minimal entre deux rafraîchissements (défaut: poll_interval_ms de l'overlay)
+        """
+        self.overlay = overlay
+        self.interval = (interval_ms or overlay.poll_interval_ms) / 1000
+        self.text = ""
+        self._last_post = 0.0
+    
+    def append(self, chunk):
+        """Ajoute un token (callback de translate_streaming, thread de traduction)"""
+        self.text += chunk
+        now = time.monotonic()
+        if now - self._last_post >= self.interval:
+            self._last_post = now
+            self.overlay.post_update(self.text.lstrip() + self.CURSOR)
+    
+    def finish(self, final_text):
+        """Affiche la traduction complète (ou le message d'erreur)"""
+        self.overlay.post_update(final_text)
+
+
 def show_error_overlay(error_message):
     """
     Affiche un overlay d'erreur
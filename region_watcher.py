@@ -0,0 +1,122 @@
+"""
+Module pour surveiller en continu une zone de l'écran
+Ne relance l'OCR que lorsque le contenu de la zone change réellement
+"""
+import threading
+import time
+
+import numpy as np
+
+
+class RegionWatcher:
+    """Échantillonne une zone à intervalle régulier et signale les changements"""
+
+    def __init__(self, engine, bbox, on_change, interval=0.5, sample_step=2,
+                 pixel_tolerance=24, change_ratio=0.0005):
+        """
+        Initialise le watcher
+
+        Args:
+            engine: CaptureEngine partagé
+            bbox: Tuple (x1, y1, x2, y2) de la zone à surveiller
+            on_change: Fonction appelée avec la CapturedFrame quand la zone change
+            interval: Délai entre deux échantillons (secondes)
+            sample_step: Pas de sous-échantillonnage pour la comparaison (1 = tous les pixels)
+            pixel_tolerance: Écart minimal (0-255) pour considérer qu'un pixel a changé
+            change_ratio: Proportion minimale de pixels changés pour déclencher on_change
+        """
+        self.engine = engine
+        self.bbox = tuple(bbox)
+        self.on_change = on_change
+        self.interval = interval
+        self.sample_step = max(1, int(sample_step))
+        self.pixel_tolerance = pixel_tolerance
+        self.change_ratio = change_ratio
+
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._previous = None
+
+        # Statistiques (coût de l'échantillonnage, hors OCR)
+        self.samples = 0
+        self.triggers = 0
+        self.sample_time = 0.0
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Démarre la surveillance dans un thread dédié"""
+        if self.is_running:
+            return
+
+        self._stop_event.clear()
+        self._previous = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        print(f"👁️ Surveillance de la zone {self.bbox} (toutes les {self.interval}s)")
+
+    def stop(self):
+        """Arrête la surveillance et affiche les statistiques"""
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+        self._thread = None
+
+        if self.samples:
+            avg_ms = self.sample_time / self.samples * 1000
+            print(f"👁️ Surveillance arrêtée: {self.samples} échantillons, "
+                  f"{self.triggers} changements, {avg_ms:.2f}ms/échantillon")
+
+    def has_changed(self, frame):
+        """
+        Compare la frame à la précédente sur une grille sous-échantillonnée
+
+        Args:
+            frame: CapturedFrame
+
+        Returns:
+            bool: True si assez de pixels ont changé
+        """
+        step = self.sample_step
+        current = frame.pixels[::step, ::step, :3]
+
+        previous = self._previous
+        if previous is None or previous.shape != current.shape:
+            changed = True
+        else:
+            diff = np.abs(current.astype(np.int16) - previous).max(axis=2)
+            changed = np.count_nonzero(diff > self.pixel_tolerance) > self.change_ratio * diff.size
+
+        if changed:
+            # Copie: le buffer mss de la frame n'appartient pas au watcher
+            self._previous = current.astype(np.int16)
+
+        return changed
+
+    def _run(self):
+        """Boucle d'échantillonnage"""
+        while not self._stop_event.is_set():
+            started = time.perf_counter()
+
+            try:
+                frame = self.engine.grab(self.bbox)
+                changed = self.has_changed(frame)
+            except Exception as e:
+                print(f"❌ Erreur de surveillance: {e}")
+                changed = False
+                frame = None
+
+            self.samples += 1
+            self.sample_time += time.perf_counter() - started
+
+            if changed:
+                self.triggers += 1
+                try:
+                    self.on_change(frame)
+                except Exception as e:
+                    print(f"❌ Erreur lors du traitement du changement: {e}")
+
+            elapsed = time.perf_counter() - started
+            self._stop_event.wait(max(0.0, self.interval - elapsed))
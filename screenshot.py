@@ -1,15 +1,26 @@
 """
 Module pour capturer une zone de l'écran sélectionnée par l'utilisateur
 """
+import threading
+import time
 import tkinter as tk
-from PIL import Image, ImageGrab
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageGrab, ImageTk
 import mss
+import numpy as np
 
 
 class ScreenshotSelector:
     """Permet à l'utilisateur de sélectionner une zone de l'écran"""
     
-    def __init__(self):
+    def __init__(self, background=None):
+        """
+        Args:
+            background: PIL.Image figée à afficher sous la sélection (optionnel).
+                        Sans image, la fenêtre est semi-transparente sur l'écran réel.
+        """
+        self.background = background
+        self._background_photo = None
         self.start_x = None
         self.start_y = None
         self.end_x = None
@@ -53,7 +64,8 @@ class ScreenshotSelector:
         """
         self.root = tk.Tk()
         self.root.attributes('-fullscreen', True)
-        self.root.attributes('-alpha', 0.3)  # Semi-transparent
+        if self.background is None:
+            self.root.attributes('-alpha', 0.3)  # Semi-transparent
         self.root.attributes('-topmost', True)
 
         # Forcer l'affichage du curseur même si le jeu le capture
@@ -83,6 +95,11 @@ class ScreenshotSelector:
         )
         self.canvas.pack(fill=tk.BOTH, expand=True)
         
+        # Afficher l'image figée (mode freeze-frame)
+        if self.background is not None:
+            self._background_photo = ImageTk.PhotoImage(self.background, master=self.root)
+            self.canvas.create_image(0, 0, anchor='nw', image=self._background_photo)
+        
         # Forcer le focus sur le canvas pour capturer la souris
         self.canvas.focus_set()
         
@@ -106,6 +123,7 @@ class ScreenshotSelector:
         
         # Nettoyer
         self.root.destroy()
+        self._background_photo = None
         
         # Vérifier si une zone a été sélectionnée
         if (self.start_x is not None and self.start_y is not None and 
@@ -123,18 +141,193 @@ class ScreenshotSelector:
         return None
 
 
-def capture_screen_area(bbox):
+class CapturedFrame:
+    """
+    Image capturée, exposée comme vue NumPy BGRA en lecture seule
+
+    Aucune copie n'est faite à la capture: le tableau pointe directement sur
+    le buffer brut renvoyé par mss. La conversion en PIL.Image n'a lieu que
+    si un consommateur en a réellement besoin (to_pil).
+    """
+
+    __slots__ = ('pixels', 'bbox', 'timestamp', 'scale', '_pil')
+
+    def __init__(self, pixels, bbox, timestamp=None, scale=1):
+        """
+        Args:
+            pixels: numpy.ndarray (hauteur, largeur, 4) au format BGRA (ou BGR)
+            bbox: Tuple (x1, y1, x2, y2) de la zone à l'écran
+            timestamp: Instant de la capture (time.time()), maintenant par défaut
+            scale: Facteur de sous-échantillonnage des pixels par rapport à l'écran
+        """
+        self.pixels = pixels
+        self.bbox = bbox
+        self.timestamp = timestamp if timestamp is not None else time.time()
+        self.scale = scale
+        self._pil = None
+
+    @property
+    def width(self):
+        return self.pixels.shape[1]
+
+    @property
+    def height(self):
+        return self.pixels.shape[0]
+
+    @property
+    def size(self):
+        """(largeur, hauteur), comme PIL.Image.size"""
+        return (self.width, self.height)
+
+    def to_pil(self):
+        """
+        Convertit la frame en PIL.Image RGB (une seule conversion, mise en cache)
+
+        Returns:
+            PIL.Image
+        """
+        if self._pil is None:
+            pixels = np.ascontiguousarray(self.pixels)
+            rawmode = 'BGRX' if pixels.shape[2] == 4 else 'BGR'
+            self._pil = Image.frombuffer(
+                'RGB', (self.width, self.height), pixels, 'raw', rawmode, 0, 1
+            )
+        return self._pil
+
+    def crop(self, bbox):
+        """
+        Découpe une zone de la frame sans nouvelle capture ni copie
+
+        Args:
+            bbox: Tuple (x1, y1, x2, y2) en coordonnées écran
+
+        Returns:
+            CapturedFrame: Vue sur la zone demandée (bornée à la frame)
+        """
+        left, top, scale = self.bbox[0], self.bbox[1], self.scale
+        x1 = min(max((bbox[0] - left) // scale, 0), self.width)
+        y1 = min(max((bbox[1] - top) // scale, 0), self.height)
+        x2 = min(max((bbox[2] - left) // scale, x1), self.width)
+        y2 = min(max((bbox[3] - top) // scale, y1), self.height)
+
+        return CapturedFrame(
+            self.pixels[y1:y2, x1:x2],
+            (x1 * scale + left, y1 * scale + top, x2 * scale + left, y2 * scale + top),
+            self.timestamp,
+            scale
+        )
+
+
+class CaptureEngine:
+    """
+    Moteur de capture persistant
+
+    Garde un seul handle mss ouvert pour toute la durée de l'application au lieu
+    de reconstruire le grabber X11/DXGI à chaque hotkey. mss n'accepte un handle
+    que sur le thread qui l'a créé: toutes les captures (hotkeys, surveillance,
+    historique) passent par un thread de capture dédié qui le possède.
+    """
+
+    def __init__(self):
+        self._sct = None
+        self._executor = None
+        # Les callbacks de hotkeys tournent sur des threads différents
+        self._lock = threading.Lock()
+
+    def _run(self, function, *args):
+        """Exécute function sur le thread de capture (créé au premier usage)"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='capture')
+            future = self._executor.submit(function, *args)
+        return future.result()
+
+    def _handle(self):
+        """Ouvre le handle mss au premier usage (thread de capture uniquement)"""
+        if self._sct is None:
+            self._sct = mss.mss()
+        return self._sct
+
+    def _grab(self, monitor):
+        return self._handle().grab(monitor)
+
+    def _monitor(self, index):
+        return dict(self._handle().monitors[index])
+
+    def _close_handle(self):
+        if self._sct is not None:
+            self._sct.close()
+            self._sct = None
+
+    def grab(self, bbox):
+        """
+        Capture une zone de l'écran sans copie
+
+        Args:
+            bbox: Tuple (x1, y1, x2, y2) des coordonnées de la zone
+
+        Returns:
+            CapturedFrame
+        """
+        monitor = {
+            "top": bbox[1],
+            "left": bbox[0],
+            "width": bbox[2] - bbox[0],
+            "height": bbox[3] - bbox[1]
+        }
+
+        screenshot = self._run(self._grab, monitor)
+
+        pixels = np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(
+            screenshot.height, screenshot.width, 4
+        )
+        pixels.flags.writeable = False
+        return CapturedFrame(pixels, tuple(bbox))
+
+    def grab_monitor(self, index=1):
+        """
+        Capture un moniteur entier (écran principal par défaut)
+
+        Args:
+            index: Index mss du moniteur (0 = tous les écrans, 1 = principal)
+
+        Returns:
+            CapturedFrame
+        """
+        monitor = self._run(self._monitor, index)
+        bbox = (
+            monitor["left"],
+            monitor["top"],
+            monitor["left"] + monitor["width"],
+            monitor["top"] + monitor["height"]
+        )
+        return self.grab(bbox)
+
+    def close(self):
+        """Libère le handle mss (sur son thread) et arrête le thread de capture"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.submit(self._close_handle).result()
+            executor.shutdown()
+
+
+def capture_screen_area(bbox, engine=None):
     """
     Capture une zone spécifique de l'écran
     
     Args:
         bbox: Tuple (x1, y1, x2, y2) des coordonnées de la zone
+        engine: CaptureEngine persistant (optionnel, sinon handle mss temporaire)
         
     Returns:
         PIL.Image ou None si erreur
     """
     try:
-        # Utiliser mss pour une capture plus performante
+        if engine is not None:
+            return engine.grab(bbox).to_pil()
+
+        # Sans moteur persistant: handle mss temporaire
         with mss.mss() as sct:
             monitor = {
                 "top": bbox[1],
@@ -146,11 +339,13 @@ def capture_screen_area(bbox):
             # Capturer la zone
             screenshot = sct.grab(monitor)
             
-            # Convertir en PIL Image
+            # Convertir en PIL Image (BGRA -> RGB en une seule passe)
             img = Image.frombytes(
                 'RGB',
                 (screenshot.width, screenshot.height),
-                screenshot.rgb
+                screenshot.raw,
+                'raw',
+                'BGRX'
             )
             
             return img
@@ -159,13 +354,21 @@ def capture_screen_area(bbox):
         return None
 
 
-def capture_with_selection():
+def capture_with_selection(engine=None, freeze=False):
     """
     Workflow complet: sélection + capture
     
+    Args:
+        engine: CaptureEngine persistant (optionnel)
+        freeze: Si True, l'écran est capturé au moment de la hotkey et la
+                sélection est découpée dans cette image figée (pas de 2e capture)
+        
     Returns:
         tuple (PIL.Image, bbox) ou (None, None) si erreur/annulation
     """
+    if freeze:
+        return _capture_frozen_selection(engine)
+    
     print("📸 Mode sélection activé...")
     
     selector = ScreenshotSelector()
@@ -177,10 +380,72 @@ def capture_with_selection():
     
     print(f"✅ Zone sélectionnée: {bbox}")
     
-    img = capture_screen_area(bbox)
+    img = capture_screen_area(bbox, engine)
     
     if img:
         print(f"✅ Image capturée: {img.size[0]}x{img.size[1]} pixels")
         return img, bbox
     
     return None, None
+
+
+def _capture_frozen_selection(engine=None):
+    """
+    Capture l'écran principal immédiatement puis sélectionne sur l'image figée
+    
+    Args:
+        engine: CaptureEngine persistant (optionnel)
+        
+    Returns:
+        tuple (PIL.Image, bbox) ou (None, None) si erreur/annulation
+    """
+    owns_engine = engine is None
+    if owns_engine:
+        engine = CaptureEngine()
+    
+    try:
+        frame = engine.grab_monitor()
+    except Exception as e:
+        print(f"❌ Erreur lors de la capture d'écran: {e}")
+        return None, None
+    finally:
+        if owns_engine:
+            engine.close()
+    
+    print("📸 Écran figé, mode sélection activé...")
+    return select_from_frame(frame)
+
+
+def select_from_frame(frame):
+    """
+    Affiche une frame déjà capturée et découpe la zone sélectionnée dessus
+    
+    Args:
+        frame: CapturedFrame couvrant l'écran de sélection
+        
+    Returns:
+        tuple (PIL.Image, bbox) ou (None, None) si annulation
+    """
+    background = frame.to_pil()
+    if frame.scale != 1:
+        # Frame sous-échantillonnée: l'afficher à la taille de l'écran
+        background = background.resize(
+            (frame.bbox[2] - frame.bbox[0], frame.bbox[3] - frame.bbox[1])
+        )
+    
+    selector = ScreenshotSelector(background=background)
+    selection = selector.select_area()
+    
+    if selection is None:
+        print("⚠️ Sélection annulée")
+        return None, None
+    
+    # La fenêtre de sélection couvre l'écran de la frame: décaler vers l'écran
+    left, top = frame.bbox[0], frame.bbox[1]
+    bbox = (selection[0] + left, selection[1] + top,
+            selection[2] + left, selection[3] + top)
+    print(f"✅ Zone sélectionnée: {bbox}")
+    
+    img = frame.crop(bbox).to_pil()
+    print(f"✅ Image découpée: {img.size[0]}x{img.size[1]} pixels")
+    return img, bbox
@@ -0,0 +1,151 @@
+"""
+Moteur Tesseract in-process via tesserocr (API C de Tesseract)
+Évite de lancer un processus tesseract et de recharger les modèles à chaque capture
+"""
+import os
+import queue
+import threading
+
+
+TSV_COLUMNS = (
+    'level', 'page_num', 'block_num', 'par_num', 'line_num', 'word_num',
+    'left', 'top', 'width', 'height', 'conf', 'text'
+)
+
+
+def parse_tsv(tsv):
+    """
+    Convertit une sortie TSV Tesseract au format de pytesseract.image_to_data (Output.DICT)
+
+    Args:
+        tsv: Texte TSV (avec ou sans ligne d'en-tête)
+
+    Returns:
+        dict: {colonne: [valeurs]}
+    """
+    data = {column: [] for column in TSV_COLUMNS}
+    int_columns = TSV_COLUMNS[:10]
+
+    for row in tsv.splitlines():
+        fields = row.split('\t')
+        if len(fields) < 11 or fields[0] == 'level':
+            continue
+        if len(fields) == 11:
+            fields.append('')
+
+        for column, value in zip(int_columns, fields):
+            data[column].append(int(value))
+        data['conf'].append(float(fields[10]))
+        data['text'].append(fields[11])
+
+    return data
+
+
+class TesserocrEngine:
+    """
+    Instances TessBaseAPI gardées chaudes, une réserve par combinaison de langues
+
+    Une instance TessBaseAPI n'est pas thread-safe: chaque appel en emprunte
+    une (ou en crée une) puis la rend à la réserve.
+    """
+
+    def __init__(self, tessdata_path=None):
+        """
+        Initialise le moteur
+
+        Args:
+            tessdata_path: Dossier tessdata (optionnel, sinon TESSDATA_PREFIX / défaut tesserocr)
+
+        Raises:
+            ImportError: Si tesserocr n'est pas installé
+        """
+        import tesserocr
+
+        self._tesserocr = tesserocr
+        self.tessdata_path = tessdata_path
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def tessdata_from_cmd(tesseract_cmd):
+        """
+        Déduit le dossier tessdata à côté de l'exécutable tesseract (installation Windows)
+
+        Returns:
+            str ou None
+        """
+        if not tesseract_cmd or not os.path.isabs(tesseract_cmd):
+            return None
+        path = os.path.join(os.path.dirname(tesseract_cmd), 'tessdata')
+        return path if os.path.isdir(path) else None
+
+    def _create_api(self, lang_string):
+        """Crée et initialise une TessBaseAPI (chargement des traineddata)"""
+        tesserocr = self._tesserocr
+        kwargs = {
+            'lang': lang_string,
+            'psm': tesserocr.PSM.SINGLE_BLOCK,  # équivalent --psm 6
+            'oem': tesserocr.OEM.DEFAULT,  # équivalent --oem 3
+        }
+        if self.tessdata_path:
+            kwargs['path'] = self.tessdata_path
+        return tesserocr.PyTessBaseAPI(**kwargs)
+
+    def _acquire(self, lang_string):
+        """Emprunte une instance initialisée pour ces langues"""
+        with self._lock:
+            pool = self._pools.setdefault(lang_string, queue.LifoQueue())
+        try:
+            return pool.get_nowait()
+        except queue.Empty:
+            return self._create_api(lang_string)
+
+    def _release(self, lang_string, api):
+        """Rend une instance à la réserve"""
+        self._pools[lang_string].put(api)
+
+    def warm_up(self, lang_string):
+        """Précharge une instance pour ces langues (au démarrage)"""
+        self._release(lang_string, self._acquire(lang_string))
+
+    def image_to_data(self, image, lang_string, psm=None):
+        """
+        OCR d'une image en mémoire
+
+        Args:
+            image: PIL.Image
+            lang_string: Langues Tesseract (ex: 'jpn+eng')
+            psm: Mode de segmentation de page (optionnel, sinon SINGLE_BLOCK)
+
+        Returns:
+            dict: Même format que pytesseract.image_to_data(output_type=Output.DICT)
+        """
+        api = self._acquire(lang_string)
+        try:
+            if psm is not None:
+                api.SetPageSegMode(psm)
+
+            # Passer directement le buffer brut, sans ré-encodage de l'image
+            if image.mode not in ('RGB', 'L'):
+                image = image.convert('RGB')
+            bytes_per_pixel = 3 if image.mode == 'RGB' else 1
+            api.SetImageBytes(
+                image.tobytes(), image.width, image.height,
+                bytes_per_pixel, bytes_per_pixel * image.width
+            )
+
+            tsv = api.GetTSVText(0)
+            if psm is not None:
+                api.SetPageSegMode(self._tesserocr.PSM.SINGLE_BLOCK)
+            return parse_tsv(tsv)
+        finally:
+            api.Clear()
+            self._release(lang_string, api)
+
+    def close(self):
+        """Libère toutes les instances"""
+        with self._lock:
+            for pool in self._pools.values():
+                while not pool.empty():
+                    pool.get_nowait().End()
+            self._pools.clear()
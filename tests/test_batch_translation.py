@@ -0,0 +1,83 @@
+"""
+Tests de la traduction groupée (découpage en liste, réponse JSON du LLM)
+"""
+import json
+
+import pytest
+
+from translator import OllamaTranslator, split_list_segments
+
+
+@pytest.mark.parametrize('text', [
+    "New Game\nLoad Game\nOptions\nQuit",
+    "Potion x3\nEther x1\nPhoenix Down x2\nAntidote x5",
+    "アイテム\n装備\nステータス\nセーブ",
+    "ポーション ×3\nエーテル ×1\nフェニックスの尾 ×2",
+])
+def test_menus_and_inventories_are_lists(text):
+    assert split_list_segments(text) == text.splitlines()
+
+
+@pytest.mark.parametrize('text', [
+    # Répliques courtes
+    "Hey, wait!\nWhere are you going?\nI thought we were friends.",
+    "Wait.\nWho's there?\nIt's me.\nOpen the door.",
+    # Phrase coupée par le retour à la ligne
+    "I told you before\nyou never listen\nto anything I say",
+    # Japonais: lignes sans espaces, virgule et points de suspension japonais
+    "昨日の夜、村の外れで不思議な\n光を見たんだ。誰にも言って\nないけど、本当だよ。",
+    "おい、\nちょっと待って\nくれよ",
+    "そうだな…\nでも\nまだ早い",
+    "魔王の城へ行くには\n北の山を越えて\n海を渡る必要がある",
+    "你好，\n我是\n新来的",
+    # Ligne japonaise prolongée par la suivante (hiragana en début de ligne)
+    "この剣\nは伝説の\n武器だ",
+])
+def test_dialogue_is_kept_as_one_block(text):
+    assert split_list_segments(text) is None
+
+
+def test_list_lines_need_a_similar_shape():
+    assert split_list_segments("Sword\nShield\nThe Legendary Armor of Kings") is None
+    assert split_list_segments("Sword\nShield") is None
+
+
+@pytest.mark.parametrize('response, expected', [
+    ('{"1": "Épée", "2": "Bouclier", "3": "Casque"}', ["Épée", "Bouclier", "Casque"]),
+    ('["Épée", "Bouclier", "Casque"]', ["Épée", "Bouclier", "Casque"]),
+    ('{"translations": ["Épée", "Bouclier", "Casque"]}', ["Épée", "Bouclier", "Casque"]),
+    ('{"1": "Épée", "3": "  "}', ["Épée", None, None]),
+    ('["Épée", "Bouclier"]', [None, None, None]),
+    ('{"1": "Épée", "2": ', [None, None, None]),
+    ('Voici la traduction: Épée, Bouclier, Casque', [None, None, None]),
+    ('"Épée"', [None, None, None]),
+    ('{"1": ["Épée"], "2": 2, "3": null}', [None, None, None]),
+])
+def test_parse_batch(response, expected):
+    assert OllamaTranslator._parse_batch(response, 3) == expected
+
+
+class FakeAsyncClient:
+    """Répond à une traduction groupée en préfixant chaque élément reçu"""
+
+    def __init__(self):
+        self.prompts = []
+
+    def run(self, payload, channel=None, on_chunk=None, timeout=None):
+        self.prompts.append(payload['prompt'])
+        items = json.loads(payload['prompt'][payload['prompt'].index('{'):])
+        return json.dumps({number: f"FR {text}" for number, text in items.items()}, ensure_ascii=False)
+
+
+def test_batch_sends_original_text():
+    client = FakeAsyncClient()
+    config = {'ollama_url': 'http://127.0.0.1:9', 'translation_cache': {'enabled': False}}
+    translator = OllamaTranslator(config, async_client=client)
+
+    segments = ["ﾎﾟｰｼｮﾝ  ×３", "Ether x1", "Ether x1", "Shield"]
+    results = translator.translate_batch(segments)
+    translator.close()
+
+    assert len(client.prompts) == 1
+    assert json.dumps(segments[0], ensure_ascii=False) in client.prompts[0]
+    assert results == ["FR ﾎﾟｰｼｮﾝ  ×３", "FR Ether x1", "FR Ether x1", "FR Shield"]
@@ -0,0 +1,88 @@
+"""
+Tests du chargement en arrière-plan des moteurs lourds
+"""
+import time
+
+from engine_loader import EngineLoader
+
+
+class Factory:
+    """Fabrique qui échoue les `failures` premières fois"""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError("moteur cassé")
+        return object()
+
+
+def test_ready_engine_is_loaded_once():
+    factory = Factory()
+    loader = EngineLoader('test', factory)
+
+    assert loader.start() == EngineLoader.LOADING
+    assert loader.wait(1)
+    assert loader.start() == EngineLoader.READY
+    assert loader.engine is not None
+    assert factory.calls == 1
+
+
+def test_failure_is_kept_until_retry():
+    factory = Factory(failures=1)
+    loader = EngineLoader('test', factory)
+
+    loader.start()
+    assert not loader.wait(1)
+    # Chaque hotkey rappelle start(): le moteur cassé n'est pas reconstruit
+    assert loader.start() == EngineLoader.FAILED
+    assert loader.start() == EngineLoader.FAILED
+    assert factory.calls == 1
+    assert loader.engine is None
+
+    assert loader.retry() == EngineLoader.LOADING
+    assert loader.wait(1)
+    assert factory.calls == 2
+
+
+def test_failure_is_retried_after_delay():
+    factory = Factory(failures=1)
+    loader = EngineLoader('test', factory, retry_delay=0.05)
+
+    loader.start()
+    loader.wait(1)
+    assert loader.start() == EngineLoader.FAILED
+
+    time.sleep(0.06)
+    assert loader.start() == EngineLoader.LOADING
+    assert loader.wait(1)
+    assert factory.calls == 2
+
+
+class Engine:
+    """Moteur construit mais inutilisable (ex: proxy OCR sans EasyOCR)"""
+
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_rejected_engine_is_closed():
+    engines = []
+
+    def factory():
+        engines.append(Engine())
+        return engines[-1]
+
+    loader = EngineLoader('test', factory, is_usable=lambda engine: False)
+
+    loader.start()
+    assert not loader.wait(1)
+    assert loader.start() == EngineLoader.FAILED
+    assert loader.engine is None
+    assert engines[0].closed
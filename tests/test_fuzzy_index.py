@@ -0,0 +1,64 @@
+"""
+Tests de l'index de similarité (bruit OCR toléré, sens préservé)
+"""
+import pytest
+
+from fuzzy_index import MinHashIndex, edit_distance, fold_text
+from translation_cache import TranslationCache
+
+
+@pytest.fixture
+def index():
+    index = MinHashIndex()
+    texts = ["Are you ready?", "Let's go to the castle.", "You found 12 gold coins!"]
+    index.add_many(texts, texts)
+    return index
+
+
+def test_ocr_noise_is_tolerated(index):
+    item, similarity = index.query("Let’s go to the caste.")
+    assert item == "Let's go to the castle."
+    assert 0.9 <= similarity < 1
+
+    assert index.query("|et's go to the castle.")[0] == "Let's go to the castle."
+    assert index.query("« Are you ready? »") == ("Are you ready?", 1.0)
+
+
+@pytest.mark.parametrize('text', ["Are you ready.", "Are you ready!", "Are you ready", "ARE YOU READY?"])
+def test_punctuation_and_case_change_the_meaning(index, text):
+    assert index.query(text) is None
+
+
+def test_numbers_are_never_confused(index):
+    assert index.query("You found 13 gold coins!") is None
+
+
+def test_short_texts_need_min_length(index):
+    index.add("Yes!", "Yes!")
+
+    assert index.query("Yes!") is None
+
+
+def test_cjk_punctuation_is_folded():
+    assert fold_text("準備はいいか？") == fold_text("準備はいいか?")
+    assert fold_text("Wait...") == "Wait…"
+
+
+def test_edit_distance_band():
+    assert edit_distance("castle", "caste", 2) == 1
+    assert edit_distance("castle", "village", 2) == 3
+
+
+def test_stale_signatures_are_recomputed(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    key = TranslationCache.make_key("Let's go to the castle.", 'en', 'fr', 'model', 1)
+    cache = TranslationCache(path)
+    cache.put(key, "Allons au château.")
+    cache._db.execute("UPDATE translations SET signature=zeroblob(128)")
+    cache._db.execute("PRAGMA user_version=1")
+    cache.close()
+
+    cache = TranslationCache(path)
+    similar = TranslationCache.make_key("Let’s go to the caste.", 'en', 'fr', 'model', 1)
+    assert cache.get_similar(similar)[0] == "Allons au château."
+    cache.close()
@@ -0,0 +1,76 @@
+"""
+Tests de la détection d'écriture depuis les pixels et des mesures de lignes partagées
+"""
+import os
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw, ImageFont
+
+from language_detector import LanguageDetector
+from text_lines import ink_mask, otsu_threshold, segment_lines
+
+
+FONT_PATH = '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'
+
+
+def render(lines, size=28):
+    """Capture synthétique: texte noir sur fond clair"""
+    if not os.path.exists(FONT_PATH):
+        pytest.skip("police DejaVu absente")
+    font = ImageFont.truetype(FONT_PATH, size)
+    image = Image.new('RGB', (900, 20 + len(lines) * size * 2), (235, 235, 220))
+    draw = ImageDraw.Draw(image)
+    for i, line in enumerate(lines):
+        draw.text((15, 10 + i * size * 2), line, font=font, fill=(20, 20, 20))
+    return image
+
+
+def test_otsu_on_uniform_capture_has_no_ink():
+    gray = np.full((20, 30), 128, dtype=np.uint8)
+    assert not (gray < otsu_threshold(gray)).any()
+
+
+def test_otsu_separates_two_levels():
+    gray = np.full((20, 30), 200, dtype=np.uint8)
+    gray[5:8, 4:20] = 40
+    assert (ink_mask(gray) == (gray == 40)).all()
+    # Texte clair sur fond sombre: l'encre reste la classe minoritaire
+    assert (ink_mask(255 - gray) == (gray == 40)).all()
+
+
+def test_segment_lines_finds_each_band():
+    gray = np.full((60, 40), 255, dtype=np.uint8)
+    gray[5:15, 2:30] = 0
+    gray[30:42, 2:30] = 0
+    assert segment_lines(gray, padding=0) == [(5, 15), (30, 42)]
+
+
+@pytest.mark.parametrize('lines', [
+    ["The quick brown fox jumps over", "the lazy dog near the river bank"],
+    ["NEW GAME", "CONTINUE", "OPTIONS"],
+])
+def test_latin_capture_keeps_configured_cjk_language(lines):
+    languages = LanguageDetector().languages_from_image(render(lines), ['ja', 'en'])
+    assert languages == ['ja', 'en']
+
+
+@pytest.mark.parametrize('script, confidence, expected', [
+    ('cjk', 0.95, ['ja', 'en']),
+    ('hangul', 0.95, ['ko', 'en']),
+    ('cjk', 0.6, ['ja', 'fr', 'en']),
+    ('latin', 1.0, ['ja', 'fr', 'en']),
+    ('cyrillic', 1.0, ['ja', 'fr', 'en']),
+    ('uncertain', 1.0, ['ja', 'fr', 'en']),
+])
+def test_only_confident_cjk_verdict_narrows(monkeypatch, script, confidence, expected):
+    detector = LanguageDetector()
+    monkeypatch.setattr(detector, 'detect_script_from_image', lambda image: {
+        'script': script, 'confidence': confidence, 'lines': 2, 'elapsed_ms': 1.0
+    })
+    assert detector.languages_from_image(None, ['ja', 'fr', 'en']) == expected
+
+
+def test_blank_capture_keeps_configured_languages():
+    image = Image.new('RGB', (200, 80), (240, 240, 240))
+    assert LanguageDetector().languages_from_image(image, ['ja', 'en']) == ['ja', 'en']
@@ -0,0 +1,95 @@
+"""
+Tests du stabilisateur de texte (dialogues affichés lettre par lettre)
+"""
+import threading
+import time
+
+from text_stabilizer import TextStabilizer
+
+
+WINDOW = 0.05
+
+
+class Recorder:
+    """Collecte les appels de on_stable"""
+
+    def __init__(self):
+        self.calls = []
+        self.event = threading.Event()
+
+    def __call__(self, text, context, generation):
+        self.calls.append((text, context, generation))
+        self.event.set()
+
+    def wait(self, timeout=1.0):
+        fired = self.event.wait(timeout)
+        self.event.clear()
+        return fired
+
+
+def test_typewriter_text_settles_once():
+    recorder = Recorder()
+    stabilizer = TextStabilizer(recorder, stable_window=WINDOW)
+
+    for length in range(1, 12):
+        stabilizer.feed("Hello world"[:length], context=length)
+        time.sleep(WINDOW / 5)
+
+    assert recorder.wait()
+    time.sleep(WINDOW * 2)
+    assert [(text, context) for text, context, _ in recorder.calls] == [("Hello world", 11)]
+    assert stabilizer.fed == 11
+    assert stabilizer.dispatched == 1
+
+
+def test_unchanged_text_keeps_timer_running():
+    recorder = Recorder()
+    stabilizer = TextStabilizer(recorder, stable_window=WINDOW)
+
+    started = time.perf_counter()
+    stabilizer.feed("Same text")
+    for _ in range(3):
+        time.sleep(WINDOW / 4)
+        stabilizer.feed("Same text")
+
+    assert recorder.wait()
+    # Les envois identiques ne relancent pas la fenêtre
+    assert time.perf_counter() - started < WINDOW * 3
+    assert len(recorder.calls) == 1
+
+
+def test_same_text_is_not_dispatched_twice():
+    recorder = Recorder()
+    stabilizer = TextStabilizer(recorder, stable_window=WINDOW)
+
+    stabilizer.feed("Line one")
+    assert recorder.wait()
+    stabilizer.feed("Line on")
+    stabilizer.feed("Line one")
+    time.sleep(WINDOW * 3)
+
+    assert len(recorder.calls) == 1
+
+
+def test_newer_text_makes_generation_stale():
+    recorder = Recorder()
+    stabilizer = TextStabilizer(recorder, stable_window=WINDOW)
+
+    stabilizer.feed("First line")
+    assert recorder.wait()
+    generation = recorder.calls[0][2]
+    assert stabilizer.is_current(generation)
+
+    stabilizer.feed("Second line")
+    assert not stabilizer.is_current(generation)
+
+
+def test_reset_cancels_pending_text():
+    recorder = Recorder()
+    stabilizer = TextStabilizer(recorder, stable_window=WINDOW)
+
+    stabilizer.feed("Pending")
+    stabilizer.reset()
+
+    assert not recorder.wait(WINDOW * 3)
+    assert recorder.calls == []
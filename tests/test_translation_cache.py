@@ -0,0 +1,87 @@
+"""
+Tests du cache de traductions (LRU mémoire, SQLite, éviction)
+"""
+from fuzzy_index import MinHashIndex
+from translation_cache import TranslationCache
+
+
+def key(text):
+    return TranslationCache.make_key(text, 'en', 'fr', 'model', 1)
+
+
+def test_hit_and_miss_counts(tmp_path):
+    cache = TranslationCache(str(tmp_path / 'cache.sqlite3'), fuzzy_threshold=0)
+
+    assert cache.get(key("Open the door")) is None
+    cache.put(key("Open the door"), "Ouvre la porte")
+    assert cache.get(key("Open  the\ndoor")) == "Ouvre la porte"
+
+    stats = cache.stats
+    assert stats['memory_hits'] == 1
+    assert stats['misses'] == 1
+    cache.close()
+
+
+def test_translations_survive_restart(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    cache = TranslationCache(path)
+    cache.put(key("Open the door"), "Ouvre la porte")
+    cache.close()
+
+    cache = TranslationCache(path)
+    assert cache.get(key("Open the door")) == "Ouvre la porte"
+    assert cache.stats['disk_hits'] == 1
+    cache.close()
+
+
+def test_memory_only_cache_evicts_least_recent():
+    cache = TranslationCache(None, memory_entries=2)
+    cache.put(key("one"), "un")
+    cache.put(key("two"), "deux")
+    cache.get(key("one"))
+    cache.put(key("three"), "trois")
+
+    assert cache.get(key("two")) is None
+    assert cache.get(key("one")) == "un"
+
+
+def test_memory_only_index_follows_the_lru():
+    cache = TranslationCache(None, memory_entries=2)
+    for text in ("Let's go to the castle", "Open the wooden door", "Talk to the old merchant"):
+        cache.put(key(text), f"traduction de {text}")
+
+    assert len(cache._indexes[key("")[1:]]) == 2
+    assert cache.get_similar(key("Let's go to the caste")) is None
+    assert cache.get_similar(key("Open the wooden dor"))[0] == "traduction de Open the wooden door"
+    assert not cache._touched
+
+
+def test_eviction_keeps_fuzzy_index_loaded(tmp_path):
+    cache = TranslationCache(str(tmp_path / 'cache.sqlite3'), max_entries=50)
+    for i in range(100):
+        cache.put(key(f"The merchant sells item number {i}"), f"traduction {i}")
+
+    context = key("")[1:]
+    index = cache._indexes[context]
+    assert cache.evictions == 55
+    # Index mis à jour sur place, pas rechargé depuis le disque
+    assert cache._indexes[context] is index
+    assert len(index) == 45
+    assert cache.get_similar(key("The rnerchant sells item number 3")) is None
+    assert cache.get_similar(key("The rnerchant sells item number 99"))[0] == "traduction 99"
+    cache.close()
+
+
+def test_index_compacts_after_removing_half():
+    index = MinHashIndex()
+    texts = [f"The merchant sells item number {i}" for i in range(100)]
+    index.add_many(texts, texts)
+
+    assert index.remove_many(texts[:40], texts[:40]) == 40
+    assert len(index) == 60
+    index.remove_many(texts[40:60], texts[40:60])
+
+    assert len(index) == 40
+    assert not index._removed
+    assert index.query(texts[10]) is None
+    assert index.query(texts[80].replace("m", "rn", 1))[0] == texts[80]
@@ -0,0 +1,60 @@
+"""
+Tests de l'identification des langues latines sur textes courts
+"""
+import pytest
+
+from language_detector import LanguageDetector
+from trigram_langid import get_profiles, identify_latin_language, trigram_keys
+
+
+UI_LABELS = ["Continue", "Quest Log", "Main Menu", "Magic Potion", "Defense", "General Store",
+             "Ultimate Bonus", "Continuar", "Defensa", "Menu principal", "Inventario", "Zaubertrank"]
+
+
+@pytest.mark.parametrize('label', UI_LABELS)
+def test_ui_labels_are_undecided(label):
+    assert get_profiles().identify(label) is None
+
+
+@pytest.mark.parametrize('text, lang', [
+    ("Where did you put the key to the tower?", 'en'),
+    ("Appuyez sur une touche pour continuer.", 'fr'),
+    ("Tu fuerza ha aumentado en dos puntos.", 'es'),
+    ("Willst du das Spiel wirklich beenden?", 'de'),
+    ("Il tuo inventario è pieno", 'it'),
+    ("Tem certeza de que deseja sair?", 'pt'),
+])
+def test_sentences_are_identified(text, lang):
+    assert get_profiles().identify(text) == lang
+
+
+def test_short_text_falls_back_to_configured_language():
+    detector = LanguageDetector('fr')
+
+    assert detector.detect_language("Continue") == ['fr']
+
+
+def test_short_text_uses_the_caller_fallback():
+    detector = LanguageDetector('en')
+
+    assert detector.detect_language("Main Menu", latin_fallback='fr') == ['fr']
+    assert detector.detect_language("Main Menu", latin_fallback='ja') == ['en']
+
+
+def test_detector_keeps_no_state_between_callers():
+    detector = LanguageDetector('en')
+
+    assert detector.detect_language("Appuyez sur une touche pour continuer.") == ['fr']
+    assert detector.detect_language("Main Menu") == ['en']
+
+
+@pytest.mark.parametrize('text', ["", "...", " "])
+def test_empty_text_is_undecided(text):
+    assert trigram_keys(text).size == 0
+    assert identify_latin_language(text) is None
+
+
+def test_non_latin_fallback_is_english():
+    detector = LanguageDetector('ja')
+
+    assert detector.detect_language("Quest Log") == ['en']
@@ -0,0 +1,81 @@
+"""
+Mesures de lignes de texte sur une capture en niveaux de gris (seuil d'Otsu, profils de projection)
+Partagées par le prétraitement OCR et la détection d'écriture depuis les pixels
+"""
+import numpy as np
+
+
+def otsu_threshold(gray):
+    """
+    Seuil global d'Otsu (histogramme 256 classes)
+
+    Args:
+        gray: numpy.ndarray uint8 en niveaux de gris
+
+    Returns:
+        int: Seuil tel que `gray < seuil` sépare les deux classes
+    """
+    histogram = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    levels = np.arange(256, dtype=np.float64)
+    weight_bg = np.cumsum(histogram)
+    weight_fg = weight_bg[-1] - weight_bg
+    cumulative_mean = np.cumsum(histogram * levels)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_bg = cumulative_mean / weight_bg
+        mean_fg = (cumulative_mean[-1] - cumulative_mean) / weight_fg
+        between = weight_bg * weight_fg * (mean_bg - mean_fg) ** 2
+    if np.isnan(between).all():
+        # Image uniforme (capture vide): aucun pixel sous le seuil
+        return int(gray.min())
+    # La classe sombre inclut le niveau trouvé
+    return int(np.nanargmax(between)) + 1
+
+
+def ink_mask(gray):
+    """
+    Pixels d'encre, texte clair ou sombre (l'encre est la classe minoritaire d'Otsu)
+
+    Args:
+        gray: numpy.ndarray uint8 en niveaux de gris
+
+    Returns:
+        numpy.ndarray booléen de même forme, True = encre
+    """
+    dark = gray < otsu_threshold(gray)
+    return dark if dark.mean() < 0.5 else ~dark
+
+
+def segment_lines(gray, min_gap=2, min_line_height=4, padding=3):
+    """
+    Découpe une zone de texte en lignes via le profil de projection horizontal
+
+    Args:
+        gray: numpy.ndarray (hauteur, largeur) en niveaux de gris
+        min_gap: Nombre minimal de lignes de pixels vides entre deux lignes de texte
+        min_line_height: Hauteur minimale d'une ligne (en dessous: bruit ignoré)
+        padding: Marge ajoutée au-dessus et en dessous de chaque ligne
+
+    Returns:
+        list: [(y1, y2)] des bandes de lignes, de haut en bas
+    """
+    ink = ink_mask(gray)
+
+    ink_rows = ink.any(axis=1).astype(np.int8)
+    edges = np.diff(np.concatenate(([0], ink_rows, [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    bands = []
+    for start, end in zip(starts, ends):
+        # Fusionner les bandes séparées par un trou trop fin (accents, points du i)
+        if bands and start - bands[-1][1] < min_gap:
+            bands[-1][1] = end
+        else:
+            bands.append([start, end])
+
+    height = gray.shape[0]
+    return [
+        (max(0, int(start) - padding), min(height, int(end) + padding))
+        for start, end in bands
+        if end - start >= min_line_height
+    ]
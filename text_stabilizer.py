@@ -0,0 +1,91 @@
+"""
+Module pour attendre que le texte OCR se stabilise avant de le traduire
+Évite de traduire chaque étape d'un dialogue affiché lettre par lettre (effet machine à écrire)
+"""
+import threading
+
+
+class TextStabilizer:
+    """Ne transmet un texte qu'une fois qu'il n'a plus changé pendant une fenêtre donnée"""
+
+    def __init__(self, on_stable, stable_window=0.6):
+        """
+        Initialise le stabilisateur
+
+        Args:
+            on_stable: Fonction appelée avec (text, context, generation) quand le texte est stable
+            stable_window: Durée (secondes) sans changement avant de considérer le texte stable
+        """
+        self.on_stable = on_stable
+        self.stable_window = stable_window
+
+        self._lock = threading.Lock()
+        self._timer = None
+        self._generation = 0
+        self._pending_text = None
+        self._pending_context = None
+        self._dispatched_text = None
+
+        # Statistiques: textes reçus vs réellement envoyés à la traduction
+        self.fed = 0
+        self.dispatched = 0
+
+    def feed(self, text, context=None):
+        """
+        Soumet le dernier résultat OCR d'une zone
+
+        Args:
+            text: Texte OCR courant
+            context: Données associées transmises telles quelles à on_stable
+        """
+        with self._lock:
+            self.fed += 1
+            if text == self._pending_text:
+                # Texte inchangé: le minuteur en cours continue
+                return
+
+            # Nouveau texte (ou texte qui grandit): tout travail en cours devient obsolète
+            self._generation += 1
+            self._pending_text = text
+            self._pending_context = context
+
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.stable_window, self._fire, args=(self._generation,))
+            self._timer.daemon = True
+            self._timer.start()
+
+    def is_current(self, generation):
+        """
+        Indique si un travail lancé pour cette génération est toujours d'actualité
+
+        Args:
+            generation: Génération reçue par on_stable
+
+        Returns:
+            bool: False si un texte plus récent est arrivé entre-temps
+        """
+        return generation == self._generation
+
+    def reset(self):
+        """Annule le minuteur en cours et invalide le travail en vol"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._generation += 1
+            self._pending_text = None
+            self._pending_context = None
+            self._dispatched_text = None
+
+    def _fire(self, generation):
+        """Fin de la fenêtre de stabilité: transmettre le texte s'il est toujours d'actualité"""
+        with self._lock:
+            if generation != self._generation or self._pending_text == self._dispatched_text:
+                return
+            text = self._pending_text
+            context = self._pending_context
+            self._dispatched_text = text
+            self.dispatched += 1
+
+        self.on_stable(text, context, generation)
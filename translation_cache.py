@@ -0,0 +1,390 @@
+"""
+Cache des traductions: LRU en mémoire devant une base SQLite persistante
+Les menus, objets et répliques qui reviennent sont traduits une seule fois
+"""
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from fuzzy_index import SIGNATURE_VERSION, MinHashIndex
+
+
+def normalize_text(text):
+    """
+    Forme canonique d'un texte pour la clé du cache (NFKC, espaces et retours à la ligne réduits)
+
+    Args:
+        text: Texte source
+
+    Returns:
+        str: Texte normalisé
+    """
+    return ' '.join(unicodedata.normalize('NFKC', text).split())
+
+
+class TranslationCache:
+    """Cache à deux niveaux: OrderedDict LRU (microsecondes) puis SQLite (survit aux redémarrages)"""
+
+    def __init__(self, path='translation_cache.sqlite3', memory_entries=1000, max_entries=100000,
+                 fuzzy_threshold=0.9):
+        """
+        Ouvre (ou crée) le cache
+
+        Args:
+            path: Fichier SQLite (None = cache en mémoire seulement)
+            memory_entries: Entrées gardées dans le LRU en mémoire
+            max_entries: Entrées maximales sur disque (les moins récemment utilisées sont supprimées)
+            fuzzy_threshold: Similarité minimale (0-1) pour réutiliser la traduction d'un texte
+                             presque identique (bruit OCR), 0 = correspondance exacte seulement
+        """
+        self.path = path
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries
+        self.fuzzy_threshold = fuzzy_threshold
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._writes = 0
+        # Clés servies par le LRU dont la date d'utilisation sur disque est à rafraîchir
+        self._touched = set()
+        # Index de similarité par contexte (langues, modèle, version du prompt), chargés à la demande
+        self._indexes = {}
+
+        # Statistiques
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.fuzzy_hits = 0
+        self.evictions = 0
+
+        if path:
+            self._open(path)
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Construit le cache depuis config.json (section translation_cache)
+
+        Returns:
+            TranslationCache, ou None si le cache est désactivé
+        """
+        cache_config = config.get('translation_cache', {})
+        if not cache_config.get('enabled', True):
+            return None
+        return cls(
+            path=cache_config.get('path', 'translation_cache.sqlite3'),
+            memory_entries=cache_config.get('memory_entries', 1000),
+            max_entries=cache_config.get('max_entries', 100000),
+            fuzzy_threshold=cache_config.get('fuzzy_threshold', 0.9)
+        )
+
+    def _open(self, path):
+        """Ouvre la base SQLite (le cache reste en mémoire seulement si elle est inutilisable)"""
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Accès depuis les threads de traduction, sérialisés par _lock
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS translations (
+                    source_text TEXT NOT NULL,
+                    source_lang TEXT NOT NULL,
+                    target_lang TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    prompt_version INTEGER NOT NULL,
+                    translation TEXT NOT NULL,
+                    last_used REAL NOT NULL,
+                    signature BLOB,
+                    PRIMARY KEY (source_text, source_lang, target_lang, model, prompt_version)
+                )
+            """)
+            columns = [row[1] for row in self._db.execute("PRAGMA table_info(translations)")]
+            if 'signature' not in columns:
+                self._db.execute("ALTER TABLE translations ADD COLUMN signature BLOB")
+            self._db.execute("CREATE INDEX IF NOT EXISTS translations_last_used ON translations (last_used)")
+            # Signatures d'une autre version de fold_text: recalculées au chargement de l'index
+            if self._db.execute("PRAGMA user_version").fetchone()[0] != SIGNATURE_VERSION:
+                self._db.execute("UPDATE translations SET signature=NULL")
+                self._db.execute(f"PRAGMA user_version={SIGNATURE_VERSION}")
+            self._db.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Cache de traduction sur disque indisponible ({path}): {e}")
+            self._db = None
+
+    @staticmethod
+    def make_key(text, source_lang, target_lang, model, prompt_version):
+        """
+        Clé du cache
+
+        Returns:
+            tuple: (texte normalisé, langue source, langue cible, modèle, version du prompt)
+        """
+        return (normalize_text(text), source_lang or '', target_lang, model, prompt_version)
+
+    def get(self, key):
+        """
+        Cherche une traduction (LRU puis disque)
+
+        Args:
+            key: Clé de make_key
+
+        Returns:
+            str: Traduction, ou None si absente
+        """
+        with self._lock:
+            translation, tier = self._lookup(key)
+            if tier == 'memory':
+                self.memory_hits += 1
+            elif tier == 'disk':
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+            return translation
+
+    def get_similar(self, key):
+        """
+        Cherche la traduction d'un texte presque identique (même contexte, quelques caractères d'écart)
+
+        Args:
+            key: Clé de make_key (absente du cache, voir get)
+
+        Returns:
+            tuple: (traduction, similarité 0-1, texte source retenu) ou None
+        """
+        if not self.fuzzy_threshold:
+            return None
+
+        with self._lock:
+            match = self._fuzzy_index(key[1:]).query(key[0], self.fuzzy_threshold)
+            if match is None:
+                return None
+
+            source_text, similarity = match
+            translation, _ = self._lookup((source_text,) + key[1:])
+            if translation is None:
+                return None
+            self.fuzzy_hits += 1
+            return translation, similarity, source_text
+
+    def _lookup(self, key):
+        """
+        Traduction mémorisée pour une clé exacte (appelé avec _lock tenu)
+
+        Returns:
+            tuple: (traduction ou None, 'memory' / 'disk' / None)
+        """
+        translation = self._memory.get(key)
+        if translation is not None:
+            self._memory.move_to_end(key)
+            if self._db is not None:
+                self._touched.add(key)
+            return translation, 'memory'
+
+        if self._db is None:
+            return None, None
+
+        try:
+            row = self._db.execute(
+                "SELECT translation FROM translations WHERE source_text=? AND source_lang=? "
+                "AND target_lang=? AND model=? AND prompt_version=?", key
+            ).fetchone()
+            if row is None:
+                return None, None
+            self._db.execute(
+                "UPDATE translations SET last_used=? WHERE source_text=? AND source_lang=? "
+                "AND target_lang=? AND model=? AND prompt_version=?", (time.time(),) + key
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Lecture du cache impossible: {e}")
+            return None, None
+
+        self._remember(key, row[0])
+        return row[0], 'disk'
+
+    def preload(self, target_lang, model, prompt_version):
+        """
+        Construit à l'avance les index de similarité des textes déjà traduits vers target_lang
+        (évite de le faire pendant la première traduction)
+
+        Args:
+            target_lang: Langue cible
+            model: Modèle de traduction
+            prompt_version: Version du prompt
+        """
+        if not self.fuzzy_threshold or self._db is None:
+            return
+        with self._lock:
+            try:
+                source_langs = [row[0] for row in self._db.execute(
+                    "SELECT DISTINCT source_lang FROM translations WHERE target_lang=? AND model=? "
+                    "AND prompt_version=?", (target_lang, model, prompt_version)
+                )]
+            except sqlite3.Error as e:
+                print(f"⚠️ Lecture du cache impossible: {e}")
+                return
+            for source_lang in source_langs:
+                self._fuzzy_index((source_lang, target_lang, model, prompt_version))
+
+    def _fuzzy_index(self, context):
+        """
+        Index de similarité des textes d'un contexte, chargé depuis le disque au premier appel
+        (signatures MinHash stockées avec les traductions, calculées ici si absentes)
+
+        Args:
+            context: (langue source, langue cible, modèle, version du prompt)
+
+        Returns:
+            MinHashIndex
+        """
+        index = self._indexes.get(context)
+        if index is not None:
+            return index
+
+        index = MinHashIndex()
+        self._indexes[context] = index
+        if self._db is None:
+            return index
+
+        start_time = time.time()
+        rows = []
+        try:
+            rows = self._db.execute(
+                "SELECT source_text, signature FROM translations WHERE source_lang=? "
+                "AND target_lang=? AND model=? AND prompt_version=?", context
+            ).fetchall()
+            texts = [source_text for source_text, _ in rows]
+            stored = [blob for _, blob in rows]
+            signatures = index.add_many(texts, texts, stored)
+            missing = [
+                (signatures[i].tobytes(), texts[i]) + context
+                for i, blob in enumerate(stored)
+                if blob != signatures[i].tobytes()
+            ]
+            if missing:
+                self._db.executemany(
+                    "UPDATE translations SET signature=? WHERE source_text=? AND source_lang=? "
+                    "AND target_lang=? AND model=? AND prompt_version=?", missing
+                )
+                self._db.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Lecture du cache impossible: {e}")
+
+        if rows:
+            print(f"💾 Index de similarité: {len(index)} texte(s) en {time.time() - start_time:.2f}s")
+        return index
+
+    def put(self, key, translation):
+        """
+        Enregistre une traduction
+
+        Args:
+            key: Clé de make_key
+            translation: Traduction à mémoriser
+        """
+        with self._lock:
+            self._remember(key, translation)
+            signature = None
+            if self.fuzzy_threshold:
+                signature = self._fuzzy_index(key[1:]).add(key[0], key[0])
+            if self._db is None:
+                return
+
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    key + (translation, time.time(), signature.tobytes() if signature is not None else None)
+                )
+                self._writes += 1
+                # Comptage complet seulement de temps en temps
+                if self._writes % 100 == 0:
+                    self._flush_touched()
+                    self._evict()
+                self._db.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️ Écriture du cache impossible: {e}")
+
+    def _remember(self, key, translation):
+        """Ajoute au LRU en mémoire (appelé avec _lock tenu)"""
+        self._memory[key] = translation
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            dropped, _ = self._memory.popitem(last=False)
+            # Sans base, le LRU est le cache entier: le texte oublié quitte aussi l'index
+            if self._db is None:
+                index = self._indexes.get(dropped[1:])
+                if index is not None:
+                    index.remove_many([dropped[0]], [dropped[0]])
+
+    def _flush_touched(self):
+        """Reporte sur disque l'utilisation des entrées servies par le LRU (appelé avec _lock tenu)"""
+        if not self._touched:
+            return
+        now = time.time()
+        self._db.executemany(
+            "UPDATE translations SET last_used=? WHERE source_text=? AND source_lang=? "
+            "AND target_lang=? AND model=? AND prompt_version=?",
+            [(now,) + key for key in self._touched]
+        )
+        self._touched.clear()
+
+    def _evict(self):
+        """Supprime les entrées les moins récemment utilisées au-delà de max_entries (90% conservés)"""
+        count = self._db.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        if count <= self.max_entries:
+            return
+        excess = count - int(self.max_entries * 0.9)
+        evicted = self._db.execute(
+            "SELECT rowid, source_text, source_lang, target_lang, model, prompt_version "
+            "FROM translations ORDER BY last_used LIMIT ?", (excess,)
+        ).fetchall()
+        self._db.executemany("DELETE FROM translations WHERE rowid=?", [(row[0],) for row in evicted])
+        self.evictions += len(evicted)
+
+        # Textes supprimés retirés des index chargés (sans tout recharger sous le verrou)
+        by_context = {}
+        for _, source_text, *context in evicted:
+            by_context.setdefault(tuple(context), []).append(source_text)
+        for context, texts in by_context.items():
+            index = self._indexes.get(context)
+            if index is not None:
+                index.remove_many(texts, texts)
+
+    @property
+    def stats(self):
+        """Statistiques d'utilisation"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        hits = self.memory_hits + self.disk_hits + self.fuzzy_hits
+        return {
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'fuzzy_hits': self.fuzzy_hits,
+            'misses': self.misses - self.fuzzy_hits,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'memory_entries': len(self._memory),
+            'evictions': self.evictions,
+        }
+
+    def close(self):
+        """Enregistre et ferme la base"""
+        with self._lock:
+            if self._db is not None:
+                try:
+                    self._flush_touched()
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    print(f"⚠️ Écriture du cache impossible: {e}")
+                self._db.close()
+                self._db = None
+        stats = self.stats
+        if self.memory_hits + self.disk_hits + self.misses:
+            print(f"💾 Cache de traduction: {stats['hit_rate']:.0%} de réussite "
+                  f"({stats['memory_hits']} mémoire, {stats['disk_hits']} disque, "
+                  f"{stats['fuzzy_hits']} approchée(s), {stats['misses']} absentes)")
@@ -1,22 +1,112 @@
 """
 Module pour la traduction via Ollama
 """
-import requests
+import asyncio
 import json
+import re
+import requests
 import time
 
+import aiohttp
+
+from ollama_async import AsyncOllamaClient, CancelledError, OllamaHTTPError
+from ollama_client import OllamaClient
+from translation_cache import TranslationCache
+
+
+# À incrémenter à chaque modification du prompt (invalide les traductions en cache)
+PROMPT_VERSION = 1
+
+# Fin de ligne qui annonce une suite (phrase coupée par le retour à la ligne),
+# dont les particules japonaises qui ne terminent jamais un libellé (行くには, 越えて)
+_CONTINUATION = re.compile(r"(?:[,;:\-–、，…てでにはをがともへば]|\.\.\.)$")
+# Fin de phrase (réplique plutôt qu'élément de liste)
+_SENTENCE_END = re.compile(r"[.!?。！？」』]$")
+# Début de ligne japonaise qui prolonge la précédente: hiragana (particule, fin de verbe), ponctuation
+_CONTINUED_CJK = re.compile(r"^[\u3041-\u309f、。，」』]")
+# Kana et idéogrammes: écritures sans espaces, longueur comptée en caractères
+_CJK = re.compile(r"[\u3040-\u30ff\u3400-\u9fff\uff66-\uff9f]")
+
+
+def _line_length(line):
+    """
+    Longueur d'une ligne pour la comparer aux autres éléments d'une liste
+    
+    Args:
+        line: Ligne OCR
+        
+    Returns:
+        tuple: (longueur, True si comptée en caractères CJK, False si en mots)
+    """
+    if _CJK.search(line):
+        return len(''.join(line.split())), True
+    return len(line.split()), False
+
+
+def split_list_segments(text, min_segments=3, max_words=6, max_chars=12):
+    """
+    Découpe un texte OCR en éléments indépendants s'il ressemble à une liste
+    (inventaire, colonne de menu): plusieurs lignes courtes, de même forme, qui ne se
+    prolongent pas et ne se terminent pas comme des phrases
+    
+    Une réplique découpée par erreur serait traduite ligne à ligne, hors contexte:
+    au moindre doute le texte reste un seul bloc.
+    
+    Args:
+        text: Texte OCR (une ligne par élément)
+        min_segments: Nombre minimal de lignes pour une liste
+        max_words: Nombre maximal de mots par ligne
+        max_chars: Nombre maximal de caractères par ligne en japonais ou chinois (sans espaces)
+        
+    Returns:
+        list: Lignes de la liste, ou None si le texte ressemble à des phrases
+    """
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    if len(lines) < min_segments:
+        return None
+    
+    lengths = [_line_length(line) for line in lines]
+    if any(length > (max_chars if cjk else max_words) for length, cjk in lengths):
+        return None
+    if any(_CONTINUATION.search(line) for line in lines):
+        return None
+    # Ligne sans fin de phrase prolongée par la suivante: réplique coupée par le retour à la ligne
+    if any(not _SENTENCE_END.search(line) and (following[0].islower() or _CONTINUED_CJK.match(following))
+           for line, following in zip(lines, lines[1:])):
+        return None
+    
+    # Preuve de liste: les éléments ne finissent pas comme des phrases et ont la même forme
+    if sum(bool(_SENTENCE_END.search(line)) for line in lines) > len(lines) // 4:
+        return None
+    if len({cjk for _, cjk in lengths}) > 1:
+        return None
+    counts = [length for length, _ in lengths]
+    spread = max_chars // 2 if lengths[0][1] else max_words // 2
+    if max(counts) - min(counts) > spread:
+        return None
+    return lines
+
 
 class OllamaTranslator:
     """Gère les traductions via l'API Ollama"""
     
-    def __init__(self, config):
+    def __init__(self, config, client=None, cache=None, async_client=None):
         """
         Initialise le traducteur
         
         Args:
             config: Dict avec ollama_url, ollama_model, source_lang, target_lang
+            client: OllamaClient partagé (optionnel, créé depuis la config sinon)
+            cache: TranslationCache (optionnel, créé depuis la section translation_cache sinon)
+            async_client: AsyncOllamaClient partagé pour les générations (optionnel, créé depuis la config sinon)
         """
-        self.url = config.get('ollama_url', 'http://localhost:11434')
+        self.client = client or OllamaClient.from_config(config)
+        self.async_client = async_client or AsyncOllamaClient.from_config(config)
+        # Clients créés ici, fermés par close() (les clients partagés restent à leur propriétaire)
+        self._owns_client = client is None
+        self._owns_async_client = async_client is None
+        self.cache = cache if cache is not None else TranslationCache.from_config(config)
+        self.url = self.client.url
         self.model = config.get('ollama_model', 'gemma2:2b')
         self.source_lang = config.get('source_lang', 'en')
         self.target_lang = config.get('target_lang', 'fr')
@@ -48,7 +138,7 @@ class OllamaTranslator:
             bool: True si OK, False sinon
         """
         try:
-            response = requests.get(f"{self.url}/api/tags", timeout=5)
+            response = self.client.get('/api/tags', timeout=5)
             
             if response.status_code == 200:
                 models = response.json().get('models', [])
@@ -76,16 +166,73 @@ class OllamaTranslator:
             print(f"❌ Erreur lors du test de connexion: {e}")
             return False
     
-    def translate(self, text, source_lang=None):
+    def _lookup_cache(self, text, source_lang):
+        """
+        Cherche une traduction déjà faite (exacte puis approchée)
+        
+        Returns:
+            tuple: (clé du cache ou None si cache désactivé, traduction ou None)
+        """
+        if self.cache is None:
+            return None, None
+        
+        # Textes récurrents (menus, objets, répliques): pas d'appel au LLM
+        cache_key = self.cache.make_key(text, source_lang, self.target_lang, self.model, PROMPT_VERSION)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            print(f"💾 Traduction en cache: '{cached[:100]}{'...' if len(cached) > 100 else ''}'")
+            return cache_key, cached
+        
+        # Même texte à un ou deux caractères OCR près (l/I, ponctuation parasite)
+        similar = self.cache.get_similar(cache_key)
+        if similar is not None:
+            cached, similarity, source_text = similar
+            print(f"💾 Traduction en cache (similarité {similarity:.0%} avec '{source_text[:50]}'): "
+                  f"'{cached[:100]}{'...' if len(cached) > 100 else ''}'")
+            return cache_key, cached
+        
+        return cache_key, None
+    
+    def _build_prompt(self, text, source_lang):
+        """
+        Prompt de traduction (toute modification doit incrémenter PROMPT_VERSION)
+        
+        Returns:
+            tuple: (prompt, nom de la langue source, nom de la langue cible)
+        """
+        source_lang_name = self.lang_names.get(source_lang, source_lang)
+        target_lang_name = self.lang_names.get(self.target_lang, self.target_lang)
+        
+        # Prompt optimisé pour la traduction avec langue source explicite
+        prompt = f"Translate the following {source_lang_name} text to {target_lang_name}. Output ONLY the translation, no explanations:\n\n{text}"
+        return prompt, source_lang_name, target_lang_name
+    
+    def _payload(self, prompt, stream):
+        """Corps de la requête /api/generate"""
+        return {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": stream,
+            "options": {
+                "temperature": 0.3,  # Plus déterministe pour la traduction
+                "top_p": 0.9
+            }
+        }
+    
+    def translate(self, text, source_lang=None, channel=None):
         """
         Traduit un texte
         
         Args:
             text: Texte à traduire
             source_lang: Langue source (optionnel, auto-détecté si fourni)
+            channel: Canal de la requête: une traduction plus récente du même canal annule celle-ci (optionnel)
             
         Returns:
             str: Texte traduit ou message d'erreur
+            
+        Raises:
+            CancelledError: Remplacée par une traduction plus récente du même canal
         """
         if not text or not text.strip():
             return "⚠️ Aucun texte à traduire"
@@ -94,11 +241,11 @@ class OllamaTranslator:
         if source_lang is None:
             source_lang = self.source_lang
         
-        source_lang_name = self.lang_names.get(source_lang, source_lang)
-        target_lang_name = self.lang_names.get(self.target_lang, self.target_lang)
+        cache_key, cached = self._lookup_cache(text, source_lang)
+        if cached is not None:
+            return cached
         
-        # Prompt optimisé pour la traduction avec langue source explicite
-        prompt = f"Translate the following {source_lang_name} text to {target_lang_name}. Output ONLY the translation, no explanations:\n\n{text}"
+        prompt, source_lang_name, target_lang_name = self._build_prompt(text, source_lang)
         
         print(f"🌐 Traduction en cours ({source_lang_name} → {target_lang_name})...")
         print(f"   Texte: '{text[:50]}{'...' if len(text) > 50 else ''}'")
@@ -106,101 +253,265 @@ class OllamaTranslator:
         start_time = time.time()
         
         try:
-            response = requests.post(
-                f"{self.url}/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.3,  # Plus déterministe pour la traduction
-                        "top_p": 0.9
-                    }
-                },
-                timeout=30
-            )
+            translation = self.async_client.run(
+                self._payload(prompt, stream=False), channel=channel, timeout=30
+            ).strip()
             
-            if response.status_code == 200:
-                result = response.json()
-                translation = result.get('response', '').strip()
-                
-                elapsed = time.time() - start_time
-                print(f"⏱️ Traduction terminée en {elapsed:.2f}s")
-                print(f"✅ Résultat: '{translation[:100]}{'...' if len(translation) > 100 else ''}'")
-                
-                if translation:
-                    return translation
-                else:
-                    return "⚠️ Aucune traduction reçue"
+            elapsed = time.time() - start_time
+            print(f"⏱️ Traduction terminée en {elapsed:.2f}s")
+            print(f"✅ Résultat: '{translation[:100]}{'...' if len(translation) > 100 else ''}'")
+            
+            if translation:
+                if cache_key is not None:
+                    self.cache.put(cache_key, translation)
+                return translation
             else:
-                error_msg = f"Erreur Ollama (code {response.status_code})"
-                print(f"❌ {error_msg}")
-                try:
-                    error_detail = response.json()
-                    print(f"   Détail: {error_detail}")
-                except:
-                    pass
-                return f"❌ {error_msg}"
+                return "⚠️ Aucune traduction reçue"
                 
-        except requests.exceptions.Timeout:
+        except CancelledError:
+            print("⏹️ Traduction annulée (requête plus récente)")
+            raise
+        except asyncio.TimeoutError:
             print("❌ Timeout: Ollama met trop de temps à répondre")
             return "⏱️ Timeout: traduction trop longue"
-        except requests.exceptions.ConnectionError:
+        except aiohttp.ClientConnectionError:
             print("❌ Impossible de se connecter à Ollama")
             return "❌ Erreur: Ollama non accessible"
+        except OllamaHTTPError as e:
+            print(f"❌ {e}")
+            if e.detail:
+                print(f"   Détail: {e.detail}")
+            return f"❌ {e}"
         except Exception as e:
             print(f"❌ Erreur inattendue: {e}")
             return f"❌ Erreur: {str(e)}"
     
-    def translate_streaming(self, text, callback):
+    def translate_streaming(self, text, callback, source_lang=None, channel=None):
         """
         Traduit avec streaming (pour une UX plus réactive)
         
         Args:
             text: Texte à traduire
-            callback: Fonction appelée avec chaque chunk de traduction
+            callback: Fonction appelée avec chaque chunk de traduction (depuis le thread du client Ollama)
+            source_lang: Langue source (optionnel, langue de la config sinon)
+            channel: Canal de la requête: une traduction plus récente du même canal annule celle-ci (optionnel)
             
         Returns:
-            str: Traduction complète
+            str: Traduction complète ou message d'erreur
+            
+        Raises:
+            CancelledError: Remplacée par une traduction plus récente du même canal
         """
         if not text or not text.strip():
             return "⚠️ Aucun texte à traduire"
         
-        target_lang_name = self.lang_names.get(self.target_lang, self.target_lang)
-        prompt = f"Translate this to {target_lang_name}, only output the translation:\n\n{text}"
+        if source_lang is None:
+            source_lang = self.source_lang
+        
+        # Traduction en cache: livrée d'un seul bloc
+        cache_key, cached = self._lookup_cache(text, source_lang)
+        if cached is not None:
+            if callback:
+                callback(cached)
+            return cached
+        
+        prompt, source_lang_name, target_lang_name = self._build_prompt(text, source_lang)
         
-        print(f"🌐 Traduction streaming en cours...")
+        print(f"🌐 Traduction streaming en cours ({source_lang_name} → {target_lang_name})...")
+        print(f"   Texte: '{text[:50]}{'...' if len(text) > 50 else ''}'")
+        
+        start_time = time.time()
+        first_token_time = None
+        
+        def on_chunk(text_chunk):
+            nonlocal first_token_time
+            if first_token_time is None:
+                first_token_time = time.time() - start_time
+            if callback:
+                callback(text_chunk)
         
         try:
-            response = requests.post(
-                f"{self.url}/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": True,
-                    "options": {
-                        "temperature": 0.3,
-                        "top_p": 0.9
-                    }
-                },
-                stream=True,
-                timeout=30
-            )
-            
-            full_translation = ""
+            translation = self.async_client.run(
+                self._payload(prompt, stream=True), channel=channel, on_chunk=on_chunk, timeout=30
+            ).strip()
             
-            for line in response.iter_lines():
-                if line:
-                    chunk = json.loads(line)
-                    text_chunk = chunk.get('response', '')
-                    full_translation += text_chunk
-                    
-                    if callback:
-                        callback(text_chunk)
+            elapsed = time.time() - start_time
+            print(f"⏱️ Traduction streaming terminée en {elapsed:.2f}s "
+                  f"(premier token {first_token_time or elapsed:.2f}s)")
+            print(f"✅ Résultat: '{translation[:100]}{'...' if len(translation) > 100 else ''}'")
             
-            print(f"✅ Traduction streaming terminée")
-            return full_translation.strip()
+            if not translation:
+                return "⚠️ Aucune traduction reçue"
+            if cache_key is not None:
+                self.cache.put(cache_key, translation)
+            return translation
             
+        except CancelledError:
+            print("⏹️ Traduction annulée (requête plus récente)")
+            raise
+        except asyncio.TimeoutError:
+            print("❌ Timeout: Ollama met trop de temps à répondre")
+            return "⏱️ Timeout: traduction trop longue"
+        except aiohttp.ClientConnectionError:
+            print("❌ Impossible de se connecter à Ollama")
+            return "❌ Erreur: Ollama non accessible"
+        except OllamaHTTPError as e:
+            print(f"❌ {e}")
+            return f"❌ {e}"
         except Exception as e:
             print(f"❌ Erreur streaming: {e}")
             return f"❌ Erreur: {str(e)}"
+    
+    def _build_batch_prompt(self, segments, source_lang):
+        """
+        Prompt de traduction groupée: éléments numérotés dans un objet JSON, réponse au même format
+        
+        Returns:
+            tuple: (prompt, nom de la langue source, nom de la langue cible)
+        """
+        source_lang_name = self.lang_names.get(source_lang, source_lang)
+        target_lang_name = self.lang_names.get(self.target_lang, self.target_lang)
+        
+        numbered = json.dumps({str(i): segment for i, segment in enumerate(segments, 1)}, ensure_ascii=False)
+        prompt = (
+            f"Translate each numbered {source_lang_name} item below to {target_lang_name}. "
+            f"The items are independent (inventory, menu). Answer ONLY with a JSON object "
+            f"mapping each number to its translation, with exactly the same numbers:\n\n{numbered}"
+        )
+        return prompt, source_lang_name, target_lang_name
+    
+    @staticmethod
+    def _parse_batch(response_text, count):
+        """
+        Relit la réponse d'une traduction groupée
+        
+        Args:
+            response_text: Réponse du modèle (objet JSON numéroté, ou liste)
+            count: Nombre d'éléments envoyés
+            
+        Returns:
+            list: Traduction de chaque élément, None pour ceux absents ou vides
+        """
+        try:
+            data = json.loads(response_text)
+        except ValueError:
+            return [None] * count
+        
+        # Liste seule ou enveloppée ({"translations": [...]}): acceptée si la longueur correspond
+        if isinstance(data, dict) and len(data) == 1:
+            inner = next(iter(data.values()))
+            if isinstance(inner, (list, dict)):
+                data = inner
+        if isinstance(data, list):
+            data = {str(i): value for i, value in enumerate(data, 1)} if len(data) == count else {}
+        if not isinstance(data, dict):
+            return [None] * count
+        
+        results = []
+        for i in range(1, count + 1):
+            value = data.get(str(i))
+            results.append(value.strip() or None if isinstance(value, str) else None)
+        return results
+    
+    def translate_batch(self, segments, source_lang=None, channel=None):
+        """
+        Traduit plusieurs textes courts et indépendants en un seul appel au LLM
+        
+        Seuls les éléments absents du cache sont envoyés; ceux que la réponse
+        ne permet pas d'aligner sont retraduits un par un.
+        
+        Args:
+            segments: Liste de textes (ex: lignes d'un inventaire)
+            source_lang: Langue source (optionnel, langue de la config sinon)
+            channel: Canal de la requête: une traduction plus récente du même canal annule celle-ci (optionnel)
+            
+        Returns:
+            list: Traduction (ou message d'erreur) de chaque élément, dans le même ordre
+            
+        Raises:
+            CancelledError: Remplacée par une traduction plus récente du même canal
+        """
+        if source_lang is None:
+            source_lang = self.source_lang
+        
+        results = [None] * len(segments)
+        # Texte normalisé (doublons regroupés) → (clé du cache, texte d'origine, positions où il apparaît)
+        pending = {}
+        for position, segment in enumerate(segments):
+            if not segment or not segment.strip():
+                results[position] = ""
+                continue
+            cache_key, cached = self._lookup_cache(segment, source_lang)
+            if cached is not None:
+                results[position] = cached
+                continue
+            normalized = cache_key[0] if cache_key is not None else segment.strip()
+            pending.setdefault(normalized, (cache_key, segment.strip(), []))[2].append(position)
+        
+        if not pending:
+            return results
+        if len(pending) == 1:
+            _, text, positions = next(iter(pending.values()))
+            translation = self.translate(text, source_lang=source_lang, channel=channel)
+            for position in positions:
+                results[position] = translation
+            return results
+        
+        # Le LLM reçoit le texte d'origine, la forme normalisée ne sert qu'au cache
+        texts = [text for _, text, _ in pending.values()]
+        prompt, source_lang_name, target_lang_name = self._build_batch_prompt(texts, source_lang)
+        
+        print(f"🌐 Traduction groupée de {len(texts)} élément(s) ({source_lang_name} → {target_lang_name})"
+              f", {len(segments) - sum(len(p) for _, _, p in pending.values())} en cache...")
+        
+        start_time = time.time()
+        
+        try:
+            payload = self._payload(prompt, stream=False)
+            payload["format"] = "json"
+            translations = self._parse_batch(
+                self.async_client.run(payload, channel=channel, timeout=30), len(texts)
+            )
+        except CancelledError:
+            print("⏹️ Traduction annulée (requête plus récente)")
+            raise
+        except asyncio.TimeoutError:
+            print("❌ Timeout: Ollama met trop de temps à répondre")
+            translations = ["⏱️ Timeout: traduction trop longue"] * len(texts)
+        except aiohttp.ClientConnectionError:
+            print("❌ Impossible de se connecter à Ollama")
+            translations = ["❌ Erreur: Ollama non accessible"] * len(texts)
+        except OllamaHTTPError as e:
+            print(f"❌ {e}")
+            translations = [f"❌ {e}"] * len(texts)
+        except Exception as e:
+            print(f"❌ Erreur inattendue: {e}")
+            translations = [None] * len(texts)
+        
+        aligned = sum(translation is not None for translation in translations)
+        print(f"⏱️ Traduction groupée terminée en {time.time() - start_time:.2f}s "
+              f"({aligned}/{len(texts)} alignée(s))")
+        
+        for (cache_key, text, positions), translation in zip(pending.values(), translations):
+            if translation is None:
+                # Réponse illisible ou élément manquant: traduction individuelle
+                translation = self.translate(text, source_lang=source_lang, channel=channel)
+            elif cache_key is not None and not translation.startswith(('❌', '⏱️')):
+                self.cache.put(cache_key, translation)
+            for position in positions:
+                results[position] = translation
+        return results
+    
+    def preload_cache(self):
+        """Prépare l'index de similarité du cache (appelé dans un thread au démarrage)"""
+        if self.cache is not None:
+            self.cache.preload(self.target_lang, self.model, PROMPT_VERSION)
+    
+    def close(self):
+        """Ferme le cache de traduction et les clients Ollama créés par le traducteur"""
+        if self.cache is not None:
+            self.cache.close()
+        if self._owns_async_client:
+            self.async_client.close()
+        if self._owns_client:
+            self.client.close()
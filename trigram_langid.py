@@ -0,0 +1,188 @@
+"""
+Identification des langues à écriture latine par trigrammes de caractères
+Profils compacts (clés uint64 triées + log-probabilités float16) générés par build_langid.py
+"""
+import os
+
+import numpy as np
+
+
+# Profils embarqués (voir build_langid.py pour les régénérer)
+PROFILES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'langid', 'trigrams.npz')
+
+
+def text_codes(text):
+    """
+    Normalise un texte en points de code: minuscules, lettres latines seulement,
+    autres caractères réduits à un espace unique, espace en début et en fin
+
+    Args:
+        text: Texte à normaliser
+
+    Returns:
+        numpy.ndarray uint64 des points de code
+    """
+    codes = np.frombuffer(text.lower().encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    if not codes.size:
+        return np.array([0x20, 0x20], dtype=np.uint64)
+    letters = ((codes >= 0x61) & (codes <= 0x7A)) | ((codes >= 0xDF) & (codes <= 0x24F) & (codes != 0xF7))
+    codes = np.where(letters, codes, 0x20)
+
+    # Séparateurs consécutifs fusionnés
+    keep = letters.copy()
+    keep[1:] |= letters[:-1]
+    keep[0] = letters[0]
+    codes = codes[keep]
+    if codes.size and codes[-1] == 0x20:
+        codes = codes[:-1]
+
+    return np.concatenate(([0x20], codes, [0x20])).astype(np.uint64)
+
+
+def trigram_keys(text):
+    """
+    Trigrammes d'un texte encodés en entiers (3 points de code de 21 bits)
+
+    Args:
+        text: Texte à analyser
+
+    Returns:
+        numpy.ndarray uint64 (un élément par trigramme, doublons conservés)
+    """
+    codes = text_codes(text)
+    if codes.size < 3:
+        return np.empty(0, dtype=np.uint64)
+    return (codes[:-2] << np.uint64(42)) | (codes[1:-1] << np.uint64(21)) | codes[2:]
+
+
+def decode_key(key):
+    """Trigramme lisible depuis sa clé (débogage, build_langid.py)"""
+    key = int(key)
+    return ''.join(chr((key >> shift) & 0x1FFFFF) for shift in (42, 21, 0))
+
+
+class TrigramProfiles:
+    """Modèle de langue par trigrammes: recherche binaire des clés et somme des log-probabilités"""
+
+    def __init__(self, keys, scores, unseen, languages):
+        """
+        Args:
+            keys: numpy.ndarray uint64 trié des trigrammes connus
+            scores: numpy.ndarray (len(keys), len(languages)) de log P(trigramme | langue)
+            unseen: numpy.ndarray (len(languages),) log-probabilité d'un trigramme inconnu
+            languages: Codes de langue (ex: ['de', 'en', 'es', 'fr', 'it', 'pt'])
+        """
+        self.keys = keys
+        self.scores = scores.astype(np.float32)
+        self.unseen = unseen.astype(np.float32)
+        self.languages = list(languages)
+
+    @classmethod
+    def load(cls, path=PROFILES_PATH):
+        """
+        Charge les profils générés par build_langid.py
+
+        Args:
+            path: Fichier .npz
+
+        Returns:
+            TrigramProfiles
+        """
+        with np.load(path) as data:
+            return cls(data['keys'], data['scores'], data['unseen'], [str(lang) for lang in data['languages']])
+
+    def scores_for(self, text):
+        """
+        Log-vraisemblance moyenne du texte pour chaque langue
+
+        Args:
+            text: Texte à analyser
+
+        Returns:
+            tuple: (numpy.ndarray des scores par langue, nombre de trigrammes)
+        """
+        trigrams = trigram_keys(text)
+        if not trigrams.size:
+            return np.zeros(len(self.languages), dtype=np.float32), 0
+
+        index = np.searchsorted(self.keys, trigrams)
+        index[index == self.keys.size] = 0
+        known = self.keys[index] == trigrams
+
+        totals = self.scores[index[known]].sum(axis=0)
+        totals += self.unseen * float(trigrams.size - known.sum())
+        return totals / trigrams.size, int(trigrams.size)
+
+    def identify(self, text, candidates=None, min_trigrams=20, min_margin=0.02,
+                 short_trigrams=30, short_margin=0.1):
+        """
+        Langue la plus probable du texte
+
+        Les libellés d'interface ("Continue", "Main Menu", "Defensa") sont partagés entre
+        langues voisines et donnent des écarts aussi nets qu'à tort: sous min_trigrams
+        (environ 3 à 4 mots) le texte reste indéterminé et l'appelant garde sa langue de repli.
+
+        Args:
+            text: Texte à analyser
+            candidates: Codes de langue autorisés (défaut: toutes les langues du modèle)
+            min_trigrams: Nombre minimal de trigrammes (texte plus court: indéterminé)
+            min_margin: Écart minimal de log-vraisemblance moyenne avec la 2e langue
+            short_trigrams: En dessous de ce nombre de trigrammes, l'écart exigé est short_margin
+            short_margin: Écart minimal pour un texte court (phrase de quelques mots)
+
+        Returns:
+            str: Code de langue, ou None si le texte est trop court ou ambigu
+        """
+        scores, count = self.scores_for(text)
+        if count < min_trigrams:
+            return None
+
+        columns = [i for i, lang in enumerate(self.languages) if candidates is None or lang in candidates]
+        if not columns:
+            return None
+        if len(columns) == 1:
+            return self.languages[columns[0]]
+
+        ranked = sorted(columns, key=lambda i: scores[i], reverse=True)
+        margin = short_margin if count < short_trigrams else min_margin
+        if scores[ranked[0]] - scores[ranked[1]] < margin:
+            return None
+        return self.languages[ranked[0]]
+
+
+_profiles = None
+_load_failed = False
+
+
+def get_profiles():
+    """
+    Profils embarqués, chargés une seule fois
+
+    Returns:
+        TrigramProfiles, ou None si le fichier est absent ou illisible
+    """
+    global _profiles, _load_failed
+    if _profiles is None and not _load_failed:
+        try:
+            _profiles = TrigramProfiles.load()
+        except (OSError, KeyError, ValueError) as e:
+            _load_failed = True
+            print(f"⚠️ Profils de langue indisponibles ({e}): langues latines → anglais")
+    return _profiles
+
+
+def identify_latin_language(text, candidates=None):
+    """
+    Précise la langue d'un texte en écriture latine
+
+    Args:
+        text: Texte à analyser
+        candidates: Codes de langue autorisés (optionnel)
+
+    Returns:
+        str: Code de langue, ou None si indéterminé
+    """
+    profiles = get_profiles()
+    if profiles is None:
+        return None
+    return profiles.identify(text, candidates)
@@ -2,26 +2,45 @@
 Module pour la traduction via modèle vision multimodal
 Utilise un modèle vision (comme gemma3:4b) pour extraire et traduire le texte directement depuis l'image
 """
+import asyncio
 import base64
 import io
 import requests
+import aiohttp
 from PIL import Image
 
+from ollama_async import AsyncOllamaClient, CancelledError, OllamaHTTPError
+from ollama_client import OllamaClient
+
 
 class VisionTranslator:
     """Traducteur utilisant un modèle vision multimodal via Ollama"""
     
-    def __init__(self, model_name="gemma3:4b", ollama_url="http://localhost:11434"):
+    def __init__(self, model_name="gemma3:4b", ollama_url="http://localhost:11434", client=None, async_client=None):
         """
         Initialise le traducteur vision
         
         Args:
             model_name: Nom du modèle vision Ollama (doit supporter les images)
             ollama_url: URL de l'API Ollama
+            client: OllamaClient partagé (optionnel, créé depuis ollama_url sinon)
+            async_client: AsyncOllamaClient partagé pour les générations (optionnel, créé depuis ollama_url sinon)
         """
         self.model_name = model_name
-        self.ollama_url = ollama_url
-        self.session = requests.Session()
+        self.client = client or OllamaClient(ollama_url)
+        self.async_client = async_client or AsyncOllamaClient(self.client.url)
+        # Clients créés ici, fermés par close() (les clients partagés restent à leur propriétaire)
+        self._owns_client = client is None
+        self._owns_async_client = async_client is None
+        self.ollama_url = self.client.url
+        self.session = self.client.session
+    
+    def close(self):
+        """Ferme les clients Ollama créés par le traducteur vision"""
+        if self._owns_async_client:
+            self.async_client.close()
+        if self._owns_client:
+            self.client.close()
         
     def _image_to_base64(self, pil_image):
         """
@@ -46,7 +65,7 @@ class VisionTranslator:
         """
         try:
             # Tester la connexion
-            response = self.session.get(f"{self.ollama_url}/api/tags", timeout=5)
+            response = self.client.get('/api/tags', timeout=5)
             
             if response.status_code != 200:
                 print(f"❌ Ollama non accessible (status: {response.status_code})")
@@ -75,7 +94,28 @@ class VisionTranslator:
             print(f"❌ Erreur de connexion à Ollama: {e}")
             return False
     
-    def translate_image(self, pil_image, target_lang="French", source_lang="English"):
+    def warm_up(self, keep_alive="10m"):
+        """
+        Précharge le modèle vision dans Ollama (requête sans prompt)
+        
+        Args:
+            keep_alive: Durée pendant laquelle Ollama garde le modèle en mémoire
+            
+        Returns:
+            bool: True si le modèle est chargé
+        """
+        try:
+            response = self.client.post(
+                '/api/generate',
+                {"model": self.model_name, "keep_alive": keep_alive},
+                timeout=120  # Chargement initial du modèle en VRAM
+            )
+            return response.status_code == 200
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Erreur lors du préchargement du modèle vision: {e}")
+            return False
+    
+    def translate_image(self, pil_image, target_lang="French", source_lang="English", channel=None):
         """
         Extrait et traduit le texte directement depuis l'image via le modèle vision
         
@@ -83,9 +123,13 @@ class VisionTranslator:
             pil_image: Image PIL à traiter
             target_lang: Langue cible (ex: "French", "Spanish", etc.)
             source_lang: Langue source (optionnel, pour le prompt)
+            channel: Canal de la requête: une requête plus récente du même canal annule celle-ci (optionnel)
             
         Returns:
             str: Texte traduit ou message d'erreur
+            
+        Raises:
+            CancelledError: Remplacée par une requête plus récente du même canal
         """
         try:
             print(f"🔄 Conversion de l'image en base64...")
@@ -101,24 +145,16 @@ class VisionTranslator:
             print(f"📝 Target: {target_lang}")
             
             # Appel à l'API Ollama avec l'image
-            response = self.session.post(
-                f"{self.ollama_url}/api/generate",
-                json={
+            translation = self.async_client.run(
+                {
                     "model": self.model_name,
                     "prompt": prompt,
                     "images": [image_base64],
                     "stream": False
                 },
+                channel=channel,
                 timeout=60  # Les modèles vision peuvent être plus lents
-            )
-            
-            if response.status_code != 200:
-                error_msg = f"Erreur API Ollama (status {response.status_code})"
-                print(f"❌ {error_msg}")
-                return f"[ERREUR: {error_msg}]"
-            
-            data = response.json()
-            translation = data.get('response', '').strip()
+            ).strip()
             
             if not translation:
                 print("⚠️ Aucune traduction reçue du modèle")
@@ -127,12 +163,21 @@ class VisionTranslator:
             print(f"✅ Traduction vision reçue ({len(translation)} caractères)")
             return translation
             
-        except requests.exceptions.Timeout:
+        except CancelledError:
+            print("⏹️ Traduction vision annulée (requête plus récente)")
+            raise
+            
+        except asyncio.TimeoutError:
             error_msg = "Timeout - Le modèle vision met trop de temps à répondre"
             print(f"❌ {error_msg}")
             return f"[ERREUR: {error_msg}]"
             
-        except requests.exceptions.RequestException as e:
+        except OllamaHTTPError as e:
+            error_msg = f"Erreur API Ollama (status {e.status})"
+            print(f"❌ {error_msg}")
+            return f"[ERREUR: {error_msg}]"
+            
+        except aiohttp.ClientError as e:
             error_msg = f"Erreur réseau: {e}"
             print(f"❌ {error_msg}")
             return f"[ERREUR: {error_msg}]"
@@ -150,7 +195,7 @@ class VisionTranslator:
             dict: Informations sur le modèle ou None si erreur
         """
         try:
-            response = self.session.get(f"{self.ollama_url}/api/tags", timeout=5)
+            response = self.client.get('/api/tags', timeout=5)
             
             if response.status_code == 200:
                 data = response.json()
@@ -185,4 +230,7 @@ def translate_screenshot_with_vision(pil_image, model="gemma3:4b", target_lang="
         str: Traduction
     """
     translator = VisionTranslator(model_name=model)
-    return translator.translate_image(pil_image, target_lang=target_lang)
+    try:
+        return translator.translate_image(pil_image, target_lang=target_lang)
+    finally:
+        translator.close()